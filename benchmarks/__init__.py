@@ -0,0 +1,30 @@
+"""Benchmarks of operations on large changelogs.
+
+Run with `python -m benchmarks [NAME ...]`, or `inv benchmark`.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, Optional, Sequence
+
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def benchmark(setup: Callable[[], Callable[[], object]]) -> Callable[[], Callable[[], object]]:
+    """Register a benchmark. The decorated function does any setup, and returns the function to time."""
+    BENCHMARKS[setup.__name__] = setup
+    return setup
+
+
+def run(names: Optional[Sequence[str]] = None, repeat: int = 3) -> None:
+    for name, setup in BENCHMARKS.items():
+        if names and not any(selected in name for selected in names):
+            continue
+        function = setup()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+        print(f"{name:<50} {min(timings) * 1000:>10.1f} ms")
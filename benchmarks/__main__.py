@@ -0,0 +1,12 @@
+import importlib
+import pkgutil
+import sys
+
+import benchmarks
+
+if __name__ == "__main__":
+    # Import each benchmark module, to register its benchmarks
+    for module in pkgutil.iter_modules(benchmarks.__path__, prefix="benchmarks."):
+        if module.name.startswith("benchmarks.bench_"):
+            importlib.import_module(module.name)
+    benchmarks.run(sys.argv[1:])
@@ -0,0 +1,21 @@
+from changelog.dedupe import find_duplicates
+
+from benchmarks import benchmark
+from tests.synthetic import generate_changelog
+
+
+def _find_duplicates(entries: int):
+    changelog = generate_changelog(releases=1, unreleased_entries=entries, duplicate_rate=0.1)
+    # Build the entry index up front, so that only duplicate detection is timed.
+    changelog.entry_index
+    return lambda: find_duplicates(changelog)
+
+
+@benchmark
+def dedupe_1000_entries():
+    return _find_duplicates(1000)
+
+
+@benchmark
+def dedupe_10000_entries():
+    return _find_duplicates(10000)
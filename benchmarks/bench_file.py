@@ -0,0 +1,26 @@
+import os
+import tempfile
+
+from changelog.file import ChangelogFile
+from changelog.renderer import dumps
+
+from benchmarks import benchmark
+from tests.synthetic import generate_changelog
+
+
+@benchmark
+def refresh_after_editing_one_entry_of_1000_releases():
+    text = dumps(generate_changelog(releases=1000, entries_per_release=50, children_rate=0.3))
+    path = os.path.join(tempfile.mkdtemp(), "CHANGELOG.md")
+    with open(path, "w") as file:
+        file.write(text)
+    changelog_file = ChangelogFile(path)
+    position = text.index("\n* ", len(text) // 2) + 3
+    edits = iter(range(1_000_000))
+
+    def edit_and_refresh():
+        with open(path, "w") as file:
+            file.write(f"{text[:position]}Edit {next(edits)} {text[position:]}")
+        changelog_file.refresh()
+
+    return edit_and_refresh
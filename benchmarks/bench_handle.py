@@ -0,0 +1,30 @@
+from copy import deepcopy
+
+from changelog.handle import ChangelogHandle
+
+from benchmarks import benchmark
+from tests.synthetic import generate_changelog
+
+
+def _changelog():
+    return generate_changelog(releases=100, entries_per_release=100, unreleased_entries=10)
+
+
+@benchmark
+def handle_add_10_entries_to_100_releases():
+    handle = ChangelogHandle(_changelog())
+    return lambda: [handle.add_entry("Added", f"Feature {index}") for index in range(10)]
+
+
+@benchmark
+def deepcopy_add_10_entries_to_100_releases():
+    """For comparison, copying the whole changelog for each change."""
+    changelog = _changelog()
+
+    def add_entries():
+        nonlocal changelog
+        for index in range(10):
+            changelog = deepcopy(changelog)
+            changelog.add_entry("Added", f"Feature {index}")
+
+    return add_entries
@@ -0,0 +1,20 @@
+from changelog.lsp import Document
+from changelog.renderer import dumps
+
+from benchmarks import benchmark
+from tests.synthetic import generate_changelog
+
+
+@benchmark
+def lsp_diagnose_after_editing_one_entry_of_1000_releases():
+    document = Document(dumps(generate_changelog(releases=1000, entries_per_release=50, children_rate=0.3)))
+    document.diagnose()
+    line = next(
+        index for index in range(len(document.lines) // 2, len(document.lines)) if document.lines[index][:2] == "* "
+    )
+
+    def edit_and_diagnose():
+        document.apply_change((line, 2), (line, 2), "Edited ")
+        document.diagnose()
+
+    return edit_and_diagnose
@@ -0,0 +1,29 @@
+from changelog.parser import loads
+from changelog.renderer import dumps
+
+from benchmarks import benchmark
+from tests.synthetic import generate_nested_changelog
+
+
+@benchmark
+def loads_50_entries_200_deep_and_5_wide():
+    text = dumps(generate_nested_changelog(entries=50, depth=200, width=5))
+    return lambda: loads(text)
+
+
+@benchmark
+def dumps_50_entries_200_deep_and_5_wide():
+    changelog = generate_nested_changelog(entries=50, depth=200, width=5)
+    return lambda: dumps(changelog)
+
+
+@benchmark
+def loads_entry_10000_deep():
+    text = dumps(generate_nested_changelog(entries=1, depth=10_000, width=1), indent=1)
+    return lambda: loads(text)
+
+
+@benchmark
+def dumps_entry_10000_deep():
+    changelog = generate_nested_changelog(entries=1, depth=10_000, width=1)
+    return lambda: dumps(changelog, indent=1)
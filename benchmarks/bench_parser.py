@@ -0,0 +1,21 @@
+from changelog.parser import loads, loads_parallel
+from changelog.renderer import dumps
+
+from benchmarks import benchmark
+from tests.synthetic import generate_changelog
+
+
+def _text() -> str:
+    return dumps(generate_changelog(releases=1000, entries_per_release=50, children_rate=0.3))
+
+
+@benchmark
+def loads_1000_releases():
+    text = _text()
+    return lambda: loads(text)
+
+
+@benchmark
+def loads_parallel_1000_releases():
+    text = _text()
+    return lambda: loads_parallel(text, threshold=0)
@@ -0,0 +1,10 @@
+from changelog.stats import changelog_stats
+
+from benchmarks import benchmark
+from tests.synthetic import generate_changelog
+
+
+@benchmark
+def stats_of_1000_releases_with_500_entries():
+    changelog = generate_changelog(releases=1000, entries_per_release=500, children_rate=0.2)
+    return lambda: changelog_stats([changelog])
@@ -0,0 +1,37 @@
+import os
+import tempfile
+
+from changelog.storage import SqliteStorage
+
+from benchmarks import benchmark
+from tests.synthetic import generate_changelog
+
+
+def _storage() -> SqliteStorage:
+    storage = SqliteStorage(os.path.join(tempfile.mkdtemp(), "changelog.db"))
+    storage.save(generate_changelog(releases=1000, entries_per_release=50, children_rate=0.3))
+    return storage
+
+
+@benchmark
+def load_1000_releases_from_database():
+    return _storage().load
+
+
+@benchmark
+def save_after_adding_one_entry_to_1000_releases():
+    storage = _storage()
+    changelog = storage.load()
+    messages = iter(range(1_000_000))
+
+    def add_and_save():
+        changelog.add_entry("Added", f"Entry {next(messages)}")
+        storage.save(changelog)
+
+    return add_and_save
+
+
+@benchmark
+def search_1000_releases():
+    storage = _storage()
+    return lambda: storage.search("feature", limit=20)
@@ -0,0 +1,17 @@
+from changelog.renderer import dumps
+from changelog.table import loads_table
+
+from benchmarks import benchmark
+from tests.synthetic import generate_changelog
+
+
+@benchmark
+def loads_table_of_1000_releases():
+    text = dumps(generate_changelog(releases=1000, entries_per_release=50, children_rate=0.3))
+    return lambda: loads_table(text)
+
+
+@benchmark
+def to_table_of_1000_releases():
+    changelog = generate_changelog(releases=1000, entries_per_release=50, children_rate=0.3)
+    return changelog.to_table
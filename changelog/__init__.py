@@ -1,6 +1,27 @@
-from changelog.parser import load_from_file, loads
+from changelog.file import ChangelogFile
+from changelog.handle import ChangelogHandle
+from changelog.parser import load_from_file, loads, loads_parallel
 from changelog.renderer import dump_to_file, dumps
+from changelog.serialization import dumps_json, dumps_snapshot, loads_json, loads_snapshot
+from changelog.storage import SqliteStorage
+from changelog.table import loads_table
+from changelog.transaction import edit
 
 __version__ = "0.2.0"
 
-__all__ = ["dump_to_file", "dumps", "load_from_file", "loads"]
+__all__ = [
+    "ChangelogFile",
+    "ChangelogHandle",
+    "SqliteStorage",
+    "dump_to_file",
+    "dumps",
+    "dumps_json",
+    "dumps_snapshot",
+    "edit",
+    "load_from_file",
+    "loads",
+    "loads_json",
+    "loads_parallel",
+    "loads_snapshot",
+    "loads_table",
+]
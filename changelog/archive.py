@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import os
+import re
+from typing import Iterator, Optional, Tuple
+
+from changelog.exceptions import ChangelogError
+from changelog.model import _UNRELEASED, Changelog, ChangelogConfig, ReleaseSection, ReleaseTag, RevisionedDict
+from changelog.parser import load_from_file
+from changelog.renderer import dumps
+from changelog.utils import atomic_write_many
+
+# Archives are linked from the main changelog as [archive:{oldest}..{newest}]: {path}
+ARCHIVE_LINK_PREFIX = "archive:"
+_ARCHIVE_RANGE_SEPARATOR = ".."
+_UNSAFE_FILENAME_CHARACTERS = re.compile(r"[^\w.-]")
+
+
+def is_archive_link(link_name: str) -> bool:
+    return link_name.startswith(ARCHIVE_LINK_PREFIX)
+
+
+def iter_archive_links(changelog: Changelog) -> Iterator[Tuple[ReleaseTag, ReleaseTag, str]]:
+    """Find the archives linked from a changelog, newest first.
+
+    :return: An iterator of the oldest and newest release in each archive, and the path to the archive, relative
+        to the changelog.
+    """
+    for link_name, target in changelog.links.items():
+        if not is_archive_link(link_name):
+            continue
+        oldest, _, newest = link_name[len(ARCHIVE_LINK_PREFIX) :].partition(_ARCHIVE_RANGE_SEPARATOR)
+        yield ReleaseTag(oldest), ReleaseTag(newest), target
+
+
+def archive_releases(changelog: Changelog, keep: int, path: str = "CHANGELOG.md") -> Optional[Tuple[str, Changelog]]:
+    """Move all but the most recent releases of a changelog into a separate archive changelog.
+
+    The archived releases and their links are removed from the changelog, and replaced by a link to the archive.
+    The archive is not written; its path is chosen to be next to the changelog at `path`.
+
+    :param keep: The number of releases to keep in the changelog, not counting the unreleased section.
+    :param path: The path to the changelog.
+    :return: The path to write the archive to, and the archive itself, or None if there are no releases to archive.
+    """
+    if keep < 1:
+        raise ChangelogError("At least one release must be kept, to continue numbering releases from.")
+    archived_tags = [tag for tag in changelog.releases if tag != _UNRELEASED][keep:]
+    if not archived_tags:
+        return None
+    newest, oldest = archived_tags[0], archived_tags[-1]
+    stem, extension = os.path.splitext(os.path.basename(path))
+    name = _UNSAFE_FILENAME_CHARACTERS.sub("_", f"{stem}-archive-{oldest}-{newest}{extension}")
+    archive = Changelog(
+        header=f"# Changelog archive\n\nReleases {oldest} to {newest}, archived from {os.path.basename(path)}.",
+        config=ChangelogConfig(breaking_change_token=changelog.config.breaking_change_token),
+        releases=RevisionedDict((tag, changelog.releases.pop(tag)) for tag in archived_tags),
+        links=RevisionedDict((tag, changelog.links.pop(tag)) for tag in archived_tags if tag in changelog.links),
+    )
+    link_name = f"{ARCHIVE_LINK_PREFIX}{oldest}{_ARCHIVE_RANGE_SEPARATOR}{newest}"
+    changelog.links[link_name] = name
+    # Place the newest archive first, as with releases
+    changelog.links.move_to_end(link_name, last=False)
+    return os.path.join(os.path.dirname(path), name), archive
+
+
+def write_archive(archive_path: str, archive: Changelog, changelog: Changelog = None, path: str = None) -> None:
+    """Write a new archive, refusing to overwrite an existing file.
+
+    :param changelog: The changelog the releases were archived from. If given, it is written to `path` together
+        with the archive, so that either both files are written or neither is.
+    :param path: The path to write the changelog to.
+    """
+    if os.path.exists(archive_path):
+        raise ChangelogError(f"Archive {archive_path!r} already exists.")
+    contents = {archive_path: dumps(archive)}
+    if changelog is not None:
+        contents[path or "CHANGELOG.md"] = dumps(changelog)
+    atomic_write_many(contents)
+
+
+def iter_archived_releases(
+    changelog: Changelog, path: str = "CHANGELOG.md", tag: str = None
+) -> Iterator[Tuple[ReleaseTag, ReleaseSection]]:
+    """Iterate over the releases in the archives linked from a changelog, newest first.
+
+    Each archive is only loaded when iteration reaches it, so stopping early avoids loading older archives.
+
+    :param path: The path to the changelog, which archive paths are relative to.
+    :param tag: If given, skip archives which cannot contain this release, going by the range of semantic versions
+        they contain.
+    """
+    for oldest, newest, target in iter_archive_links(changelog):
+        if tag and not _may_contain(ReleaseTag(tag), oldest, newest):
+            continue
+        archive = load_from_file(os.path.join(os.path.dirname(path), target))
+        yield from archive.releases.items()
+
+
+def iter_all_releases(changelog: Changelog, path: str = "CHANGELOG.md") -> Iterator[Tuple[ReleaseTag, ReleaseSection]]:
+    """Iterate over every release, newest first, loading archives only once the main changelog is exhausted."""
+    yield from changelog.releases.items()
+    yield from iter_archived_releases(changelog, path)
+
+
+def find_release(changelog: Changelog, tag: str, path: str = "CHANGELOG.md") -> ReleaseSection:
+    """Find a release in a changelog or, failing that, in its archives.
+
+    :raises ChangelogError: if there is no such release.
+    """
+    tag = ReleaseTag(tag)
+    if tag in changelog.releases:
+        return changelog.releases[tag]
+    for archived_tag, section in iter_archived_releases(changelog, path, tag=tag):
+        if archived_tag == tag:
+            return section
+    raise ChangelogError(f"No release with tag {tag!r}.")
+
+
+def _may_contain(tag: ReleaseTag, oldest: ReleaseTag, newest: ReleaseTag) -> bool:
+    if not (tag.is_semver and oldest.is_semver and newest.is_semver):
+        return True
+    return oldest.semver <= tag.semver <= newest.semver
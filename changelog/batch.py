@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import importlib
+import json
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+from changelog.exceptions import ChangelogError
+from changelog.model import Changelog, ReleaseTag
+
+yaml: Optional[ModuleType]
+try:
+    yaml = importlib.import_module("yaml")
+except ImportError:  # pragma: no cover
+    yaml = None
+
+BATCH_FORMATS = ("json", "ndjson", "yaml")
+
+
+@dataclass
+class BatchEntryError:
+    # The position of the entry in the batch, or the line number for NDJSON.
+    index: int
+    message: str
+
+
+def read_entry_records(text: str, format: str) -> Iterator[Tuple[int, Union[Any, ChangelogError]]]:
+    """Read entry records for `add_entries` from JSON, NDJSON or YAML text.
+
+    JSON and YAML documents must contain a list of records, or a single record. For NDJSON, a line which cannot
+    be decoded is yielded as an error in place of its record, so that it doesn't prevent the other entries being
+    added.
+
+    :return: An iterator of the index of each record, and the record itself.
+    :raises ChangelogError: if the format is unsupported or a JSON or YAML document cannot be decoded.
+    """
+    if format == "ndjson":
+        yield from _read_ndjson_records(text)
+        return
+    if format == "json":
+        try:
+            records = json.loads(text)
+        except ValueError as exc:
+            raise ChangelogError(f"Invalid JSON: {exc}")
+    elif format == "yaml":
+        if yaml is None:
+            raise ChangelogError(
+                "Reading entries from YAML requires PyYAML to be installed, e.g. with "
+                "`pip install changelog-cmd[yaml]`."
+            )
+        try:
+            records = yaml.safe_load(text)
+        except yaml.YAMLError as exc:
+            raise ChangelogError(f"Invalid YAML: {exc}")
+    else:
+        raise ChangelogError(f"Unsupported format {format!r}, expected one of {', '.join(BATCH_FORMATS)}.")
+    if not isinstance(records, list):
+        records = [records]
+    yield from enumerate(records, start=1)
+
+
+def _read_ndjson_records(text: str) -> Iterator[Tuple[int, Union[Any, ChangelogError]]]:
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as exc:
+            yield line_number, ChangelogError(f"Invalid JSON: {exc}")
+
+
+def add_entries(
+    changelog: Changelog, records: Iterable[Tuple[int, Union[Any, ChangelogError]]]
+) -> Tuple[int, List[BatchEntryError]]:
+    """Add a batch of entries to the changelog, reporting any invalid entries rather than stopping at the first.
+
+    Each record is a mapping of `change_type`, `message` (a string, or a list of strings to add nested entries),
+    and optionally `breaking` and `tag`, mirroring the options to `changelog entry`. A `tag` must be a release with a
+    link, so that one record cannot make the whole changelog invalid.
+
+    :return: The number of entries added, and an error for each entry which could not be added.
+    """
+    added = 0
+    errors: List[BatchEntryError] = []
+    for index, record in records:
+        try:
+            if isinstance(record, ChangelogError):
+                raise record
+            change_type, messages, breaking, tag = _parse_record(record)
+            if tag is not None and ReleaseTag(tag) not in changelog.links:
+                raise ChangelogError(f"Release {tag!r} is missing a link.")
+            changelog.add_entry(change_type, *messages, breaking=breaking, tag=tag)
+        except ChangelogError as exc:
+            errors.append(BatchEntryError(index=index, message=str(exc)))
+            continue
+        added += 1
+    return added, errors
+
+
+def _parse_record(record: Any) -> Tuple[Any, List[str], bool, Any]:
+    if not isinstance(record, dict):
+        raise ChangelogError("An entry must be a mapping.")
+    unknown_keys = set(record) - {"change_type", "message", "breaking", "tag"}
+    if unknown_keys:
+        raise ChangelogError(f"Unknown fields: {', '.join(sorted(unknown_keys))}.")
+    change_type = record.get("change_type")
+    if not isinstance(change_type, str):
+        raise ChangelogError("An entry requires a change type.")
+    messages = record.get("message")
+    if isinstance(messages, str):
+        messages = [messages]
+    if not isinstance(messages, list) or not all(isinstance(message, str) for message in messages):
+        raise ChangelogError("An entry requires a message, or a list of messages.")
+    tag = record.get("tag")
+    if tag is not None and not isinstance(tag, str):
+        raise ChangelogError("The release tag must be a string.")
+    return change_type.title(), messages, bool(record.get("breaking", False)), tag
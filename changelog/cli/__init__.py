@@ -1,6 +1,8 @@
-from changelog.cli import config
+from changelog.cli import config, db, entry
 from changelog.cli.main import app
 
 app.add_typer(config.app)
+app.add_typer(db.app)
+app.add_typer(entry.app)
 
 __all__ = ["app"]
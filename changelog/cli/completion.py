@@ -0,0 +1,39 @@
+from typing import Callable, List
+
+import click
+
+from changelog.cli.state import global_options
+from changelog.completion import release_tags
+from changelog.model import ChangeType
+
+CompletionFunction = Callable[[click.Context, click.Parameter, str], List[str]]
+
+
+def _changelog_path(ctx: click.Context) -> str:
+    # The main callback does not run while completing, so the --path option is read from the context instead.
+    return ctx.find_root().params.get("path") or global_options()["path"]
+
+
+def complete_release_tag(ctx: click.Context, param: click.Parameter, incomplete: str) -> List[str]:
+    """Complete release tags from the cached tag list, see `changelog.completion.release_tags`."""
+    return [tag for tag in release_tags(_changelog_path(ctx)) if tag.startswith(incomplete)]
+
+
+def complete_change_type(ctx: click.Context, param: click.Parameter, incomplete: str) -> List[str]:
+    return [
+        change_type.lower()
+        for change_type in ChangeType.__args__  # type: ignore
+        if change_type.lower().startswith(incomplete.lower())
+    ]
+
+
+def argument_completion(complete: CompletionFunction) -> Callable[[click.Context, str], List[str]]:
+    """Adapt a completion function for use as the `autocompletion` of an argument.
+
+    Typer only passes `shell_complete` to options, so arguments must use its older `autocompletion` instead.
+    """
+
+    def autocompletion(ctx: click.Context, incomplete: str) -> List[str]:
+        return complete(ctx, None, incomplete)  # type: ignore[arg-type]
+
+    return autocompletion
@@ -0,0 +1,59 @@
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from changelog.cli.completion import complete_change_type
+from changelog.cli.state import get_changelog, global_options, save_changelog
+from changelog.exceptions import ChangelogError
+from changelog.storage import SqliteStorage, is_database_path
+
+app = typer.Typer()
+
+
+@app.callback()
+def db():
+    """Manage a changelog stored in a SQLite database, selected by a --path ending in .db, .sqlite or .sqlite3.
+
+    Use `changelog export --format markdown` to render the database as Markdown.
+    """
+
+
+def _database_path() -> str:
+    path = global_options()["path"]
+    if not is_database_path(path):
+        typer.secho(f"\nERROR: {path} is not a database. Pass --path ending in .db, .sqlite or .sqlite3.", fg="red")
+        raise typer.Exit(1)
+    return path
+
+
+@app.command(name="import")
+def import_markdown(
+    source: Path = typer.Argument(..., help="Path to the Markdown changelog to import."),
+):
+    """Import a Markdown changelog into the database, replacing its contents."""
+    _database_path()
+    save_changelog(get_changelog(str(source)))
+
+
+@app.command()
+def search(
+    query: str = typer.Argument(..., help="Text to search entries for, using SQLite full text query syntax."),
+    change_type: Optional[str] = typer.Option(
+        None, "--change-type", "-c", help="Only search this change type.", shell_complete=complete_change_type
+    ),
+    since: Optional[str] = typer.Option(None, "--since", help="Only search releases on or after this date."),
+    until: Optional[str] = typer.Option(None, "--until", help="Only search releases on or before this date."),
+    limit: Optional[int] = typer.Option(None, "--limit", "-n", help="Maximum number of entries to show."),
+):
+    """Search entries, including nested entries, using the database's full text index."""
+    try:
+        with SqliteStorage(_database_path(), create=False) as storage:
+            results = storage.search(
+                query, change_type=change_type.title() if change_type else None, since=since, until=until, limit=limit
+            )
+    except ChangelogError as exc:
+        typer.secho(f"\nERROR: {exc}", fg="red")
+        raise typer.Exit(1)
+    for result in results:
+        typer.echo(f"[{result.tag}] {result.change_type}: {result.text}")
@@ -0,0 +1,155 @@
+import sys
+from contextlib import nullcontext
+from enum import Enum
+from pathlib import Path
+from typing import List, Optional, cast
+
+import click
+import typer
+
+from changelog.cli.completion import argument_completion, complete_change_type, complete_release_tag
+from changelog.cli.state import get_changelog, save_changelog
+from changelog.exceptions import ChangelogError
+from changelog.model import ChangeType, ReleaseTag
+
+
+class _DefaultCommandGroup(click.Group):
+    """Group which runs the `add` command unless given the name of another command.
+
+    This keeps `changelog entry added ...` working alongside the other entry commands.
+    """
+
+    def parse_args(self, ctx: click.Context, args: List[str]) -> List[str]:
+        if args and args[0] not in self.commands and args[0] not in ctx.help_option_names:
+            args = ["add", *args]
+        return super().parse_args(ctx, args)
+
+
+app = typer.Typer(cls=_DefaultCommandGroup)
+
+
+@app.callback()
+def entry():
+    """Add, edit, remove and list changelog entries. Runs `add` by default."""
+
+
+class BatchFormatOption(Enum):
+    json = "json"
+    ndjson = "ndjson"
+    yaml = "yaml"
+
+
+@app.command()
+def add(
+    change_type: Optional[str] = typer.Argument(None, autocompletion=argument_completion(complete_change_type)),
+    message: List[str] = typer.Option(None, "--message", "-m", help="Message describing changelog entry."),
+    breaking: bool = typer.Option(False, "--breaking", "-b", help="Mark this change as a breaking change."),
+    tag: Optional[str] = typer.Option(
+        None,
+        "--tag",
+        "-t",
+        help="Specify the release tag for this entry. Will add to unreleased tag by default.",
+        shell_complete=complete_release_tag,
+    ),
+    from_file: Optional[str] = typer.Option(
+        None,
+        "--from-file",
+        help=(
+            "Add a batch of entries from a JSON, NDJSON or YAML file, or '-' for standard input. Each entry has a "
+            "'change_type', a 'message' (or list of messages), and optionally 'breaking' and 'tag'."
+        ),
+    ),
+    format: Optional[BatchFormatOption] = typer.Option(
+        None,
+        "--format",
+        help="Format of the --from-file input. Inferred from the file extension by default, otherwise JSON.",
+    ),
+):
+    """Add a new entry to the changelog."""
+    if from_file:
+        if change_type or message:
+            raise typer.BadParameter("Entries must be given either on the command line or with --from-file, not both.")
+        _add_entries_from_file(from_file, format)
+        return
+    if not change_type or not message:
+        raise typer.BadParameter("A change type and at least one --message are required.")
+    changelog = get_changelog()
+    try:
+        changelog.add_entry(cast(ChangeType, change_type.title()), *message, breaking=breaking, tag=tag)
+    except ChangelogError as exc:
+        typer.secho(f"\nERROR: {exc}", fg="red")
+        raise typer.Exit(1)
+    save_changelog(changelog)
+
+
+def _add_entries_from_file(path: str, format: Optional[BatchFormatOption]) -> None:
+    # Imported here, as PyYAML is slow to import and adding a single entry does not need it.
+    from changelog.batch import add_entries, read_entry_records
+
+    if format:
+        format_name = format.value
+    else:
+        format_name = {".ndjson": "ndjson", ".jsonl": "ndjson", ".yaml": "yaml", ".yml": "yaml"}.get(
+            Path(path).suffix.lower(), "json"
+        )
+    with nullcontext(sys.stdin) if path == "-" else open(path, "r") as file:
+        text = file.read()
+    changelog = get_changelog()
+    try:
+        added, errors = add_entries(changelog, read_entry_records(text, format_name))
+    except ChangelogError as exc:
+        typer.secho(f"\nERROR: Could not read entries: {exc}", fg="red")
+        raise typer.Exit(1)
+    for error in errors:
+        typer.secho(f"ERROR: Entry {error.index}: {error.message}", fg="red", err=True)
+    if added:
+        save_changelog(changelog)
+    typer.echo(f"Added {added} entries ({len(errors)} failed)")
+    if errors:
+        raise typer.Exit(1)
+
+
+@app.command(name="list")
+def list_entries(
+    tag: Optional[str] = typer.Option(
+        None, "--tag", "-t", help="Only list entries from this release.", shell_complete=complete_release_tag
+    ),
+):
+    """List entries along with their IDs, for use with `edit` and `remove`."""
+    changelog = get_changelog()
+    for location in changelog.entry_index.locations.values():
+        if tag and location.tag != ReleaseTag(tag):
+            continue
+        indent = "  " * len(location.ancestors)
+        typer.echo(f"{location.entry_id}  [{location.tag}] {location.change_type}: {indent}{location.entry.text}")
+
+
+@app.command()
+def edit(
+    entry_id: str = typer.Option(..., "--id", help="ID of the entry to edit, as shown by `changelog entry list`."),
+    message: str = typer.Option(..., "--message", "-m", help="New message for the entry."),
+):
+    """Replace the message of an entry."""
+    changelog = get_changelog()
+    try:
+        new_id = changelog.edit_entry(entry_id, message)
+    except ChangelogError as exc:
+        typer.secho(f"\nERROR: {exc}", fg="red")
+        raise typer.Exit(1)
+    save_changelog(changelog)
+    typer.echo(f"Edited entry {entry_id} (new ID {new_id})")
+
+
+@app.command()
+def remove(
+    entry_id: str = typer.Option(..., "--id", help="ID of the entry to remove, as shown by `changelog entry list`."),
+):
+    """Remove an entry, along with any nested entries."""
+    changelog = get_changelog()
+    try:
+        changelog.remove_entry(entry_id)
+    except ChangelogError as exc:
+        typer.secho(f"\nERROR: {exc}", fg="red")
+        raise typer.Exit(1)
+    save_changelog(changelog)
+    typer.echo(f"Removed entry {entry_id}")
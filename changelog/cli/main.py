@@ -1,14 +1,37 @@
+import difflib
+import json
+import subprocess
+import sys
+from contextlib import nullcontext
+from dataclasses import asdict
 from enum import Enum
 from pathlib import Path
-from typing import List, Optional, cast
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Union
 
 import typer
 
-from changelog import __version__
+from changelog import __version__, load_from_file
+from changelog.cli.completion import argument_completion, complete_release_tag
 from changelog.cli.constants import default_changelog
-from changelog.cli.state import get_changelog, global_options, save_changelog
-from changelog.exceptions import ChangelogMissingConfigError
-from changelog.model import Bump, ChangeType
+from changelog.cli.state import get_changelog, global_options, require_markdown, save_changelog
+from changelog.dedupe import DEFAULT_THRESHOLD, DuplicateGroup, find_duplicates, merge_duplicates
+from changelog.exceptions import (
+    ChangelogError,
+    ChangelogMissingConfigError,
+    ChangelogParseError,
+    ChangelogValidationError,
+)
+from changelog.model import _UNRELEASED, Bump, Changelog, ChangelogConfig, ReleaseTag
+from changelog.renderer import dumps, format_file, matches_file, render_changelog_release
+from changelog.storage import is_database_path
+from changelog.utils import atomic_write
+from changelog.workspace import DEFAULT_PATTERN, commit_releases, find_changelogs, prepare_releases
+
+# Modules used by only one command are imported by that command, so that running any one command, or completing its
+# arguments, does not import all of them. Those which provide option defaults are needed to define the commands.
+
+if TYPE_CHECKING:
+    from changelog.stats import ChangelogStats
 
 app = typer.Typer()
 
@@ -85,10 +108,314 @@ def validate():
     get_changelog()
 
 
+class LintFormatOption(Enum):
+    text = "text"
+    json = "json"
+
+
 @app.command()
-def format():
+def lint(
+    format: LintFormatOption = typer.Option("text", "--format", "-f", help="Output format for reported issues."),
+):
+    """Report every problem with the changelog, rather than stopping at the first."""
+    from changelog.lint import lint_file
+
+    path = require_markdown("lint")
+    issues = lint_file(path)
+    if format == LintFormatOption.json:
+        typer.echo(json.dumps([issue.to_dict() for issue in issues], indent=2))
+    else:
+        for issue in issues:
+            location = f"{path}:{issue.line}" if issue.line else path
+            typer.secho(f"{location}: {issue.message} [{issue.code}]", fg="red")
+    if issues:
+        raise typer.Exit(1)
+
+
+@app.command()
+def format(
+    check: bool = typer.Option(
+        False, "--check", help="Don't write the changelog, just exit with a non-zero code if it is not formatted."
+    ),
+    diff: bool = typer.Option(
+        False, "--diff", help="Don't write the changelog, just show the changes formatting would make, if any."
+    ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help=(
+            "Format the changelog one release at a time, so that memory use is bounded by the largest release "
+            "rather than the whole changelog. Cannot be combined with --check or --diff."
+        ),
+    ),
+):
     """Parse, validate and format the changelog."""
-    save_changelog(get_changelog())
+    path = require_markdown("format")
+    if stream:
+        if check or diff:
+            typer.secho("\nERROR: --stream cannot be combined with --check or --diff.", fg="red")
+            raise typer.Exit(1)
+        try:
+            format_file(path)
+        except (ChangelogParseError, ChangelogValidationError) as exc:
+            typer.secho(f"\nERROR: Could not parse changelog: {str(exc)}", fg="red")
+            raise typer.Exit(1)
+        return
+    changelog = get_changelog()
+    if diff:
+        with open(path, "r") as file:
+            original = file.read()
+        changes = "".join(
+            difflib.unified_diff(
+                original.splitlines(keepends=True),
+                dumps(changelog).splitlines(keepends=True),
+                fromfile=path,
+                tofile=f"{path} (formatted)",
+            )
+        )
+        if changes:
+            typer.echo(changes, nl=False)
+            raise typer.Exit(1)
+        return
+    if check:
+        if not matches_file(changelog, path):
+            typer.secho(f"{path} is not formatted. Run 'changelog format' to format it.", fg="red")
+            raise typer.Exit(1)
+        return
+    save_changelog(changelog)
+
+
+class DiffFormatOption(Enum):
+    text = "text"
+    json = "json"
+
+
+@app.command(name="diff")
+def diff_command(
+    old: Path = typer.Argument(..., help="Path to the original changelog."),
+    new: Path = typer.Argument(..., help="Path to the changed changelog."),
+    format: DiffFormatOption = typer.Option("text", "--format", "-f", help="Output format for the changes."),
+    unreleased_only: bool = typer.Option(
+        False,
+        "--unreleased-only",
+        help="Exit with a non-zero code if anything other than the unreleased section was changed.",
+    ),
+):
+    """Summarise the structural differences between two changelogs.
+
+    Formatting differences are ignored; only changes to releases, entries, links, config and the header are shown.
+    """
+    from changelog.diff import diff_changelogs, only_unreleased_changed
+
+    changes = diff_changelogs(get_changelog(str(old)), get_changelog(str(new)))
+    if format == DiffFormatOption.json:
+        typer.echo(json.dumps([change.to_dict() for change in changes], indent=2))
+    else:
+        for change in changes:
+            typer.echo(str(change))
+    if unreleased_only and not only_unreleased_changed(changes):
+        typer.secho("\nERROR: Changes were made outside of the unreleased section.", fg="red", err=True)
+        raise typer.Exit(1)
+
+
+@app.command(name="merge-driver")
+def merge_driver(
+    base: Path = typer.Argument(..., help="Path to the common ancestor's version of the changelog (%O)."),
+    ours: Path = typer.Argument(..., help="Path to the current branch's version of the changelog (%A)."),
+    theirs: Path = typer.Argument(..., help="Path to the other branch's version of the changelog (%B)."),
+):
+    """Merge changes made to a changelog on two branches, for use as a git merge driver.
+
+    The merged changelog is written to OURS. Entries added to the unreleased section on both branches are combined.
+    Conflicting changes are written between conflict markers, and cause a non-zero exit code.
+    """
+    from changelog.merge import merge_changelogs, render_merge
+
+    try:
+        result = merge_changelogs(*(load_from_file(str(path)) for path in (base, ours, theirs)))
+        merged = render_merge(result)
+    except ChangelogError as exc:
+        typer.secho(
+            f"\nERROR: Could not merge changelogs: {exc}\nFalling back to a line-based merge.", fg="red", err=True
+        )
+        returncode = subprocess.call(
+            ["git", "merge-file", "-L", "ours", "-L", "base", "-L", "theirs", str(ours), str(base), str(theirs)]
+        )
+        raise typer.Exit(1 if returncode else 0)
+    atomic_write(str(ours), merged)
+    for conflict in result.conflicts:
+        typer.secho(f"CONFLICT: {' / '.join(conflict.path)}", fg="red", err=True)
+    if result.conflicts:
+        raise typer.Exit(1)
+
+
+@app.command()
+def dedupe(
+    tag: List[str] = typer.Option(
+        None, "--tag", "-t", help="Release to search for duplicates. May be repeated. Defaults to unreleased."
+    ),
+    recent: int = typer.Option(
+        0, "--recent", "-r", help="Also search this many of the most recent releases, to find re-added entries."
+    ),
+    threshold: float = typer.Option(
+        DEFAULT_THRESHOLD, help="How similar two entries must be to be duplicates, between 0 and 1."
+    ),
+    apply: bool = typer.Option(False, "--apply", help="Merge each group of duplicates into the entry listed first."),
+    interactive: bool = typer.Option(
+        False, "--interactive", "-i", help="Choose which entry of each group of duplicates to keep, if any."
+    ),
+):
+    """Find near-duplicate entries, and optionally merge them.
+
+    Without --apply or --interactive, exits with a non-zero code if any duplicates are found.
+    """
+    changelog = get_changelog()
+    tags = list(tag) or [_UNRELEASED, *[release for release in changelog.releases if release != _UNRELEASED][:recent]]
+    groups = find_duplicates(changelog, tags=tags, threshold=threshold)
+    merged = 0
+    for number, group in enumerate(groups, start=1):
+        typer.echo(_describe_duplicate_group(number, group))
+        if interactive:
+            choice = typer.prompt("Keep which entry? Enter 's' to skip", default="1")
+            if choice.lower() == "s":
+                continue
+            if not choice.isdigit() or not 1 <= int(choice) <= len(group.locations):
+                raise typer.BadParameter(f"Expected a number between 1 and {len(group.locations)}, or 's'.")
+            merge_duplicates(changelog, group, keep=int(choice) - 1)
+            merged += len(group.duplicates)
+        elif apply:
+            merge_duplicates(changelog, group)
+            merged += len(group.duplicates)
+    if merged:
+        save_changelog(changelog)
+    if apply or interactive:
+        typer.echo(f"Merged {merged} duplicate entries")
+    elif groups:
+        raise typer.Exit(1)
+
+
+def _describe_duplicate_group(number: int, group: DuplicateGroup) -> str:
+    return "\n".join(
+        [
+            f"Duplicate group {number}:",
+            *[
+                f"  {index}. {location.entry_id}  [{location.tag}] {location.change_type}: {location.entry.text}"
+                for index, location in enumerate(group.locations, start=1)
+            ],
+        ]
+    )
+
+
+class ExportFormatOption(Enum):
+    markdown = "markdown"
+    json = "json"
+    snapshot = "snapshot"
+
+
+@app.command()
+def export(
+    format: ExportFormatOption = typer.Option("json", "--format", "-f", help="Format to export the changelog in."),
+    ndjson: bool = typer.Option(
+        False,
+        "--ndjson",
+        help=(
+            "Stream one JSON record per entry, as it is parsed, instead of exporting the whole changelog. "
+            "Uses constant memory regardless of the size of the changelog. Overrides --format."
+        ),
+    ),
+    breaking_change_token: str = typer.Option(
+        ChangelogConfig.breaking_change_token,
+        help="Token used to indicate breaking changes. Only used with --ndjson.",
+    ),
+    output: Optional[Path] = typer.Option(
+        None, "--output", "-o", help="File to write the export to. Defaults to standard output."
+    ),
+):
+    """Export the changelog in a machine-readable format.
+
+    The binary snapshot format is much faster to load than Markdown, see `changelog.serialization.loads_snapshot`.
+    """
+    from changelog.serialization import dumps_json, dumps_snapshot
+
+    if ndjson:
+        _export_ndjson(breaking_change_token, output)
+        return
+    changelog = get_changelog()
+    exporters: Dict[ExportFormatOption, Callable[[Changelog], Union[str, bytes]]] = {
+        ExportFormatOption.markdown: dumps,
+        ExportFormatOption.json: dumps_json,
+        ExportFormatOption.snapshot: dumps_snapshot,
+    }
+    content = exporters[format](changelog)
+    if output:
+        mode = "wb" if isinstance(content, bytes) else "w"
+        with open(output, mode) as file:
+            file.write(content)
+        return
+    typer.echo(content, nl=format == ExportFormatOption.json)
+
+
+def _export_ndjson(breaking_change_token: str, output: Optional[Path]) -> None:
+    from changelog.serialization import iter_entry_records
+
+    with open(require_markdown("export --ndjson"), "r") as changelog_file, (
+        open(output, "w") if output else nullcontext(sys.stdout)
+    ) as output_file:
+        try:
+            for record in iter_entry_records(changelog_file, breaking_change_token=breaking_change_token):
+                output_file.write(json.dumps(record) + "\n")
+        except ChangelogParseError as exc:
+            typer.secho(f"\nERROR: Could not parse changelog: {str(exc)}", fg="red", err=True)
+            raise typer.Exit(1)
+
+
+class StatsFormatOption(Enum):
+    text = "text"
+    json = "json"
+
+
+@app.command()
+def stats(
+    paths: Optional[List[Path]] = typer.Argument(
+        None, help="Paths to the changelogs to aggregate. Defaults to the changelog given by --path."
+    ),
+    format: StatsFormatOption = typer.Option("text", "--format", "-f", help="Output format for the statistics."),
+):
+    """Report release cadence, entries per change type and breaking change frequency across changelogs."""
+    # Imported here, as NumPy is slow to import and most commands (including shell completion) do not need it.
+    from changelog.stats import changelog_stats
+
+    result = changelog_stats(get_changelog(str(path)) for path in paths or [global_options()["path"]])
+    if format == StatsFormatOption.json:
+        typer.echo(json.dumps(asdict(result), indent=2))
+        return
+    typer.echo(_describe_stats(result))
+
+
+def _describe_stats(result: "ChangelogStats") -> str:
+    rows = [
+        ("Changelogs", result.changelogs),
+        ("Releases", result.releases),
+        ("First release", result.first_release or "-"),
+        ("Latest release", result.latest_release or "-"),
+        *[(f"Releases in {year}", count) for year, count in result.releases_by_year.items()],
+    ]
+    intervals = result.days_between_releases
+    if intervals:
+        rows.extend(
+            [
+                ("Days between releases (mean)", f"{intervals.mean:.1f}"),
+                ("Days between releases (median)", f"{intervals.median:g}"),
+                ("Days between releases (range)", f"{intervals.minimum}-{intervals.maximum}"),
+            ]
+        )
+    rows.append(("Entries", result.entries))
+    rows.extend((f"  {change_type}", count) for change_type, count in result.entries_by_change_type.items())
+    rows.extend(
+        [("Breaking entries", result.breaking_entries), ("Releases with breaking entries", result.breaking_releases)]
+    )
+    width = max(len(label) for label, _ in rows)
+    return "\n".join(f"{label:<{width}}  {value}" for label, value in rows)
 
 
 class ReleaseTypeOption(Enum):
@@ -118,15 +445,40 @@ def release(
             "but otherwise not recommended."
         ),
     ),
+    all_: bool = typer.Option(
+        False,
+        "--all",
+        help=(
+            "Release every changelog in the workspace which has unreleased entries, each with its own tag. Either "
+            "every changelog is updated, or none are."
+        ),
+    ),
+    manifest: Optional[Path] = typer.Option(
+        None,
+        "--manifest",
+        help="With --all, a file listing the changelogs to release, one path or glob pattern per line.",
+    ),
+    pattern: str = typer.Option(
+        DEFAULT_PATTERN, "--glob", help="With --all, the glob pattern to find changelogs with, if no manifest is given."
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="With --all, list the release each changelog would get, without changing any."
+    ),
 ):
     """Move the unreleased entries in the changelog to a new release tag."""
-    changelog = get_changelog()
     force = {
         ReleaseTypeOption.major: Bump.MAJOR,
         ReleaseTypeOption.minor: Bump.MINOR,
         ReleaseTypeOption.patch: Bump.PATCH,
         ReleaseTypeOption.auto: None,
     }[bump]
+    if all_:
+        _release_all(force, tag=tag, manifest=manifest, pattern=pattern, dry_run=dry_run)
+        return
+    if dry_run or manifest:
+        typer.secho("\nERROR: --dry-run and --manifest require --all.", fg="red")
+        raise typer.Exit(1)
+    changelog = get_changelog()
     try:
         changelog.cut_release(force=force, tag=tag)
     except ChangelogMissingConfigError as exc:
@@ -143,16 +495,113 @@ Run the following before cutting a release:
     save_changelog(changelog)
 
 
+def _release_all(force: Optional[Bump], tag: Optional[str], manifest: Optional[Path], pattern: str, dry_run: bool):
+    if tag:
+        typer.secho("\nERROR: --tag cannot be combined with --all, as each changelog gets its own tag.", fg="red")
+        raise typer.Exit(1)
+    try:
+        paths = find_changelogs(pattern=pattern, manifest=str(manifest) if manifest else None)
+        releases = {release.path: release for release in prepare_releases(paths, force=force)}
+        if releases and not dry_run:
+            commit_releases(list(releases.values()))
+    except (ChangelogError, OSError) as exc:
+        typer.secho(f"\nERROR: {exc}", fg="red")
+        raise typer.Exit(1)
+    for path in paths:
+        if path in releases:
+            release = releases[path]
+            typer.echo(f"{path}: {release.previous_tag or '(none)'} -> {release.tag} ({release.bump})")
+        else:
+            typer.echo(f"{path}: skipped, nothing unreleased")
+    if dry_run:
+        typer.echo(f"Would release {len(releases)} of {len(paths)} changelogs")
+    else:
+        typer.echo(f"Released {len(releases)} of {len(paths)} changelogs")
+
+
 @app.command()
-def entry(
-    change_type: str = typer.Argument(...),
-    message: List[str] = typer.Option(..., "--message", "-m", help="Message describing changelog entry."),
-    breaking: bool = typer.Option(False, "--breaking", "-b", help="Mark this change as a breaking change."),
-    tag: Optional[str] = typer.Option(
-        None, "--tag", "-t", help="Specify the release tag for this entry. Will add to unreleased tag by default."
+def archive(
+    keep: int = typer.Option(..., "--keep", "-k", help="Number of most recent releases to keep in the changelog."),
+):
+    """Move all but the most recent releases into an archive file, linked from the changelog.
+
+    Commands which need archived releases, such as `show`, load the archive only when needed.
+    """
+    from changelog.archive import archive_releases, write_archive
+
+    path = global_options()["path"]
+    changelog = get_changelog()
+    try:
+        archived = archive_releases(changelog, keep=keep, path=path)
+        if not archived:
+            typer.echo("No releases to archive")
+            return
+        archive_path, archive_changelog = archived
+        if is_database_path(path):
+            # The archive is a Markdown file, so cannot be written together with the database.
+            write_archive(archive_path, archive_changelog)
+            save_changelog(changelog)
+        else:
+            write_archive(archive_path, archive_changelog, changelog=changelog, path=path)
+    except (ChangelogError, OSError) as exc:
+        typer.secho(f"\nERROR: {exc}", fg="red")
+        raise typer.Exit(1)
+    typer.echo(f"Archived {len(archive_changelog.releases)} releases to {archive_path}")
+
+
+@app.command()
+def show(
+    tag: str = typer.Argument(
+        ..., help="Tag of the release to show.", autocompletion=argument_completion(complete_release_tag)
+    ),
+):
+    """Show a single release, looking in archives if it is not in the changelog."""
+    from changelog.archive import find_release
+
+    changelog = get_changelog()
+    try:
+        section = find_release(changelog, tag, path=global_options()["path"])
+    except (ChangelogError, OSError) as exc:
+        typer.secho(f"\nERROR: {exc}", fg="red")
+        raise typer.Exit(1)
+    typer.echo(render_changelog_release(ReleaseTag(tag), section))
+
+
+@app.command(name="import-git")
+def import_git(
+    since: str = typer.Option(
+        ..., "--since", "-s", help="Git ref to import commits since, e.g. the tag of the previous release."
+    ),
+    repository: Optional[Path] = typer.Option(
+        None, "--repository", "-r", help="Path to the git repository. Defaults to the current directory."
     ),
 ):
-    """Add a new entry to the changelog."""
+    """Add unreleased entries for each conventional commit since a git ref.
+
+    Commits which already have an identical entry in the changelog are skipped.
+    """
+    from changelog.git import import_commits, iter_commits
+
     changelog = get_changelog()
-    changelog.add_entry(cast(ChangeType, change_type.title()), *message, breaking=breaking, tag=tag)
+    try:
+        added, skipped = import_commits(
+            changelog, iter_commits(since, repository=str(repository) if repository else None)
+        )
+    except ChangelogError as exc:
+        typer.secho(f"\nERROR: {exc}", fg="red")
+        raise typer.Exit(1)
     save_changelog(changelog)
+    typer.echo(f"Imported {added} entries ({skipped} duplicates skipped)")
+
+
+@app.command()
+def lsp():
+    """Run a language server for changelogs, communicating over standard input and output.
+
+    Reports parse and validation errors as you type, completes release tags, links and change types, and formats
+    changelogs.
+    """
+    from changelog.lsp import LanguageServer
+
+    server = LanguageServer(sys.stdin.buffer, sys.stdout.buffer)
+    raise typer.Exit(server.serve())
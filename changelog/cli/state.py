@@ -4,8 +4,9 @@ from functools import lru_cache
 import typer
 
 from changelog import dump_to_file, load_from_file
-from changelog.exceptions import ChangelogParseError, ChangelogValidationError
+from changelog.exceptions import ChangelogError, ChangelogParseError, ChangelogValidationError
 from changelog.model import Changelog
+from changelog.storage import SqliteStorage, is_database_path
 
 
 @lru_cache(maxsize=None)
@@ -13,10 +14,18 @@ def global_options():
     return {"path": os.getenv("CHANGELOG_PATH", "CHANGELOG.md")}
 
 
-def get_changelog() -> Changelog:
-    path = global_options()["path"]
+def get_changelog(path: str = None) -> Changelog:
+    path = path or global_options()["path"]
+    if not os.path.exists(path):
+        # Only `init` creates a changelog; other commands must not leave an empty file or database behind.
+        typer.secho(f"\nERROR: Changelog {path} not found. Run 'changelog init' to create one.", fg="red")
+        raise typer.Exit(1)
     try:
-        changelog = load_from_file(path=path)
+        if is_database_path(path):
+            with SqliteStorage(path, create=False) as storage:
+                changelog = storage.load()
+        else:
+            changelog = load_from_file(path=path)
     except (ChangelogParseError, ChangelogValidationError) as exc:
         typer.secho(
             f"""
@@ -24,9 +33,29 @@ ERROR: Could not parse changelog: {str(exc)}""",
             fg="red",
         )
         raise typer.Exit(1)
+    except ChangelogError as exc:
+        typer.secho(f"\nERROR: {exc}", fg="red")
+        raise typer.Exit(1)
     return changelog
 
 
 def save_changelog(changelog: Changelog):
     path = global_options()["path"]
+    if is_database_path(path):
+        with SqliteStorage(path) as storage:
+            storage.save(changelog)
+        return
     dump_to_file(changelog, path=path)
+
+
+def require_markdown(command: str) -> str:
+    """Exit with an error if the changelog is stored in a database, for commands which work on Markdown text."""
+    path = global_options()["path"]
+    if is_database_path(path):
+        typer.secho(
+            f"\nERROR: '{command}' requires a Markdown changelog. Run 'changelog export --format markdown' to "
+            "render one.",
+            fg="red",
+        )
+        raise typer.Exit(1)
+    return path
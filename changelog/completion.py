@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Optional
+
+from changelog.storage import SqliteStorage, is_database_path
+from changelog.utils import atomic_write
+
+# Release headers, as recognised by the parser, without the optional date.
+_RELEASE_HEADER_PATTERN = re.compile(rb"## \[(?P<tag>.+)\]")
+
+
+def default_cache_dir() -> str:
+    return os.path.join(os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "changelog-cmd")
+
+
+def release_tags(path: str, cache_dir: str = None) -> List[str]:
+    """List the release tags of a changelog, in order, for shell completion.
+
+    Tags are scanned from release headers without parsing the changelog, and cached in a small file keyed by the
+    changelog's path. The cache is reused for as long as the changelog's modification time, size and inode are
+    unchanged, so completing a tag does not read the changelog at all in the common case.
+
+    :param path: The path to the changelog. Databases are queried directly, as their tags are already indexed.
+    :param cache_dir: Directory to store cached tags in. Defaults to `changelog-cmd` in the user's cache directory.
+    :return: The tags, or an empty list if the changelog does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return []
+    if is_database_path(path):
+        with SqliteStorage(path) as storage:
+            return list(storage.tags())
+    key = [stat.st_mtime_ns, stat.st_size, stat.st_ino]
+    cache_path = os.path.join(
+        cache_dir or default_cache_dir(),
+        hashlib.blake2b(os.path.abspath(path).encode(), digest_size=16).hexdigest() + ".json",
+    )
+    cached = _read_cache(cache_path)
+    if cached and cached.get("key") == key:
+        return cached["tags"]
+    with open(path, "rb") as file:
+        tags = _scan_tags(file.read())
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        atomic_write(cache_path, json.dumps({"key": key, "tags": tags}), fsync=False)
+    except OSError:
+        # Completion must still work if the cache cannot be written, e.g. on a read-only filesystem.
+        pass
+    return tags
+
+
+def _read_cache(cache_path: str) -> Optional[dict]:
+    try:
+        with open(cache_path, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _scan_tags(content: bytes) -> List[str]:
+    """Find the tag of every release header, searching for their fixed prefix rather than splitting lines."""
+    starts = [0] if content.startswith(b"## [") else []
+    position = content.find(b"\n## [")
+    while position >= 0:
+        starts.append(position + 1)
+        position = content.find(b"\n## [", position + 1)
+    # Releases may be repeated, in which case the parser combines them.
+    tags: Dict[str, None] = {}
+    for start in starts:
+        match = _RELEASE_HEADER_PATTERN.match(content, start)
+        if match:
+            tags[match.group("tag").decode("utf-8", errors="replace")] = None
+    return list(tags)
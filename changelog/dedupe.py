@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from changelog.model import _UNRELEASED, Changelog, Entry, EntryLocation, ReleaseTag
+
+DEFAULT_THRESHOLD = 0.7
+
+# Signatures have 64 bins, split into 16 bands of 4. Entries which agree on every bin of any band are candidates,
+# which gives a high chance of finding entries with a similarity of 0.7 or more, and a low chance of comparing
+# dissimilar ones.
+_BINS = 64
+_ROWS_PER_BAND = 4
+_SHINGLE_SIZE = 4
+# Larger than any hashed value, so that any value replaces it
+_EMPTY = 1 << 32
+
+_NORMALISE_PATTERN = re.compile(r"[\W_]+")
+
+
+@dataclass
+class DuplicateGroup:
+    """Entries with near-identical text. The entry to keep is listed first."""
+
+    locations: List[EntryLocation]
+
+    @property
+    def kept(self) -> EntryLocation:
+        return self.locations[0]
+
+    @property
+    def duplicates(self) -> List[EntryLocation]:
+        return self.locations[1:]
+
+
+def shingles(text: str) -> FrozenSet[str]:
+    """Split text into the set of overlapping character sequences it contains, ignoring case and punctuation."""
+    normalised = _NORMALISE_PATTERN.sub(" ", text.lower()).strip()
+    if len(normalised) <= _SHINGLE_SIZE:
+        return frozenset([normalised])
+    return frozenset(normalised[index : index + _SHINGLE_SIZE] for index in range(len(normalised) - _SHINGLE_SIZE + 1))
+
+
+def similarity(left: FrozenSet[str], right: FrozenSet[str]) -> float:
+    """Jaccard similarity of two sets of shingles."""
+    if not left and not right:
+        return 1.0
+    intersection = len(left & right)
+    return intersection / (len(left) + len(right) - intersection)
+
+
+def minhash(text_shingles: Iterable[str]) -> List[int]:
+    """Compute a MinHash signature using one permutation hashing.
+
+    Each shingle is hashed once, and the hash split into a bin and a value, keeping the minimum value in each bin.
+    Empty bins are filled from the next non-empty bin, so that short texts still have comparable signatures.
+    """
+    signature = [_EMPTY] * _BINS
+    for hashed in map(zlib.crc32, map(str.encode, text_shingles)):
+        index, value = hashed % _BINS, hashed // _BINS
+        if value < signature[index]:
+            signature[index] = value
+    filled = [index for index, value in enumerate(signature) if value != _EMPTY]
+    if not filled or len(filled) == _BINS:
+        return signature
+    densified = list(signature)
+    next_filled = filled[0] + _BINS
+    for index in reversed(range(_BINS)):
+        if signature[index] != _EMPTY:
+            next_filled = index
+        else:
+            # Offset the borrowed value by the distance it was borrowed from, to keep bins distinguishable.
+            densified[index] = signature[next_filled % _BINS] + (next_filled - index) * _EMPTY
+    return densified
+
+
+def find_duplicates(
+    changelog: Changelog, tags: Optional[Iterable[str]] = None, threshold: float = DEFAULT_THRESHOLD
+) -> List[DuplicateGroup]:
+    """Find groups of top-level entries with near-identical text.
+
+    Candidates are found by locality sensitive hashing of MinHash signatures, so the cost is close to linear in
+    the number of entries, rather than comparing every pair. Candidates are then confirmed by comparing their
+    shingles exactly.
+
+    :param tags: The releases to search. Defaults to the unreleased section.
+    :param threshold: The minimum Jaccard similarity of the shingles of two entries for them to be duplicates.
+    :return: Groups of duplicate entries, in the order they appear in the changelog. In each group, the entry to
+        keep is listed first: the entry from the oldest release, or else the first to appear.
+    """
+    tags = {ReleaseTag(tag) for tag in tags} if tags is not None else {_UNRELEASED}
+    release_order = {tag: index for index, tag in enumerate(changelog.releases)}
+    locations = [
+        location
+        for location in changelog.entry_index.locations.values()
+        if not location.ancestors and location.tag in tags
+    ]
+    entry_shingles = [shingles(location.entry.text) for location in locations]
+    parents = list(range(len(locations)))
+
+    def find(index: int) -> int:
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    # Each band is bucketed separately. Within a bucket, entries are compared against the first in the bucket only,
+    # so that many identical entries do not cause a quadratic number of comparisons.
+    buckets: Dict[Tuple[int, Tuple[int, ...]], int] = {}
+    for index, text_shingles in enumerate(entry_shingles):
+        signature = minhash(text_shingles)
+        for band in range(0, _BINS, _ROWS_PER_BAND):
+            key = (band, tuple(signature[band : band + _ROWS_PER_BAND]))
+            first = buckets.setdefault(key, index)
+            if first == index or find(first) == find(index):
+                continue
+            if similarity(entry_shingles[first], text_shingles) >= threshold:
+                parents[find(index)] = find(first)
+
+    groups: Dict[int, List[int]] = {}
+    for index in range(len(locations)):
+        groups.setdefault(find(index), []).append(index)
+    return [
+        DuplicateGroup(
+            # Sorting is stable, so entries from the same release stay in the order they appear.
+            sorted([locations[index] for index in members], key=lambda location: -release_order[location.tag])
+        )
+        for members in groups.values()
+        if len(members) > 1
+    ]
+
+
+def merge_duplicates(changelog: Changelog, group: DuplicateGroup, keep: int = 0) -> Entry:
+    """Remove all but one of a group of duplicate entries.
+
+    Nested entries of the removed entries are added to the kept entry, unless it already has one with the same text.
+
+    :param keep: The index within the group of the entry to keep.
+    :return: The kept entry.
+    """
+    kept = group.locations[keep]
+    children = list(kept.entry.children)
+    child_texts = {child.text for child in children}
+    for index, location in enumerate(group.locations):
+        if index == keep:
+            continue
+        for child in changelog.remove_entry(location.entry_id).children:
+            if child.text not in child_texts:
+                child_texts.add(child.text)
+                children.append(child)
+    if len(children) != len(kept.entry.children):
+        # Re-index the kept entry, so that the children it gained are indexed too.
+        entry_index = changelog.entry_index
+        entry_index.discard(kept)
+        kept.entry.children = children
+        entry_index.add(kept.tag, kept.change_type, kept.entry, kept.siblings, kept.ancestors, kept.position)
+    return kept.entry
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import hashlib
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from changelog.model import _UNRELEASED, Changelog, Entry
+
+
+@dataclass
+class MerkleNode:
+    """A node in a hash tree of a changelog.
+
+    Each node's digest covers its own content and the digests of its children, so two subtrees with equal digests
+    are identical and need not be compared any further.
+    """
+
+    digest: bytes
+    # Digest of the node's own content, excluding its children
+    content_digest: bytes
+    # Text describing the node, e.g. the text of an entry
+    label: str = ""
+    children: Dict[str, MerkleNode] = field(default_factory=dict)
+    # Entries are kept as a list, as entries in a section need not be unique
+    entries: List[MerkleNode] = field(default_factory=list)
+
+
+@dataclass
+class Change:
+    kind: str  # One of "added", "removed", "modified" or "reordered"
+    path: Tuple[str, ...]
+    text: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "path": list(self.path)}
+
+    def __str__(self) -> str:
+        symbol = {"added": "+", "removed": "-", "modified": "~", "reordered": "~"}[self.kind]
+        description = " / ".join(self.path)
+        if self.kind == "reordered":
+            description += " (reordered)"
+        return f"{symbol} {description}: {self.text}" if self.text is not None else f"{symbol} {description}"
+
+
+def _digest(kind: bytes, *parts: bytes) -> bytes:
+    hasher = hashlib.blake2b(kind, digest_size=16)
+    for part in parts:
+        # Prefix each part with its length, so that different splits of the same bytes hash differently.
+        hasher.update(len(part).to_bytes(8, "little"))
+        hasher.update(part)
+    return hasher.digest()
+
+
+def hash_changelog(changelog: Changelog) -> MerkleNode:
+    """Build a hash tree of a changelog, with a node for each release, change type and entry."""
+    releases: Dict[str, MerkleNode] = {
+        tag: _node(
+            b"release",
+            [(section.timestamp or "").encode()],
+            label=section.timestamp or "",
+            # Change types are always rendered in the same order, so their order is not significant
+            children={
+                change_type: _hash_change_type(entries) for change_type, entries in sorted(section.entries.items())
+            },
+        )
+        for tag, section in changelog.releases.items()
+    }
+    sections = {
+        "header": _node(b"header", [changelog.header.encode()]),
+        "config": _node(
+            b"config", [f"{key}={value}".encode() for key, value in sorted(vars(changelog.config).items()) if value]
+        ),
+        "releases": _node(b"releases", [], children=releases),
+        "links": _node(
+            b"links",
+            [],
+            children={
+                link_name: _node(b"link", [link_target.encode()], label=link_target)
+                for link_name, link_target in changelog.links.items()
+            },
+        ),
+    }
+    return _node(b"changelog", [], children=sections)
+
+
+def _node(
+    kind: bytes,
+    parts: List[bytes],
+    label: str = "",
+    children: Dict[str, MerkleNode] = None,
+    entries: List[MerkleNode] = None,
+) -> MerkleNode:
+    children = children or {}
+    entries = entries or []
+    content_digest = _digest(kind, *parts)
+    child_digests = [
+        *(_digest(b"key", key.encode(), child.digest) for key, child in children.items()),
+        *(entry.digest for entry in entries),
+    ]
+    return MerkleNode(
+        digest=_digest(kind, content_digest, *child_digests),
+        content_digest=content_digest,
+        label=label,
+        children=children,
+        entries=entries,
+    )
+
+
+def _hash_change_type(entries: List[Entry]) -> MerkleNode:
+    return _node(b"change_type", [], entries=[hash_entry(entry) for entry in entries])
+
+
+def hash_entry(root: Entry) -> MerkleNode:
+    """Hash an entry and its children, without recursion."""
+    nodes: Dict[int, MerkleNode] = {}
+    stack: List[Tuple[Entry, bool]] = [(root, False)]
+    while stack:
+        entry, children_hashed = stack.pop()
+        if not children_hashed:
+            stack.append((entry, True))
+            stack.extend((child, False) for child in entry.children)
+            continue
+        nodes[id(entry)] = _node(
+            b"entry",
+            [entry.text.encode()],
+            label=entry.text,
+            entries=[nodes.pop(id(child)) for child in entry.children],
+        )
+    return nodes[id(root)]
+
+
+def diff_changelogs(old: Changelog, new: Changelog) -> List[Change]:
+    """Summarise the structural differences between two changelogs.
+
+    Both changelogs are hashed, and the hash trees are compared from the top down, so only subtrees which
+    differ are walked.
+    """
+    return list(diff_trees(hash_changelog(old), hash_changelog(new)))
+
+
+def diff_trees(old: MerkleNode, new: MerkleNode, path: Tuple[str, ...] = ()) -> Iterator[Change]:
+    if old.digest == new.digest:
+        return
+    if old.content_digest != new.content_digest:
+        yield Change(kind="modified", path=path, text=new.label or None)
+    for key, old_child in old.children.items():
+        if key not in new.children:
+            yield Change(kind="removed", path=(*path, key), text=old_child.label or None)
+    for key, new_child in new.children.items():
+        if key not in old.children:
+            yield Change(kind="added", path=(*path, key), text=new_child.label or None)
+            continue
+        yield from diff_trees(old.children[key], new_child, (*path, key))
+    common_keys = [key for key in old.children if key in new.children]
+    if common_keys != [key for key in new.children if key in old.children]:
+        yield Change(kind="reordered", path=path)
+    yield from _diff_entries(old.entries, new.entries, path)
+
+
+def _diff_entries(old: List[MerkleNode], new: List[MerkleNode], path: Tuple[str, ...]) -> Iterator[Change]:
+    """Compare entries as multisets of digests, reporting those which only appear on one side."""
+    old_counts = Counter(entry.digest for entry in old)
+    new_counts = Counter(entry.digest for entry in new)
+    removed = old_counts - new_counts
+    added = new_counts - old_counts
+    for entry in old:
+        if removed[entry.digest]:
+            removed[entry.digest] -= 1
+            yield Change(kind="removed", path=path, text=entry.label)
+    for entry in new:
+        if added[entry.digest]:
+            added[entry.digest] -= 1
+            yield Change(kind="added", path=path, text=entry.label)
+    if not removed and not added and [entry.digest for entry in old] != [entry.digest for entry in new]:
+        yield Change(kind="reordered", path=path)
+
+
+def only_unreleased_changed(changes: List[Change]) -> bool:
+    """Check whether all changes are to the unreleased section."""
+    return all(change.path[:2] == ("releases", _UNRELEASED) for change in changes)
@@ -1,9 +1,14 @@
+from typing import Optional
+
+
 class ChangelogError(Exception):
     pass
 
 
 class ChangelogParseError(ChangelogError):
-    pass
+    def __init__(self, message: str, line: Optional[int] = None):
+        super().__init__(message)
+        self.line = line
 
 
 class ChangelogValidationError(ChangelogError):
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from changelog.model import Changelog, ReleaseSection, ReleaseTag, RevisionedDict
+from changelog.parser import ParserState, loads
+
+# Sections start at release headers, as recognised by the parser.
+SECTION_START_PATTERN = re.compile(r"## \[.+\]")
+# Line boundaries recognised by `str.splitlines`, other than those already translated to newlines when reading.
+_OTHER_LINE_BOUNDARIES = "\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+
+@dataclass
+class ParsedSection:
+    """The result of parsing one release section, including any links and config which follow it."""
+
+    tag: ReleaseTag
+    section: ReleaseSection
+    links: Dict[str, str]
+    config: List[Tuple[str, str]]
+    # The change type in effect at the end of the section, which carries over into the next section.
+    change_type: Optional[str]
+    # Whether entries were left on the entry stack, which happens before the first change type of the changelog. The
+    # parser carries them over into the next section, so the section cannot be combined with the others.
+    carries_entries: bool = False
+
+
+@dataclass
+class _SectionParserState(ParserState):
+    config_assignments: List[Tuple[str, str]] = field(default_factory=list)
+
+    def set_config(self, field_name: str, value: str) -> None:
+        self.config_assignments.append((field_name, value))
+
+
+class ChangelogFile:
+    """A changelog file held by a long-running process, which is re-parsed incrementally when it changes.
+
+    The file is split into sections at release headers, and the parsed form of each section is cached by a hash
+    of its text. When the file changes, only sections whose text changed are parsed again; all other releases are
+    reused from the previous version.
+
+    >>> changelog_file = ChangelogFile("CHANGELOG.md")
+    >>> changelog_file.refresh()  # Returns whether the file changed
+    >>> changelog_file.changelog
+
+    The changelog is shared with later versions, so must be treated as read-only.
+
+    :param path: The path to the changelog file.
+    :param tab_indent: The number of spaces to expand tabs to.
+    """
+
+    def __init__(self, path: str = "CHANGELOG.md", tab_indent: int = 2):
+        self.path = path
+        self.tab_indent = tab_indent
+        self._stat: Optional[Tuple[int, int, int]] = None
+        self._sections: Dict[Tuple[bytes, Optional[str]], ParsedSection] = {}
+        self._changelog: Optional[Changelog] = None
+        self.refresh()
+
+    @property
+    def changelog(self) -> Changelog:
+        assert self._changelog is not None
+        return self._changelog
+
+    def refresh(self) -> bool:
+        """Reload the changelog if the file has changed since it was last loaded.
+
+        :return: Whether the file had changed.
+        :raises ChangelogError: if the changed file cannot be parsed or is invalid. The previous version is kept.
+        """
+        stat = os.stat(self.path)
+        key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if key == self._stat:
+            return False
+        with open(self.path, "r") as file:
+            text = file.read()
+        self._changelog = self._parse(text)
+        self._stat = key
+        return True
+
+    def _parse(self, text: str) -> Changelog:
+        starts = _section_starts(text)
+        if not starts or any(boundary in text for boundary in _OTHER_LINE_BOUNDARIES):
+            # Sections could not be split exactly as the parser splits lines, so parse the whole file.
+            self._sections = {}
+            return loads(text, tab_indent=self.tab_indent)
+        cached: Dict[Tuple[bytes, Optional[str]], ParsedSection] = {}
+        sections: List[ParsedSection] = []
+        change_type = None
+        line_offset = 0
+        previous_start = 0
+        for start, end in zip(starts, [*starts[1:], len(text)]):
+            span = text[start:end]
+            key = (hashlib.blake2b(span.encode(), digest_size=16).digest(), change_type)
+            parsed = self._sections.get(key)
+            if parsed is None:
+                # Line numbers are only needed to report errors, so are only counted for sections being parsed.
+                line_offset += text.count("\n", previous_start, start)
+                previous_start = start
+                parsed = parse_section(self._lines(span), line_offset, change_type)
+            cached[key] = parsed
+            sections.append(parsed)
+            change_type = parsed.change_type
+        changelog = combine_sections(parse_header(self._lines(text[: starts[0]])), sections)
+        if changelog is None:
+            self._sections = {}
+            return loads(text, tab_indent=self.tab_indent)
+        changelog.validate()
+        self._sections = cached
+        return changelog
+
+    def _lines(self, text: str) -> List[str]:
+        return text.replace("\t", self.tab_indent * " ").splitlines()
+
+
+def parse_header(lines: Iterable[str]) -> ParserState:
+    """Parse the lines before the first release."""
+    parser_state = ParserState()
+    for index, line in enumerate(lines):
+        parser_state.parse_line(index, line)
+    return parser_state
+
+
+def parse_section(lines: Iterable[str], line_offset: int, change_type: Optional[str]) -> ParsedSection:
+    """Parse the lines from one release header up to the next.
+
+    :param line_offset: The index of the release header in the whole changelog, for reporting errors.
+    :param change_type: The change type in effect at the end of the previous section.
+    """
+    parser_state = _SectionParserState(change_type=change_type)
+    for index, line in enumerate(lines, line_offset):
+        parser_state.parse_line(index, line)
+    parser_state.flush()
+    ((tag, section),) = parser_state.changelog.releases.items()
+    return ParsedSection(
+        tag=tag,
+        section=section,
+        links=dict(parser_state.changelog.links),
+        config=parser_state.config_assignments,
+        change_type=parser_state.change_type,
+        carries_entries=bool(parser_state.entry_stack),
+    )
+
+
+def combine_sections(header_state: ParserState, sections: Iterable[ParsedSection]) -> Optional[Changelog]:
+    """Combine the parsed header and sections into an unvalidated changelog.
+
+    :return: The changelog, or None if a release is repeated or a section carries entries over into the next. The
+        parser combines repeated releases and carries entries between releases, which parsed sections cannot
+        represent, so the changelog must be parsed in full instead.
+    """
+    changelog = header_state.finish()
+    changelog.releases = RevisionedDict()
+    changelog.links = RevisionedDict()
+    for parsed in sections:
+        if parsed.tag in changelog.releases or parsed.carries_entries:
+            return None
+        changelog.releases[parsed.tag] = parsed.section
+        changelog.links.update(parsed.links)
+        for field_name, value in parsed.config:
+            header_state.set_config(field_name, value)
+    return changelog
+
+
+def _section_starts(text: str) -> List[int]:
+    """Find the offset of each release header.
+
+    Searching for the fixed prefix of a header is much faster than matching a multi-line regular expression.
+    """
+    starts = [0] if SECTION_START_PATTERN.match(text) else []
+    position = text.find("\n## [")
+    while position >= 0:
+        if SECTION_START_PATTERN.match(text, position + 1):
+            starts.append(position + 1)
+        position = text.find("\n## [", position + 1)
+    return starts
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from changelog.exceptions import ChangelogError
+from changelog.model import Changelog, ChangeType, Entry
+
+# Conventional commit types which warrant a changelog entry. Other types (docs, chore, ci, ...) are skipped.
+COMMIT_CHANGE_TYPES: Dict[str, ChangeType] = {
+    "feat": "Added",
+    "fix": "Fixed",
+    "perf": "Changed",
+    "revert": "Changed",
+    "deprecate": "Deprecated",
+    "remove": "Removed",
+    "security": "Security",
+}
+
+_CONVENTIONAL_COMMIT_PATTERN = re.compile(
+    r"^(?P<type>[a-zA-Z]+)(\((?P<scope>[^()]*)\))?(?P<breaking>!)?: *(?P<description>.+)$"
+)
+_BREAKING_FOOTER_PATTERN = re.compile(r"^BREAKING[ -]CHANGE: ", re.MULTILINE)
+
+# Commits are separated by a record separator character, and the hash from the message by a unit separator.
+_RECORD_SEPARATOR = "\x1e"
+_UNIT_SEPARATOR = "\x1f"
+
+
+@dataclass
+class Commit:
+    sha: str
+    message: str
+
+    @property
+    def subject(self) -> str:
+        return self.message.split("\n", 1)[0].strip()
+
+    def parse(self) -> Optional[Tuple[ChangeType, str, bool]]:
+        """Parse a conventional commit message into a change type, entry text and whether it is breaking.
+
+        Returns None if the commit does not follow the conventional commit format, or has a type which does
+        not warrant a changelog entry.
+        """
+        match = _CONVENTIONAL_COMMIT_PATTERN.match(self.subject)
+        if not match:
+            return None
+        change_type = COMMIT_CHANGE_TYPES.get(match["type"].lower())
+        if not change_type:
+            return None
+        text = f"{match['scope']}: {match['description']}" if match["scope"] else match["description"]
+        breaking = bool(match["breaking"]) or bool(_BREAKING_FOOTER_PATTERN.search(self.message))
+        return change_type, text, breaking
+
+
+def iter_commits(since: str, repository: str = None) -> Iterator[Commit]:
+    """Stream commits made since a given ref, oldest first, from a single `git log` process.
+
+    :param since: Any git ref, e.g. the tag of the previous release. Commits reachable from it are excluded.
+    :param repository: Path to the git repository. Defaults to the current directory.
+    :raises ChangelogError: if `git log` fails, e.g. because the ref does not exist.
+    """
+    # Errors are written to a file rather than a pipe, as git would block on a full pipe which is only read once it
+    # has finished writing commits.
+    with tempfile.TemporaryFile("w+") as stderr:
+        try:
+            process = subprocess.Popen(
+                [
+                    "git",
+                    "log",
+                    "--reverse",
+                    f"--format=%H{_UNIT_SEPARATOR}%B{_RECORD_SEPARATOR}",
+                    # The ref is never read as an option, even if it starts with a dash, nor as a path.
+                    "--end-of-options",
+                    f"{since}..HEAD",
+                    "--",
+                ],
+                cwd=repository,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                text=True,
+            )
+        except OSError as exc:
+            raise ChangelogError(f"Failed to run git: {exc}")
+        with process:
+            assert process.stdout
+            record: List[str] = []
+            for line in process.stdout:
+                if _RECORD_SEPARATOR not in line:
+                    record.append(line)
+                    continue
+                end, _ = line.split(_RECORD_SEPARATOR, 1)
+                sha, message = "".join([*record, end]).lstrip("\n").split(_UNIT_SEPARATOR, 1)
+                record = []
+                yield Commit(sha=sha, message=message.strip())
+        stderr.seek(0)
+        error = stderr.read()
+    if process.returncode:
+        raise ChangelogError(f"Failed to read git history since {since!r}: {error.strip()}")
+
+
+def import_commits(changelog: Changelog, commits: Iterable[Commit]) -> Tuple[int, int]:
+    """Add an unreleased entry for each conventional commit, skipping any which are already in the changelog.
+
+    Entries are compared by a hash of their text, across all releases.
+
+    :return: The number of entries added, and the number of duplicate entries skipped.
+    """
+    token = changelog.config.get("breaking_change_token", "BREAKING")
+    existing = {_text_hash(entry.text) for entry in _iter_all_entries(changelog)}
+    added = skipped = 0
+    for commit in commits:
+        parsed = commit.parse()
+        if not parsed:
+            continue
+        change_type, text, breaking = parsed
+        digest = _text_hash(f"{token} {text}" if breaking else text)
+        if digest in existing:
+            skipped += 1
+            continue
+        existing.add(digest)
+        changelog.add_entry(change_type, text, breaking=breaking)
+        added += 1
+    return added, skipped
+
+
+def _iter_all_entries(changelog: Changelog) -> Iterator[Entry]:
+    for section in changelog.releases.values():
+        for entries in section.entries.values():
+            yield from entries
+
+
+def _text_hash(text: str) -> bytes:
+    return hashlib.blake2b(text.strip().encode("utf-8"), digest_size=16).digest()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from contextlib import contextmanager
+from copy import deepcopy
+from dataclasses import replace
+from typing import Deque, Iterable, Iterator, Tuple
+
+from changelog.exceptions import ChangelogError
+from changelog.model import _UNRELEASED, Bump, Changelog, ChangeType, ReleaseTag, RevisionedDict
+
+
+class ChangelogHandle:
+    """Share a changelog between threads, for example in a long-running service.
+
+    Readers call `snapshot` to get the current version of the changelog, without locking. Each change produces a new
+    version, rather than modifying the existing one, so a snapshot stays consistent however long it is held. New
+    versions share every release they did not change with the previous version, so changes are cheap however
+    large the changelog is, and past versions can be kept for `undo` and `redo`.
+
+    Only the entries of releases are copied on write. Each version has its own releases, links and config, and builds
+    its own entry index when first needed, but the entries of a release are shared between versions until a change is
+    made to that release. Snapshots must therefore be treated as read-only: make changes through the handle instead.
+
+    >>> handle = ChangelogHandle(load_from_file("CHANGELOG.md"))
+    >>> snapshot = handle.snapshot()
+    >>> changed = handle.add_entry("Added", "A new feature")  # Does not affect `snapshot`
+
+    :param changelog: The initial version of the changelog. It must not be modified after creating the handle.
+    :param history: The number of past versions to keep for `undo`.
+    """
+
+    def __init__(self, changelog: Changelog, history: int = 100):
+        self._current = changelog
+        self._undo: Deque[Changelog] = deque(maxlen=history)
+        self._redo: Deque[Changelog] = deque(maxlen=history)
+        # Only writers take the lock; readers rely on replacing the current version being atomic.
+        self._lock = threading.RLock()
+
+    def snapshot(self) -> Changelog:
+        """Get the current version of the changelog."""
+        return self._current
+
+    @contextmanager
+    def write(self, tags: Iterable[str] = ()) -> Iterator[Changelog]:
+        """Make changes to a new version of the changelog, which becomes current when the block exits.
+
+        Writers are serialised, and readers see either the previous version or the new one, never a partial change.
+        If an exception is raised inside the block, the new version is discarded.
+
+        :param tags: The releases which will be changed. Only these releases are copied; all others are shared with
+            the previous version, and must not be modified. Releases may be added, removed or reordered freely.
+        """
+        with self._lock:
+            changelog = _copy_on_write(self._current, [ReleaseTag(tag) for tag in tags])
+            yield changelog
+            changelog.validate()
+            self._undo.append(self._current)
+            self._redo.clear()
+            self._current = changelog
+
+    def add_entry(self, change_type: ChangeType, *items: str, breaking: bool = False, tag: str = None) -> Changelog:
+        with self.write([tag or _UNRELEASED]) as changelog:
+            changelog.add_entry(change_type, *items, breaking=breaking, tag=tag)
+        return changelog
+
+    def cut_release(self, force: Bump = None, tag: str = None) -> Tuple[ReleaseTag, Changelog]:
+        with self.write([_UNRELEASED]) as changelog:
+            release_tag, _ = changelog.cut_release(force=force, tag=tag)
+        return release_tag, changelog
+
+    def edit_entry(self, entry_id: str, text: str) -> Tuple[str, Changelog]:
+        with self._lock, self.write([self._current.get_entry(entry_id).tag]) as changelog:
+            new_id = changelog.edit_entry(entry_id, text)
+        return new_id, changelog
+
+    def remove_entry(self, entry_id: str) -> Changelog:
+        with self._lock, self.write([self._current.get_entry(entry_id).tag]) as changelog:
+            changelog.remove_entry(entry_id)
+        return changelog
+
+    def set_config(self, key: str, value: str) -> Changelog:
+        with self.write() as changelog:
+            changelog.config.set(key, value)
+        return changelog
+
+    def undo(self) -> Changelog:
+        """Restore the previous version of the changelog."""
+        with self._lock:
+            if not self._undo:
+                raise ChangelogError("Nothing to undo.")
+            self._redo.append(self._current)
+            self._current = self._undo.pop()
+            return self._current
+
+    def redo(self) -> Changelog:
+        """Restore the version of the changelog most recently undone."""
+        with self._lock:
+            if not self._redo:
+                raise ChangelogError("Nothing to redo.")
+            self._undo.append(self._current)
+            self._current = self._redo.pop()
+            return self._current
+
+
+def _copy_on_write(changelog: Changelog, tags: Iterable[ReleaseTag]) -> Changelog:
+    """Copy the top level of a changelog, and the given releases. All other releases are shared.
+
+    Cached results are not copied, so the copy validates itself and builds its own entry index. An index built from
+    the shared releases of another version would refer to the wrong entries once those releases are copied.
+    """
+    copy = Changelog(
+        header=changelog.header,
+        config=replace(changelog.config),
+        releases=RevisionedDict(changelog.releases),
+        links=RevisionedDict(changelog.links),
+    )
+    for tag in tags:
+        if tag in copy.releases:
+            copy.releases[tag] = deepcopy(copy.releases[tag])
+    return copy
@@ -0,0 +1,98 @@
+"""Hooks for measuring where time goes when using changelog as a library.
+
+Register a `Hook` to receive spans, which time operations such as parsing and rendering, and counters, such as
+the number of lines parsed. With no hooks registered, instrumented code only checks an empty tuple, so there is
+effectively no overhead.
+
+>>> class PrintingHook(Hook):
+...     def span_finished(self, name, duration, error):
+...         print(f"{name} took {duration:.3f}s")
+>>> add_hook(PrintingHook())
+"""
+
+from __future__ import annotations
+
+import functools
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, Tuple, TypeVar
+
+CallableT = TypeVar("CallableT", bound=Callable[..., Any])
+
+
+class Hook:
+    """Receives instrumentation events. Override the methods for the events of interest.
+
+    Spans may be nested, for example `loads` includes `validate`, and each span's start and finish are reported
+    in order on the thread which performed the operation.
+    """
+
+    def span_started(self, name: str) -> None:
+        pass
+
+    def span_finished(self, name: str, duration: float, error: Optional[BaseException]) -> None:
+        """
+        :param duration: The time taken, in seconds.
+        :param error: The exception which ended the span, if any.
+        """
+
+    def incremented(self, name: str, value: int) -> None:
+        pass
+
+
+# Replaced rather than modified, so that hooks may be added or removed while other threads are emitting events.
+_hooks: Tuple[Hook, ...] = ()
+
+
+def add_hook(hook: Hook) -> None:
+    global _hooks
+    _hooks = (*_hooks, hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    global _hooks
+    _hooks = tuple(registered for registered in _hooks if registered is not hook)
+
+
+def enabled() -> bool:
+    """Check whether any hooks are registered, to skip computing values which would not be reported."""
+    return bool(_hooks)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    hooks = _hooks
+    for hook in hooks:
+        hook.span_started(name)
+    start = time.perf_counter()
+    error: Optional[BaseException] = None
+    try:
+        yield
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        for hook in hooks:
+            hook.span_finished(name, duration, error)
+
+
+def instrumented(name: str) -> Callable[[CallableT], CallableT]:
+    """Decorate a function to report each call as a span, if any hooks are registered."""
+
+    def decorator(func: CallableT) -> CallableT:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _hooks:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def increment(name: str, value: int = 1) -> None:
+    for hook in _hooks:
+        hook.incremented(name, value)
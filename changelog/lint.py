@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import re
+from dataclasses import asdict, dataclass
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional
+
+from changelog.archive import is_archive_link
+from changelog.exceptions import ChangelogParseError
+from changelog.model import _UNRELEASED, Changelog, Entry, ReleaseTag
+from changelog.parser import ParserState
+
+_LINK_REFERENCE_PATTERN = re.compile(r"\[([^\[\]]+)\]")
+
+
+@dataclass
+class LintIssue:
+    line: Optional[int]
+    code: str
+    message: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def lint(text: str, tab_indent: int = 2) -> List[LintIssue]:
+    """Check a changelog for every problem in a single pass, rather than stopping at the first.
+
+    Reports parse errors, releases without links, duplicate release tags, out-of-order versions, invalid dates
+    and links which are not referenced anywhere.
+
+    :param text: The changelog text to check.
+    :param tab_indent: The number of spaces to expand tabs to, as in `loads`.
+    :return: The issues found, ordered by line number.
+    """
+    issues: List[LintIssue] = []
+    parser_state = ParserState()
+    text = text.replace("\t", tab_indent * " ")
+    for index, line in enumerate(text.splitlines()):
+        try:
+            parser_state.parse_line(index, line)
+        except ChangelogParseError as exc:
+            issues.append(LintIssue(line=exc.line, code="parse-error", message=str(exc)))
+    changelog = parser_state.finish()
+    issues.extend(_check_releases(changelog, parser_state))
+    issues.extend(_check_links(changelog, parser_state))
+    return sorted(issues, key=lambda issue: issue.line or 0)
+
+
+def lint_file(path: str = "CHANGELOG.md") -> List[LintIssue]:
+    with open(path, "r") as file:
+        contents = file.read()
+    return lint(contents)
+
+
+def _check_releases(changelog: Changelog, parser_state: ParserState) -> Iterator[LintIssue]:
+    if not changelog.releases:
+        yield LintIssue(line=None, code="no-releases", message="Changelog contains no releases!")
+        return
+    previous_semver = None
+    for tag, section in changelog.releases.items():
+        lines = parser_state.release_lines.get(tag, [])
+        line = lines[0] if lines else None
+        for duplicate_line in lines[1:]:
+            yield LintIssue(
+                line=duplicate_line,
+                code="duplicate-release",
+                message=f"Release {tag!r} is already defined at line {line}",
+            )
+        if tag not in changelog.links:
+            yield LintIssue(line=line, code="missing-link", message=f"Release {tag!r} is missing a link")
+        if tag != _UNRELEASED and not _is_valid_date(section.timestamp):
+            yield LintIssue(
+                line=line,
+                code="invalid-date",
+                message=f"Release {tag!r} does not have a valid date (expected YYYY-MM-DD)",
+            )
+        if tag.is_semver:
+            if previous_semver and tag.semver >= previous_semver:
+                yield LintIssue(
+                    line=line,
+                    code="release-order",
+                    message=f"Release {tag!r} should be listed after {ReleaseTag.from_semver(previous_semver)!r}",
+                )
+            previous_semver = tag.semver
+
+
+def _check_links(changelog: Changelog, parser_state: ParserState) -> Iterator[LintIssue]:
+    references = set(_LINK_REFERENCE_PATTERN.findall(changelog.header))
+    for section in changelog.releases.values():
+        for entries in section.entries.values():
+            references.update(_entry_references(entries))
+    for link_name in changelog.links:
+        if link_name in changelog.releases or link_name in references or is_archive_link(link_name):
+            continue
+        yield LintIssue(
+            line=parser_state.link_lines.get(link_name),
+            code="orphan-link",
+            message=f"Link {link_name!r} does not refer to a release and is not referenced",
+        )
+
+
+def _entry_references(entries: List[Entry]) -> Iterator[str]:
+    stack = list(entries)
+    while stack:
+        entry = stack.pop()
+        yield from _LINK_REFERENCE_PATTERN.findall(entry.text)
+        stack.extend(entry.children)
+
+
+def _is_valid_date(timestamp: Optional[str]) -> bool:
+    if not timestamp:
+        return False
+    try:
+        date.fromisoformat(timestamp)
+    except ValueError:
+        return False
+    return True
@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import json
+import re
+from bisect import bisect_right
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from changelog.exceptions import ChangelogError, ChangelogParseError
+from changelog.file import SECTION_START_PATTERN, ParsedSection, combine_sections, parse_header, parse_section
+from changelog.lint import LintIssue
+from changelog.model import _UNRELEASED, Bump, Changelog, ChangeType
+from changelog.parser import loads
+from changelog.renderer import dumps
+
+# Line endings recognised by the language server protocol
+_LINE_ENDING_PATTERN = re.compile(r"\r\n|\r|\n")
+
+_TAG_PREFIX_PATTERN = re.compile(r"^## \[([^\]]*)$")
+_LINK_PREFIX_PATTERN = re.compile(r"^\[([^\]]*)$")
+_CHANGE_TYPE_PREFIX_PATTERN = re.compile(r"^### (\w*)$")
+
+_SEVERITY_ERROR = 1
+_SYNC_INCREMENTAL = 2
+_COMPLETION_KIND_CONSTANT = 21
+_PARSE_ERROR = -32700
+_INVALID_REQUEST = -32600
+_METHOD_NOT_FOUND = -32601
+_INVALID_PARAMS = -32602
+_INTERNAL_ERROR = -32603
+_MESSAGE_TYPE_ERROR = 1
+
+
+class _InvalidParamsError(Exception):
+    """Raised by a request handler when the request's parameters are missing, malformed or refer to no document."""
+
+
+class _ParseError(ChangelogError):
+    """Raised when a message cannot be read, because its headers or content are malformed."""
+
+
+class Document:
+    """An open changelog, updated by incremental edits and re-parsed one release section at a time.
+
+    Each release section, from one release header to the next, is parsed separately. An edit only discards the
+    parsed form of the sections it touches, so parsing after an edit costs time proportional to the size of those
+    sections, plus a small cost per release to combine them.
+
+    :param text: The initial text of the document.
+    :param tab_indent: The number of spaces to expand tabs to.
+    """
+
+    def __init__(self, text: str, tab_indent: int = 2):
+        self.tab_indent = tab_indent
+        self.lines = _LINE_ENDING_PATTERN.split(text)
+        # The index of the header line of each release section
+        self.section_starts = [index for index, line in enumerate(self.lines) if SECTION_START_PATTERN.match(line)]
+        # Each parsed section, with the change type in effect at its start, or None if it must be parsed again.
+        self.sections: List[Optional[Tuple[Optional[str], ParsedSection]]] = [None] * len(self.section_starts)
+        # The most recent version of the document which parsed successfully
+        self.changelog: Optional[Changelog] = None
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    def apply_change(self, start: Tuple[int, int], end: Tuple[int, int], text: str) -> None:
+        """Replace the text between two positions, each a line index and a character index within that line."""
+        (start_line, start_character), (end_line, end_character) = start, end
+        new_lines = _LINE_ENDING_PATTERN.split(
+            self.lines[start_line][:start_character] + text + self.lines[end_line][end_character:]
+        )
+        self.lines[start_line : end_line + 1] = new_lines
+        shift = len(new_lines) - (end_line - start_line + 1)
+        # Release headers in the replaced lines are discarded, and any in the new lines found again.
+        first_removed = bisect_right(self.section_starts, start_line - 1)
+        first_kept = bisect_right(self.section_starts, end_line)
+        inserted = [
+            index
+            for index in range(start_line, start_line + len(new_lines))
+            if SECTION_START_PATTERN.match(self.lines[index])
+        ]
+        self.section_starts[first_removed:] = [
+            *inserted,
+            *(section_start + shift for section_start in self.section_starts[first_kept:]),
+        ]
+        self.sections[first_removed:first_kept] = [None] * len(inserted)
+        # The section containing the start of the edit changed too.
+        if first_removed:
+            self.sections[first_removed - 1] = None
+
+    def diagnose(self) -> List[LintIssue]:
+        """Parse the document, reporting the problems which would cause `loads` to fail.
+
+        Unlike `loads`, a parse error in one release section does not prevent the others from being checked.
+        """
+        issues: List[LintIssue] = []
+        header_end = self.section_starts[0] if self.section_starts else len(self.lines)
+        header_state = parse_header(self._expand_tabs(0, header_end))
+        change_type = None
+        for position, section_start in enumerate(self.section_starts):
+            cached = self.sections[position]
+            if cached is None or cached[0] != change_type:
+                section_end = (self.section_starts[position + 1 : position + 2] or [len(self.lines)])[0]
+                try:
+                    parsed = parse_section(self._expand_tabs(section_start, section_end), section_start, change_type)
+                except ChangelogParseError as exc:
+                    issues.append(LintIssue(line=exc.line, code="parse-error", message=str(exc)))
+                    continue
+                cached = self.sections[position] = (change_type, parsed)
+            change_type = cached[1].change_type
+        if issues:
+            return issues
+        parsed_sections = [cached[1] for cached in self.sections if cached]
+        changelog = combine_sections(header_state, parsed_sections)
+        if changelog is None:
+            # Repeated releases and entries carried between releases cannot be represented by parsed sections.
+            try:
+                changelog = loads(self.text, tab_indent=self.tab_indent)
+            except ChangelogError as exc:
+                return [LintIssue(line=None, code="invalid", message=str(exc))]
+        if not changelog.releases:
+            return [LintIssue(line=None, code="no-releases", message="Changelog contains no releases!")]
+        # Kept even if links are missing, to complete them.
+        self.changelog = changelog
+        for section_start, parsed in zip(self.section_starts, parsed_sections):
+            if parsed.tag not in changelog.links:
+                issues.append(
+                    LintIssue(
+                        line=section_start + 1, code="missing-link", message=f"Release {parsed.tag!r} is missing a link"
+                    )
+                )
+        return issues
+
+    def _expand_tabs(self, start: int, end: int) -> List[str]:
+        return [line.replace("\t", self.tab_indent * " ") for line in self.lines[start:end]]
+
+
+class LanguageServer:
+    """A language server for changelogs, speaking the language server protocol over a pair of byte streams.
+
+    Publishes diagnostics whenever a document is opened or changed, completes release tags, link names and change
+    types, and formats documents with the renderer.
+    """
+
+    def __init__(self, reader: BinaryIO, writer: BinaryIO):
+        self.reader = reader
+        self.writer = writer
+        self.documents: Dict[str, Document] = {}
+        self.shutdown_requested = False
+        # Positions are counted in UTF-16 code units, unless the client supports counting in code points.
+        self.utf16_positions = True
+        self.handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "initialize": self.initialize,
+            "shutdown": self.shutdown,
+            "textDocument/didOpen": self.did_open,
+            "textDocument/didChange": self.did_change,
+            "textDocument/didClose": self.did_close,
+            "textDocument/completion": self.completion,
+            "textDocument/formatting": self.formatting,
+        }
+
+    def serve(self) -> int:
+        """Handle messages until the client exits, returning the exit code."""
+        while True:
+            try:
+                message = read_message(self.reader)
+            except _ParseError as exc:
+                # The id of the request is unknown, so the client cannot match the error to it.
+                self._respond_error(None, _PARSE_ERROR, str(exc))
+                continue
+            if message is not None and not isinstance(message, dict):
+                self._respond_error(None, _INVALID_REQUEST, "Language server message is not an object.")
+                continue
+            if message is None or message.get("method") == "exit":
+                return 0 if self.shutdown_requested else 1
+            self.handle(message)
+
+    def handle(self, message: Dict[str, Any]) -> None:
+        """Handle one message. Errors in a handler are reported to the client, rather than stopping the server."""
+        handler = self.handlers.get(message.get("method", ""))
+        if "id" not in message:
+            # Notifications have no response, and unknown notifications are ignored.
+            if handler:
+                try:
+                    handler(message.get("params") or {})
+                except Exception as exc:
+                    self.notify("window/logMessage", {"type": _MESSAGE_TYPE_ERROR, "message": _describe_error(exc)})
+            return
+        if not handler:
+            self._respond_error(message["id"], _METHOD_NOT_FOUND, f"Unknown method {message.get('method')!r}")
+            return
+        try:
+            result = handler(message.get("params") or {})
+        except (_InvalidParamsError, KeyError, TypeError, ValueError) as exc:
+            self._respond_error(message["id"], _INVALID_PARAMS, _describe_error(exc))
+            return
+        except Exception as exc:
+            self._respond_error(message["id"], _INTERNAL_ERROR, _describe_error(exc))
+            return
+        write_message(self.writer, {"jsonrpc": "2.0", "id": message["id"], "result": result})
+
+    def _respond_error(self, message_id: Any, code: int, error_message: str) -> None:
+        write_message(
+            self.writer, {"jsonrpc": "2.0", "id": message_id, "error": {"code": code, "message": error_message}}
+        )
+
+    def notify(self, method: str, params: Dict[str, Any]) -> None:
+        write_message(self.writer, {"jsonrpc": "2.0", "method": method, "params": params})
+
+    def initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        encodings = params.get("capabilities", {}).get("general", {}).get("positionEncodings", [])
+        self.utf16_positions = "utf-32" not in encodings
+        return {
+            "capabilities": {
+                "positionEncoding": "utf-16" if self.utf16_positions else "utf-32",
+                "textDocumentSync": _SYNC_INCREMENTAL,
+                "completionProvider": {"triggerCharacters": ["[", " "]},
+                "documentFormattingProvider": True,
+            },
+            "serverInfo": {"name": "changelog"},
+        }
+
+    def shutdown(self, params: Dict[str, Any]) -> None:
+        self.shutdown_requested = True
+
+    def did_open(self, params: Dict[str, Any]) -> None:
+        text_document = params["textDocument"]
+        self.documents[text_document["uri"]] = Document(text_document["text"])
+        self.publish_diagnostics(text_document["uri"])
+
+    def did_change(self, params: Dict[str, Any]) -> None:
+        uri = params["textDocument"]["uri"]
+        document = self.documents.get(uri)
+        if document is None:
+            # Changes to documents which were never opened, or already closed, are ignored.
+            return
+        for change in params["contentChanges"]:
+            if "range" not in change:
+                document = self.documents[uri] = Document(change["text"])
+                continue
+            start, end = change["range"]["start"], change["range"]["end"]
+            document.apply_change(self._position(document, start), self._position(document, end), change["text"])
+        self.publish_diagnostics(uri)
+
+    def did_close(self, params: Dict[str, Any]) -> None:
+        uri = params["textDocument"]["uri"]
+        if self.documents.pop(uri, None) is None:
+            return
+        self.notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []})
+
+    def publish_diagnostics(self, uri: str) -> None:
+        document = self.documents[uri]
+        diagnostics = []
+        for issue in document.diagnose():
+            line = issue.line - 1 if issue.line else 0
+            diagnostics.append(
+                {
+                    "range": {
+                        "start": {"line": line, "character": 0},
+                        "end": {"line": line, "character": self._character(document.lines[line])},
+                    },
+                    "severity": _SEVERITY_ERROR,
+                    "code": issue.code,
+                    "source": "changelog",
+                    "message": issue.message,
+                }
+            )
+        self.notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": diagnostics})
+
+    def completion(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        document = self._document(params)
+        line_index, character = self._position(document, params["position"])
+        prefix = document.lines[line_index][:character]
+        changelog = document.changelog
+        if match := _CHANGE_TYPE_PREFIX_PATTERN.match(prefix):
+            labels = list(ChangeType.__args__)  # type: ignore
+        elif changelog and (match := _TAG_PREFIX_PATTERN.match(prefix)):
+            labels = _next_tags(changelog)
+        elif changelog and (match := _LINK_PREFIX_PATTERN.match(prefix)):
+            labels = [tag for tag in changelog.releases if tag not in changelog.links]
+        else:
+            return []
+        start = {"line": params["position"]["line"], "character": self._character(prefix[: match.start(1)])}
+        return [
+            {
+                "label": label,
+                "kind": _COMPLETION_KIND_CONSTANT,
+                "textEdit": {"range": {"start": start, "end": params["position"]}, "newText": label},
+            }
+            for label in labels
+            if label.startswith(match.group(1))
+        ]
+
+    def formatting(self, params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        document = self._document(params)
+        if document.diagnose() or document.changelog is None:
+            return None
+        formatted = dumps(document.changelog)
+        if formatted == document.text:
+            return []
+        end = {"line": len(document.lines) - 1, "character": self._character(document.lines[-1])}
+        return [{"range": {"start": {"line": 0, "character": 0}, "end": end}, "newText": formatted}]
+
+    def _document(self, params: Dict[str, Any]) -> Document:
+        uri = params["textDocument"]["uri"]
+        document = self.documents.get(uri)
+        if document is None:
+            raise _InvalidParamsError(f"Document {uri!r} is not open.")
+        return document
+
+    def _position(self, document: Document, position: Dict[str, int]) -> Tuple[int, int]:
+        """Convert a protocol position to a line index and a character index within that line."""
+        line_index = min(position["line"], len(document.lines) - 1)
+        character = position["character"]
+        if self.utf16_positions:
+            line = document.lines[line_index]
+            encoded = line.encode("utf-16-le")[: character * 2]
+            character = len(encoded.decode("utf-16-le", errors="ignore"))
+        return line_index, character
+
+    def _character(self, text: str) -> int:
+        """The length of text, in the units used by protocol positions."""
+        if self.utf16_positions:
+            return len(text.encode("utf-16-le")) // 2
+        return len(text)
+
+
+def _describe_error(exc: Exception) -> str:
+    if isinstance(exc, KeyError):
+        return f"Missing parameter {exc}"
+    return str(exc) or type(exc).__name__
+
+
+def _next_tags(changelog: Changelog) -> List[str]:
+    """Suggest tags for a new release: the unreleased section if missing, then the next versions, most likely first."""
+    tags = [] if _UNRELEASED in changelog.releases else [str(_UNRELEASED)]
+    try:
+        if _UNRELEASED in changelog.releases:
+            tags.append(str(changelog.next_tag()))
+        tags.extend(str(changelog.next_tag(force=bump)) for bump in Bump)
+    except ChangelogError:
+        # The latest release is not a semantic version, so there are no obvious next versions.
+        pass
+    return [tag for tag in dict.fromkeys(tags) if tag not in changelog.releases]
+
+
+def read_message(stream: BinaryIO) -> Optional[Dict[str, Any]]:
+    """Read one message, framed by headers, returning None at the end of the stream.
+
+    :raises ChangelogError: if the headers or content of the message are malformed. The rest of the message is
+        consumed where its length is known, so that the next message can still be read.
+    """
+    content_length = None
+    while True:
+        header = stream.readline()
+        if not header:
+            return None
+        header = header.strip()
+        if not header:
+            break
+        name, _, value = header.decode("ascii", errors="replace").partition(":")
+        if name.strip().lower() == "content-length":
+            content_length = value.strip()
+    if content_length is None:
+        raise _ParseError("Language server message has no Content-Length header.")
+    if not content_length.isdigit():
+        raise _ParseError(f"Language server message has an invalid Content-Length header {content_length!r}.")
+    content = stream.read(int(content_length))
+    try:
+        return json.loads(content.decode("utf-8"))
+    except ValueError as exc:
+        raise _ParseError(f"Language server message is not valid JSON: {exc}") from None
+
+
+def write_message(stream: BinaryIO, message: Dict[str, Any]) -> None:
+    body = json.dumps(message).encode("utf-8")
+    stream.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+    stream.flush()
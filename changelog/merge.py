@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from changelog.diff import MerkleNode, hash_changelog
+from changelog.model import _UNRELEASED, Changelog, ChangelogConfig, Entry, ReleaseSection, ReleaseTag
+from changelog.renderer import _render_changelog_entry, _render_config_field, dumps
+
+# Conflicting values are replaced with a placeholder when merging, and the line containing the placeholder is
+# replaced with conflict markers when rendering. The placeholder is unchanged by rendering config values.
+_PLACEHOLDER = "CHANGELOG-MERGE-CONFLICT-{}"
+_PLACEHOLDER_PATTERN = re.compile(r"CHANGELOG-MERGE-CONFLICT-(\d+)")
+
+ValueT = TypeVar("ValueT")
+KeyT = TypeVar("KeyT", bound=str)
+
+
+@dataclass
+class MergeConflict:
+    path: Tuple[str, ...]
+    # The rendered lines of each side of the conflict
+    ours: List[str]
+    theirs: List[str]
+
+
+@dataclass
+class MergeResult:
+    changelog: Changelog
+    conflicts: List[MergeConflict] = field(default_factory=list)
+
+    def _conflict(self, path: Tuple[str, ...], ours: List[str], theirs: List[str]) -> str:
+        """Record a conflict, returning the placeholder to use in place of the conflicting value."""
+        self.conflicts.append(MergeConflict(path=path, ours=ours, theirs=theirs))
+        return _PLACEHOLDER.format(len(self.conflicts) - 1)
+
+
+def merge_changelogs(base: Changelog, ours: Changelog, theirs: Changelog) -> MergeResult:
+    """Merge the changes made to a changelog on two branches.
+
+    Entries added or removed on either branch are combined in the unreleased section. Changes to any other part
+    of the changelog merge cleanly if only one branch made them, or both made the same change, otherwise they
+    are reported as conflicts.
+
+    :param base: The changelog at the common ancestor of the branches.
+    :param ours: The changelog on the current branch.
+    :param theirs: The changelog on the branch being merged.
+    :return: The merged changelog, in which conflicting values are replaced with placeholders, and the conflicts.
+    """
+    result = MergeResult(changelog=Changelog(config=ChangelogConfig()))
+    trees = [hash_changelog(changelog).children["releases"] for changelog in (base, ours, theirs)]
+    merged = result.changelog
+    header, conflicted = _merge_value(base.header, ours.header, theirs.header)
+    merged.header = (
+        result._conflict(("header",), ours.header.strip().splitlines(), theirs.header.strip().splitlines())
+        if conflicted
+        else header
+    )
+    for field_name in merged.config.fields:
+        values = [getattr(changelog.config, field_name) for changelog in (base, ours, theirs)]
+        value, conflicted = _merge_value(*values)
+        if conflicted:
+            value = result._conflict(
+                ("config", field_name),
+                [_render_config_field(ours.config, field_name, values[1])] if values[1] else [],
+                [_render_config_field(theirs.config, field_name, values[2])] if values[2] else [],
+            )
+        setattr(merged.config, field_name, value)
+    for tag in _merge_order(ours.releases, theirs.releases):
+        section = _merge_release(
+            result,
+            tag,
+            [
+                (changelog.releases.get(tag), tree.children.get(tag))
+                for changelog, tree in zip((base, ours, theirs), trees)
+            ],
+        )
+        if section:
+            merged.releases[tag] = section
+    for link_name in _merge_order(ours.links, theirs.links):
+        values = [changelog.links.get(link_name) for changelog in (base, ours, theirs)]
+        target, conflicted = _merge_value(*values)
+        if conflicted:
+            target = result._conflict(
+                ("links", link_name),
+                [f"[{link_name}]: {values[1]}"] if values[1] else [],
+                [f"[{link_name}]: {values[2]}"] if values[2] else [],
+            )
+        if not target and link_name in merged.releases:
+            # The release was kept despite being removed on one side, so keep its link too.
+            target = values[1] or values[2]
+        if target:
+            merged.links[link_name] = target
+    return result
+
+
+def _merge_value(base: ValueT, ours: ValueT, theirs: ValueT) -> Tuple[ValueT, bool]:
+    """Three-way merge of a single value, returning the merged value and whether it conflicted."""
+    if ours == base or ours == theirs:
+        return theirs, False
+    if theirs == base:
+        return ours, False
+    return ours, True
+
+
+def _merge_order(ours: Iterable[KeyT], theirs: Iterable[KeyT]) -> List[KeyT]:
+    """Combine the keys of both sides, in our order, with keys only they have placed after the key preceding them."""
+    ours_order = list(ours)
+    ours_keys = set(ours_order)
+    inserted_after: Dict[Optional[KeyT], List[KeyT]] = {}
+    anchor: Optional[KeyT] = None
+    for key in theirs:
+        if key in ours_keys:
+            anchor = key
+        else:
+            inserted_after.setdefault(anchor, []).append(key)
+    order = list(inserted_after.get(None, []))
+    for key in ours_order:
+        order.append(key)
+        order.extend(inserted_after.get(key, []))
+    return order
+
+
+def _merge_release(
+    result: MergeResult, tag: ReleaseTag, versions: List[Tuple[Optional[ReleaseSection], Optional[MerkleNode]]]
+) -> Optional[ReleaseSection]:
+    (base, base_tree), (ours, ours_tree), (theirs, theirs_tree) = versions
+    if ours is None or theirs is None:
+        if base is None:
+            # Added on one side only
+            return ours or theirs
+        kept, kept_tree = (ours, ours_tree) if ours is not None else (theirs, theirs_tree)
+        if kept is None:
+            # Merged releases are always taken from one side or the other
+            return None
+        if base_tree and kept_tree and base_tree.digest == kept_tree.digest:
+            # Removed on one side, and unchanged or removed on the other
+            return None
+        # Removed on one side, but changed on the other. Keep the changes, but report the conflict.
+        header = _render_release_header(tag, kept.timestamp)
+        kept.timestamp = result._conflict(("releases", tag), [header] if ours else [], [header] if theirs else [])
+        return kept
+    # A release added on both sides is merged against an empty release, so any differences between them conflict.
+    timestamp, conflicted = _merge_value(base.timestamp if base else None, ours.timestamp, theirs.timestamp)
+    if conflicted:
+        timestamp = result._conflict(
+            ("releases", tag),
+            [_render_release_header(tag, ours.timestamp)],
+            [_render_release_header(tag, theirs.timestamp)],
+        )
+    section = ReleaseSection(entries={}, timestamp=timestamp)
+    for change_type in sorted(set(ours.entries) | set(theirs.entries)):
+        entries = _merge_change_type(
+            result,
+            ("releases", tag, change_type),
+            [
+                (
+                    version.entries.get(change_type, []) if version else [],
+                    tree.children[change_type].entries if tree and change_type in tree.children else [],
+                )
+                for version, tree in ((base, base_tree), (ours, ours_tree), (theirs, theirs_tree))
+            ],
+            union=tag == _UNRELEASED,
+        )
+        if entries:
+            section.entries[change_type] = entries
+    return section
+
+
+def _merge_change_type(
+    result: MergeResult,
+    path: Tuple[str, ...],
+    versions: List[Tuple[List[Entry], List[MerkleNode]]],
+    union: bool,
+) -> List[Entry]:
+    """Merge the entries of a single type of change.
+
+    If `union` is set, entries added or removed by either side are combined. Otherwise, the entries are merged as
+    a single value, so any differing changes to them conflict.
+    """
+    (base, base_nodes), (ours, ours_nodes), (theirs, theirs_nodes) = versions
+    if not union:
+        digests = [[node.digest for node in nodes] for nodes in (base_nodes, ours_nodes, theirs_nodes)]
+        merged_digests, conflicted = _merge_value(*digests)
+        if conflicted:
+            placeholder = result._conflict(
+                path,
+                [_render_changelog_entry(entry) for entry in ours],
+                [_render_changelog_entry(entry) for entry in theirs],
+            )
+            return [Entry(text=placeholder)]
+        return ours if merged_digests is digests[1] else theirs
+    base_counts = Counter(node.digest for node in base_nodes)
+    ours_counts = Counter(node.digest for node in ours_nodes)
+    theirs_counts = Counter(node.digest for node in theirs_nodes)
+    # The number of each distinct entry to keep. Where both sides add (or remove) the same entry, it is only
+    # added (or removed) once.
+    targets = {}
+    for digest in ours_counts.keys() | theirs_counts.keys():
+        ours_change = ours_counts[digest] - base_counts[digest]
+        theirs_change = theirs_counts[digest] - base_counts[digest]
+        if ours_change * theirs_change > 0:
+            change = ours_change if abs(ours_change) >= abs(theirs_change) else theirs_change
+        else:
+            change = ours_change + theirs_change
+        targets[digest] = base_counts[digest] + change
+    entries = []
+    for entry, node in [*zip(ours, ours_nodes), *zip(theirs, theirs_nodes)]:
+        if targets[node.digest] > 0:
+            targets[node.digest] -= 1
+            entries.append(entry)
+    return entries
+
+
+def _render_release_header(tag: ReleaseTag, timestamp: Optional[str]) -> str:
+    return f"## [{tag}] - {timestamp}" if timestamp else f"## [{tag}]"
+
+
+def render_merge(result: MergeResult, ours_label: str = "ours", theirs_label: str = "theirs") -> str:
+    """Render a merged changelog, replacing any lines with conflicts with both sides, between conflict markers."""
+    lines = []
+    for line in dumps(result.changelog).splitlines():
+        match = _PLACEHOLDER_PATTERN.search(line)
+        if not match:
+            lines.append(line)
+            continue
+        conflict = result.conflicts[int(match.group(1))]
+        lines.extend([f"<<<<<<< {ours_label}", *conflict.ours, "=======", *conflict.theirs, f">>>>>>> {theirs_label}"])
+    return "\n".join(lines) + "\n"
@@ -1,16 +1,22 @@
 from __future__ import annotations
 
+import hashlib
 import re
 from collections import OrderedDict
 from dataclasses import Field, dataclass, field
 from datetime import date
 from enum import Enum
-from typing import Dict, List, Literal, Optional, Tuple, cast
+from itertools import count
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Tuple, cast
 from urllib.parse import quote_plus, unquote_plus
 
 from changelog.exceptions import ChangelogError, ChangelogMissingConfigError, ChangelogValidationError
+from changelog.instrumentation import increment, instrumented
 from changelog.utils import reverse_format
 
+if TYPE_CHECKING:
+    from changelog.table import EntryTable
+
 ChangeType = Literal["Security", "Deprecated", "Added", "Changed", "Removed", "Fixed"]
 
 
@@ -46,6 +52,57 @@ class ReleaseTag(str):
 _UNRELEASED = ReleaseTag("Unreleased")
 
 
+_revisions = count()
+
+
+class RevisionedDict(OrderedDict):
+    """An OrderedDict which is stamped with a new, globally unique revision whenever it is modified.
+
+    Comparing revisions is a cheap way to tell whether a mapping has changed since some derived result (such as
+    validation) was computed.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        self.revision = next(_revisions)
+        super().__init__(*args, **kwargs)
+
+    def _touch(self) -> None:
+        self.revision = next(_revisions)
+
+    def __setitem__(self, key, value):
+        self._touch()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._touch()
+        super().__delitem__(key)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._touch()
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self._touch()
+        return super().pop(*args)
+
+    def popitem(self, last: bool = True):
+        self._touch()
+        return super().popitem(last=last)
+
+    def clear(self):
+        self._touch()
+        super().clear()
+
+    def update(self, *args, **kwargs):
+        self._touch()
+        super().update(*args, **kwargs)
+
+    def move_to_end(self, key, last: bool = True):
+        self._touch()
+        super().move_to_end(key, last=last)
+
+
 @dataclass
 class ChangelogConfig:
     release_link_format: Optional[str] = None
@@ -75,25 +132,102 @@ class ChangelogConfig:
 class Changelog:
     header: str = ""
     config: ChangelogConfig = field(default_factory=ChangelogConfig)
-    releases: OrderedDict[ReleaseTag, ReleaseSection] = field(default_factory=OrderedDict)
-    links: OrderedDict[str, str] = field(default_factory=OrderedDict)
+    releases: OrderedDict[ReleaseTag, ReleaseSection] = field(default_factory=RevisionedDict)
+    links: OrderedDict[str, str] = field(default_factory=RevisionedDict)
+    _validated_revision: Optional[Tuple[int, int]] = field(default=None, init=False, repr=False, compare=False)
+    _entry_index: Optional[EntryIndex] = field(default=None, init=False, repr=False, compare=False)
 
+    @instrumented("validate")
     def validate(self):
-        """Validate the changelog."""
+        """Validate the changelog.
+
+        Validation depends only on the release tags and links, so it is skipped when neither has been modified
+        since the changelog was last validated successfully.
+        """
+        revision = self._revision()
+        if revision is not None and revision == self._validated_revision:
+            increment("validate_cache_hits")
+            return
         if not self.releases:
             raise ChangelogValidationError("Changelog contains no releases!")
         missing_tag_links = set(self.releases) - set(self.links)
         if missing_tag_links:
             raise ChangelogValidationError(f"The following releases are missing links: {missing_tag_links}")
+        self._validated_revision = revision
 
+    def _revision(self) -> Optional[Tuple[int, int]]:
+        """Identify the current state of releases and links, if they are tracked."""
+        if not isinstance(self.releases, RevisionedDict) or not isinstance(self.links, RevisionedDict):
+            return None
+        return self.releases.revision, self.links.revision
+
+    @instrumented("add_entry")
     def add_entry(self, change_type: ChangeType, *items: str, breaking: bool = False, tag: str = None) -> None:
         """Add an entry to the changelog, under unreleased."""
         tag = ReleaseTag(tag) if tag else _UNRELEASED
-        assert change_type in ChangeType.__args__  # type: ignore
+        if change_type not in ChangeType.__args__:  # type: ignore
+            raise ChangelogError(f"{change_type!r} is not a valid change type.")
+        if not items or not items[0]:
+            raise ChangelogError("An entry requires a message.")
         prefix = f"{self.config.get('breaking_change_token')} " if breaking else ""
-        self.releases.setdefault(tag, ReleaseSection(entries={}, timestamp=None)).entries.setdefault(
+        entries = self.releases.setdefault(tag, ReleaseSection(entries={}, timestamp=None)).entries.setdefault(
             change_type, []
-        ).append(Entry(text=prefix + items[0], children=[Entry(text=item) for item in items[1:]]))
+        )
+        entry = Entry(text=prefix + items[0], children=[Entry(text=item) for item in items[1:]])
+        entries.append(entry)
+        increment("entries_created", len(items))
+        if self._entry_index:
+            self._entry_index.add(tag, change_type, entry, entries)
+
+    @property
+    def entry_index(self) -> EntryIndex:
+        """Index of every entry, including nested entries, by ID.
+
+        The index is built when first used, and rebuilt if releases are added, removed or reordered. It is kept up to
+        date by `add_entry`, `edit_entry` and `remove_entry`, but not by direct changes to entries.
+        """
+        revision = self.releases.revision if isinstance(self.releases, RevisionedDict) else None
+        if self._entry_index is None or revision is None or self._entry_index.revision != revision:
+            self._entry_index = EntryIndex.build(self, revision)
+        else:
+            increment("entry_index_cache_hits")
+        return self._entry_index
+
+    def get_entry(self, entry_id: str) -> EntryLocation:
+        location = self.entry_index.locations.get(entry_id)
+        if not location:
+            raise ChangelogError(f"No entry with ID {entry_id!r}.")
+        return location
+
+    def edit_entry(self, entry_id: str, text: str) -> str:
+        """Replace the text of an entry, returning its new ID.
+
+        The IDs of any nested entries change too, as they depend on the text of their parents.
+        """
+        if not text:
+            raise ChangelogError("An entry requires a message.")
+        location = self.get_entry(entry_id)
+        self.entry_index.discard(location)
+        location.entry.text = text
+        return self.entry_index.add(
+            location.tag, location.change_type, location.entry, location.siblings, location.ancestors, location.position
+        )
+
+    def remove_entry(self, entry_id: str) -> Entry:
+        """Remove an entry, along with any nested entries, returning it."""
+        location = self.get_entry(entry_id)
+        self.entry_index.remove(location)
+        section = self.releases[location.tag]
+        if not section.entries.get(location.change_type):
+            section.entries.pop(location.change_type, None)
+        return location.entry
+
+    def to_table(self) -> EntryTable:
+        """Convert the changelog to a columnar table of its entries, see `changelog.table.EntryTable`."""
+        # Imported here, as the table module depends on the parser, which depends on this module.
+        from changelog.table import EntryTable
+
+        return EntryTable.from_changelog(self)
 
     @property
     def latest_tag(self) -> Optional[ReleaseTag]:
@@ -107,12 +241,15 @@ class Changelog:
         if force:
             return self.latest_tag.bump_semver(force)
         unreleased = self.releases[_UNRELEASED].entries
-        if self.config.get("breaking_change_token", "BREAKING") in str(unreleased) and self.latest_tag.semver[0] > 0:
+        token = self.config.get("breaking_change_token", "BREAKING")
+        breaking = any(is_breaking(entry, token) for entries in unreleased.values() for entry in entries)
+        if self.latest_tag.semver[0] > 0 and breaking:
             return self.latest_tag.bump_semver(Bump.MAJOR)
         if set(unreleased) - {"Fixed"}:
             return self.latest_tag.bump_semver(Bump.MINOR)
         return self.latest_tag.bump_semver(Bump.PATCH)
 
+    @instrumented("cut_release")
     def cut_release(self, force: Bump = None, tag: str = None) -> Tuple[ReleaseTag, ReleaseSection]:
         previous_tag = self.latest_tag
         release_tag = ReleaseTag(tag) if tag else self.next_tag(force=force)
@@ -146,3 +283,124 @@ class ReleaseSection:
 class Entry:
     text: str
     children: List[Entry] = field(default_factory=list)
+
+
+def _contains(entries: List[Entry], text: str) -> bool:
+    """Whether any of the entries, or the entries nested under them, contain some text."""
+    stack = list(entries)
+    while stack:
+        entry = stack.pop()
+        if text in entry.text:
+            return True
+        stack.extend(entry.children)
+    return False
+
+
+def is_breaking(entry: Entry, token: str) -> bool:
+    """Whether an entry is a breaking change, which is when it, or any entry nested under it, contains the token."""
+    return _contains([entry], token)
+
+
+def entry_id(change_type: str, ancestors: Tuple[str, ...], text: str) -> str:
+    """Derive the ID of an entry from its content.
+
+    The release tag is not included, so that an entry keeps its ID when it is released.
+    """
+    content = "\x1f".join([change_type, *ancestors, text]).encode("utf-8")
+    return hashlib.blake2b(content, digest_size=4).hexdigest()
+
+
+@dataclass
+class EntryLocation:
+    entry_id: str
+    tag: ReleaseTag
+    change_type: str
+    entry: Entry
+    # The list containing the entry, either the entries of its change type or the children of its parent
+    siblings: List[Entry]
+    # The text of each parent entry, outermost first
+    ancestors: Tuple[str, ...] = ()
+    # The index of the entry in its siblings
+    position: int = 0
+
+
+@dataclass
+class EntryIndex:
+    """Mapping of entry IDs to the location of each entry in a changelog.
+
+    IDs are derived from the content of each entry. Where entries have the same ID, they are suffixed in the order
+    they were added, e.g. `0a1b2c3d-2`: releases are indexed oldest first, so adding an entry never changes the ID of
+    an existing entry.
+    """
+
+    revision: Optional[int]
+    locations: Dict[str, EntryLocation] = field(default_factory=dict)
+    # The ID of each indexed entry, by the identity of the entry. Suffixes are not reused once an entry is removed, so
+    # the ID of a duplicate cannot be derived again from its content.
+    ids: Dict[int, str] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, changelog: Changelog, revision: Optional[int] = None) -> EntryIndex:
+        index = cls(revision=revision)
+        for tag, section in reversed(changelog.releases.items()):
+            for change_type, entries in sorted(section.entries.items()):
+                for position, entry in enumerate(entries):
+                    index.add(tag, change_type, entry, entries, position=position)
+        return index
+
+    def add(
+        self,
+        tag: ReleaseTag,
+        change_type: str,
+        entry: Entry,
+        siblings: List[Entry],
+        ancestors: Tuple[str, ...] = (),
+        position: int = None,
+    ) -> str:
+        """Index an entry and its nested entries, returning the ID of the entry.
+
+        :param position: The index of the entry in its siblings. Defaults to the last, as for a newly added entry.
+        """
+        ids = []
+        stack = [(entry, siblings, ancestors, len(siblings) - 1 if position is None else position)]
+        while stack:
+            current, current_siblings, current_ancestors, current_position = stack.pop()
+            base_id = current_id = entry_id(change_type, current_ancestors, current.text)
+            suffix = 1
+            while current_id in self.locations:
+                suffix += 1
+                current_id = f"{base_id}-{suffix}"
+            self.locations[current_id] = EntryLocation(
+                current_id, tag, change_type, current, current_siblings, current_ancestors, current_position
+            )
+            self.ids[id(current)] = current_id
+            ids.append(current_id)
+            children = current.children
+            stack.extend(
+                (children[child_position], children, (*current_ancestors, current.text), child_position)
+                for child_position in reversed(range(len(children)))
+            )
+        return ids[0]
+
+    def find_id(self, entry: Entry) -> str:
+        """Find the ID under which an entry is indexed."""
+        current_id = self.ids.get(id(entry))
+        if current_id is None or self.locations[current_id].entry is not entry:
+            raise ChangelogError(f"Entry {entry.text!r} is not indexed.")
+        return current_id
+
+    def discard(self, location: EntryLocation) -> None:
+        """Remove an entry and its nested entries from the index."""
+        stack = [location.entry]
+        while stack:
+            current = stack.pop()
+            del self.locations[self.find_id(current)]
+            del self.ids[id(current)]
+            stack.extend(current.children)
+
+    def remove(self, location: EntryLocation) -> None:
+        """Remove an entry from its siblings, and it and its nested entries from the index."""
+        self.discard(location)
+        del location.siblings[location.position]
+        for sibling in location.siblings[location.position :]:
+            self.locations[self.find_id(sibling)].position -= 1
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import operator
+import os
 import re
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Optional
+from itertools import compress
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from changelog.exceptions import ChangelogParseError
+from changelog.instrumentation import increment, instrumented
 from changelog.model import Changelog, Entry, ReleaseSection, ReleaseTag
+from changelog.utils import paused_gc
 
 
 @dataclass
@@ -14,6 +22,15 @@ class ParserState:
     release_tag: Optional[tuple[ReleaseTag, Optional[str]]] = None
     change_type: Optional[str] = None
     entry_stack: List[tuple[Entry, int]] = field(default_factory=list)
+    # Line numbers at which each release header and link were found, for reporting.
+    release_lines: Dict[ReleaseTag, List[int]] = field(default_factory=dict)
+    link_lines: Dict[str, int] = field(default_factory=dict)
+    # Number of entries parsed, including nested entries, for instrumentation.
+    entry_count: int = 0
+    # Header lines and continuation lines of the current entry, which are joined once complete. Appending to a string
+    # line by line takes quadratic time, as each line copies everything before it.
+    header_lines: List[str] = field(default_factory=list)
+    continuation_lines: List[str] = field(default_factory=list)
 
     @property
     def root_entry(self) -> Optional[Entry]:
@@ -22,106 +39,399 @@ class ParserState:
         return self.entry_stack[0][0]
 
     def parent_entry(self, indentation_chars: int) -> Optional[Entry]:
+        """Find the parent of a new entry from its indentation, removing any entries it ends from the stack.
+
+        :raises ChangelogParseError: if the indentation does not match any entry on the stack.
+        """
         if not self.entry_stack or indentation_chars == self.entry_stack[0][1]:
             # Top level entry
             return None
         if indentation_chars > self.entry_stack[-1][1]:
             # If its more indented than the previous entry, its a child of that entry
             return self.entry_stack[-1][0]
-        # Remove more nested items from the stack
-        while indentation_chars < self.entry_stack[-1][1]:
+        if indentation_chars == self.entry_stack[-1][1]:
+            # If its indented the same as the previous entry, its a sibling of that entry
             self.entry_stack.pop(-1)
-        if indentation_chars != self.entry_stack[-1][1]:
+            return self.entry_stack[-1][0]
+        # Otherwise it is a sibling of the entry on the stack with the same indentation. Indentation increases up the
+        # stack, so that entry is found by bisection, and it and any more nested entries are removed at once.
+        position = bisect_left(_Indentations(self.entry_stack), indentation_chars)
+        if not position or self.entry_stack[position][1] != indentation_chars:
             raise ChangelogParseError("Bad indentation")
-        self.entry_stack.pop(-1)
+        del self.entry_stack[position:]
         return self.entry_stack[-1][0]
 
     def flush(self) -> None:
+        self.end_continuation()
         if self.release_tag and self.change_type and self.root_entry:
             tag, timestamp = self.release_tag
-            self.changelog.releases.setdefault(tag, ReleaseSection(entries={}, timestamp=timestamp)).entries.setdefault(
-                self.change_type, []
-            ).append(self.root_entry)
+            self.add_entry(tag, timestamp, self.change_type, self.root_entry)
             self.entry_stack = []
 
+    def end_continuation(self) -> None:
+        """Join any continuation lines to the text of the current entry."""
+        if self.continuation_lines:
+            entry = self.entry_stack[-1][0]
+            entry.text = " ".join([entry.text, *self.continuation_lines])
+            self.continuation_lines = []
 
-def loads(text: str, tab_indent: int = 2) -> Changelog:
-    parser_state = ParserState()
-    text = text.replace("\t", tab_indent * " ")
-    for index, line in enumerate(text.splitlines()):
+    def end_header(self) -> None:
+        """Join any header lines to the header of the changelog."""
+        if self.header_lines:
+            self.changelog.header = "\n".join([self.changelog.header, *self.header_lines]).lstrip()
+            self.header_lines = []
+
+    # The following methods receive each parsed element, and may be overridden to consume them in other ways.
+
+    def add_header_line(self, line: str) -> None:
+        self.header_lines.append(line)
+
+    def add_release(self, tag: ReleaseTag, timestamp: Optional[str], line_number: int) -> None:
+        self.release_lines.setdefault(tag, []).append(line_number)
+        self.changelog.releases.setdefault(tag, ReleaseSection(entries={}, timestamp=timestamp))
+
+    def add_entry(self, tag: ReleaseTag, timestamp: Optional[str], change_type: str, entry: Entry) -> None:
+        """Add a complete top-level entry, including its children."""
+        self.changelog.releases.setdefault(tag, ReleaseSection(entries={}, timestamp=timestamp)).entries.setdefault(
+            change_type, []
+        ).append(entry)
+
+    def start_entry(self, text: str, indentation_chars: int) -> None:
+        """Start a new entry, which is a child of the entry above it if it is more indented.
+
+        :raises ChangelogParseError: if the indentation does not match any entry above.
+        """
+        self.end_continuation()
+        entry = Entry(text=text)
+        parent_entry = self.parent_entry(indentation_chars)
+        if not parent_entry:
+            # Must be top-level
+            self.flush()
+        else:
+            # New sub entry
+            parent_entry.children.append(entry)
+        self.entry_stack.append((entry, indentation_chars))
+
+    def continue_entry(self, text: str) -> None:
+        """Append a continuation line to the text of the current entry."""
+        self.continuation_lines.append(text)
+
+    def add_link(self, link_name: str, link_target: str, line_number: int) -> None:
+        self.changelog.links[link_name] = link_target
+        self.link_lines[link_name] = line_number
+
+    def set_config(self, field_name: str, value: str) -> None:
+        config = self.changelog.config
+        field_parser = config.fields[field_name].metadata.get("parse", lambda _: _)
+        setattr(config, field_name, field_parser(value))
+
+    def parse_line(self, index: int, line: str) -> None:
+        """Parse a single line of changelog text into the state.
+
+        :param index: The zero-based index of the line in the changelog.
+        :param line: The text of the line, with tabs already expanded.
+        :raises ChangelogParseError: if the line is not valid in the current state.
+        """
+        line_number = index + 1
         if (release_header_match := re.match(r"^## \[(?P<tag>.+)\]( +- +(?P<date>\d+\-\d+\-\d+))?", line)) :
             # New tags are level-two headings, and must be linked.
             # They optionally include a timestamp.
-            parser_state.flush()
+            self.flush()
+            self.end_header()
             match_dict = release_header_match.groupdict()
             tag = ReleaseTag(match_dict["tag"])
             timestamp = match_dict.get("date")
-            parser_state.release_tag = tag, timestamp
-            parser_state.changelog.releases.setdefault(tag, ReleaseSection(entries={}, timestamp=timestamp))
-            continue
-        if not parser_state.release_tag:
+            self.release_tag = tag, timestamp
+            self.add_release(tag, timestamp, line_number)
+            return
+        if not self.release_tag:
             # If release_tag is not set, assume we are parsing header text
-            parser_state.changelog.header += f"\n{line}"
-            continue
+            self.add_header_line(line)
+            return
         if (
             change_type_match := re.match(
                 r"^### (?P<change_type>Security|Deprecated|Added|Changed|Removed|Fixed)$", line
             )
         ) :
             # Change types are grouped under level 3 headings.
-            parser_state.flush()
-            parser_state.change_type = change_type_match.groupdict()["change_type"]
-            continue
+            self.flush()
+            self.change_type = change_type_match.groupdict()["change_type"]
+            return
         if (entry_start_match := re.match(r"^ *(\*|\+|-) (?P<sub_entry_start>.+)", line)) :
             # New entry start
             indentation_chars = len(line) - len(line.lstrip())
-            entry = Entry(text=entry_start_match.groupdict()["sub_entry_start"])
+            self.entry_count += 1
             try:
-                parent_entry = parser_state.parent_entry(indentation_chars)
+                self.start_entry(entry_start_match.groupdict()["sub_entry_start"], indentation_chars)
             except ChangelogParseError:
-                raise ChangelogParseError(f"Bad indentation at line {index}: {line!r}")
-            if not parent_entry:
-                # Must be top-level
-                parser_state.flush()
-            else:
-                # New sub entry
-                parent_entry.children.append(entry)
-            parser_state.entry_stack.append((entry, indentation_chars))
-            continue
-        if parser_state.entry_stack and (entry_continued_match := re.match(r"^ *(?P<entry_continued>.+)", line)):
+                raise ChangelogParseError(f"Bad indentation at line {line_number}: {line!r}", line=line_number)
+            return
+        if self.entry_stack and (entry_continued_match := re.match(r"^ *(?P<entry_continued>.+)", line)):
             # Multi-line continuation of entry text.
             indentation_chars = len(line) - len(line.lstrip())
-            if indentation_chars < parser_state.entry_stack[-1][1] + 2:
-                raise ChangelogParseError(f"Line {index} is not indented enough to be a continuation: {line!r}")
-            parser_state.entry_stack[-1][0].text += " " + entry_continued_match.groupdict()["entry_continued"].lstrip()
-            continue
+            if indentation_chars < self.entry_stack[-1][1] + 2:
+                raise ChangelogParseError(
+                    f"Line {line_number} is not indented enough to be a continuation: {line!r}", line=line_number
+                )
+            self.continue_entry(entry_continued_match.groupdict()["entry_continued"].lstrip())
+            return
         if (link_match := re.match(r"^\[(?P<link_name>.+)\]: (?P<link_target>.+)$", line)) :
             # Links follow the format [{link_name}]: http://example.com/link/target
-            parser_state.flush()
+            self.flush()
             match_dict = link_match.groupdict()
             link_name = match_dict["link_name"]
             link_target = match_dict["link_target"]
-            if link_name.startswith("_") and link_name[1:] in parser_state.changelog.config.fields:
+            if link_name.startswith("_") and link_name[1:] in self.changelog.config.fields:
                 # Check if the link is actually a config field in disguise
-                field_name = link_name[1:]
-                config = parser_state.changelog.config
-                field_parser = config.fields[field_name].metadata.get("parse", lambda _: _)
-                setattr(config, link_name[1:], field_parser(link_target))
-                continue
-            parser_state.changelog.links[link_name] = link_target
-            continue
+                self.set_config(link_name[1:], link_target)
+                return
+            self.add_link(link_name, link_target, line_number)
+            return
         if not line.strip() or "nothing here" in line.lower():
             # Blank lines terminate the previous entry, but are otherwise ignored.
-            parser_state.flush()
-            continue
-        raise ChangelogParseError(f"Invalid changelog at line {index}: {line!r}")
+            self.flush()
+            return
+        raise ChangelogParseError(f"Invalid changelog at line {line_number}: {line!r}", line=line_number)
+
+    def finish(self) -> Changelog:
+        """Complete parsing, returning the (unvalidated) changelog."""
+        self.flush()
+        self.end_header()
+        self.changelog.header = self.changelog.header.lstrip()
+        return self.changelog
+
+
+@dataclass
+class _StreamingParserState(ParserState):
+    """Parser state which collects entries as they are completed, rather than building a changelog."""
+
+    completed: List[Tuple[ReleaseTag, Optional[str], str, Entry]] = field(default_factory=list)
+
+    def add_header_line(self, line: str) -> None:
+        pass
+
+    def add_release(self, tag: ReleaseTag, timestamp: Optional[str], line_number: int) -> None:
+        pass
+
+    def add_entry(self, tag: ReleaseTag, timestamp: Optional[str], change_type: str, entry: Entry) -> None:
+        self.completed.append((tag, timestamp, change_type, entry))
+
+    def add_link(self, link_name: str, link_target: str, line_number: int) -> None:
+        pass
+
+
+class _Indentations(Sequence[int]):
+    """The indentation of each entry on an entry stack, as a sequence which can be bisected without copying."""
+
+    def __init__(self, entry_stack: List[Tuple[Any, int]]):
+        self.entry_stack = entry_stack
+
+    def __len__(self) -> int:
+        return len(self.entry_stack)
+
+    def __getitem__(self, index):
+        return self.entry_stack[index][1]
+
+
+def iter_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Split lines read from a file at the same line boundaries as `loads`, which are those of `str.splitlines`.
+
+    Files read in text mode only end lines at newlines, so a line may contain other boundaries, such as a form feed.
+
+    :param lines: The lines of the changelog, with or without their line endings, e.g. an open file.
+    """
+    for line in lines:
+        yield from line.splitlines() or [""]
+
+
+def iter_entries(lines: Iterable[str], tab_indent: int = 2) -> Iterator[Tuple[ReleaseTag, Optional[str], str, Entry]]:
+    """Parse top-level entries from changelog lines, yielding each as soon as it is complete.
+
+    No changelog is built, so memory use is bounded by the largest single entry rather than the whole changelog.
+    The changelog is not validated, and entries are yielded in the order they appear.
+
+    :param lines: The lines of the changelog, e.g. an open file.
+    :param tab_indent: The number of spaces to expand tabs to.
+    :return: An iterator of release tag, release timestamp, change type and entry.
+    """
+    parser_state = _StreamingParserState()
+    for index, line in enumerate(iter_lines(lines)):
+        parser_state.parse_line(index, line.replace("\t", tab_indent * " "))
+        yield from parser_state.completed
+        parser_state.completed.clear()
+    parser_state.flush()
+    yield from parser_state.completed
+
+
+@instrumented("loads")
+def loads(text: str, tab_indent: int = 2) -> Changelog:
+    parser_state = ParserState()
+    text = text.replace("\t", tab_indent * " ")
+    lines = text.splitlines()
+    for index, line in enumerate(lines):
+        parser_state.parse_line(index, line)
+    increment("lines_parsed", len(lines))
+    increment("entries_created", parser_state.entry_count)
+    changelog = parser_state.finish()
+    changelog.validate()
+    return changelog
+
+
+# Below this many characters, starting worker processes costs more than parsing in parallel saves.
+PARALLEL_THRESHOLD = 2_000_000
+# Each worker is given several chunks, so that one slow chunk does not leave the other workers idle.
+_CHUNKS_PER_WORKER = 4
+
+_RELEASE_HEADER_PATTERN = re.compile(r"^## \[(?P<tag>.+)\]")
+_CHANGE_TYPE_PATTERN = re.compile(r"^### (?P<change_type>Security|Deprecated|Added|Changed|Removed|Fixed)$")
+
+# Kinds of event recorded when parsing a chunk
+_RELEASE, _ENTRY, _LINK, _CONFIG = range(4)
+
+
+@dataclass
+class _ChunkParserState(ParserState):
+    """Parser state which records each parsed element compactly, to be sent back from a worker process.
+
+    Sending back the parsed objects themselves costs more to pickle and unpickle than parsing them did, so entries
+    are flattened into parallel arrays of text and parent indexes, and everything else into a list of events.
+    """
+
+    events: List[Tuple[Any, ...]] = field(default_factory=list)
+    entry_texts: List[str] = field(default_factory=list)
+    # Parents are stored offset by one, with zero meaning a top-level entry.
+    entry_parents: array = field(default_factory=lambda: array("I"))
+
+    def add_header_line(self, line: str) -> None:
+        pass
+
+    def add_release(self, tag: ReleaseTag, timestamp: Optional[str], line_number: int) -> None:
+        self.events.append((_RELEASE, str(tag), timestamp, line_number))
+
+    def add_entry(self, tag: ReleaseTag, timestamp: Optional[str], change_type: str, entry: Entry) -> None:
+        self.events.append((_ENTRY, change_type))
+        stack = [(entry, 0)]
+        while stack:
+            entry, parent = stack.pop()
+            self.entry_texts.append(entry.text)
+            self.entry_parents.append(parent)
+            position = len(self.entry_texts)
+            stack.extend((child, position) for child in reversed(entry.children))
+
+    def add_link(self, link_name: str, link_target: str, line_number: int) -> None:
+        self.events.append((_LINK, link_name, link_target, line_number))
+
+    def set_config(self, field_name: str, value: str) -> None:
+        self.events.append((_CONFIG, field_name, value))
+
+
+def _parse_chunk(offset: int, text: str, change_type: Optional[str]):
+    """Parse a chunk of a changelog starting at a release header, in a worker process.
+
+    :param offset: The index of the first line of the chunk in the changelog, so that errors report the right line.
+    :param change_type: The change type in effect at the start of the chunk.
+    """
+    parser_state = _ChunkParserState(change_type=change_type)
+    for index, line in enumerate(text.split("\n"), offset):
+        parser_state.parse_line(index, line)
     parser_state.flush()
-    parser_state.changelog.header = parser_state.changelog.header.lstrip()
-    parser_state.changelog.validate()
-    return parser_state.changelog
+    return parser_state.events, parser_state.entry_texts, parser_state.entry_parents
+
+
+def _replay_chunk(
+    parser_state: ParserState, events: List[Tuple[Any, ...]], entry_texts: List[str], entry_parents: array
+) -> None:
+    """Pass the elements parsed from a chunk to a parser state, in the order they were parsed."""
+    entries = list(map(Entry, entry_texts))
+    for parent, entry in compress(zip(entry_parents, entries), entry_parents):
+        entries[parent - 1].children.append(entry)
+    root_entries = compress(entries, map(operator.not_, entry_parents))
+    tag: Optional[ReleaseTag] = None
+    timestamp: Optional[str] = None
+    for event in events:
+        kind = event[0]
+        if kind == _ENTRY:
+            # Chunks start at release headers, so every entry follows a release.
+            assert tag is not None
+            parser_state.add_entry(tag, timestamp, event[1], next(root_entries))
+        elif kind == _RELEASE:
+            tag, timestamp = ReleaseTag(event[1]), event[2]
+            parser_state.add_release(tag, timestamp, event[3])
+        elif kind == _LINK:
+            parser_state.add_link(*event[1:])
+        else:
+            parser_state.set_config(*event[1:])
+
+
+def _split_release_chunks(lines: List[str], chunk_count: int) -> Tuple[int, List[Tuple[int, int, Optional[str]]]]:
+    """Split changelog lines into roughly equal chunks, each starting at a release header.
+
+    Once a change type has been seen, parsing state does not carry over a release header, except for the current
+    change type, so each chunk can be parsed independently given the change type in effect at its start. Before that,
+    entries are not flushed at release headers and stay on the entry stack, so no chunk is started until then.
+
+    :return: The number of header lines before the first release, and the start, end and initial change type of
+        each chunk.
+    """
+    target_size = max(len(lines) // chunk_count, 1)
+    first_release = None
+    chunk_starts: List[Tuple[int, Optional[str]]] = []
+    change_type = None
+    for index, line in enumerate(lines):
+        if not line.startswith("##"):
+            continue
+        if _RELEASE_HEADER_PATTERN.match(line):
+            if first_release is None:
+                first_release = index
+            if not chunk_starts or (change_type is not None and index - chunk_starts[-1][0] >= target_size):
+                chunk_starts.append((index, change_type))
+        elif first_release is not None and (change_type_match := _CHANGE_TYPE_PATTERN.match(line)):
+            change_type = change_type_match.group("change_type")
+    if first_release is None:
+        return len(lines), []
+    ends = [start for start, _ in chunk_starts[1:]] + [len(lines)]
+    return first_release, [(start, end, change_type) for (start, change_type), end in zip(chunk_starts, ends)]
+
+
+def loads_parallel(
+    text: str, tab_indent: int = 2, workers: int = None, threshold: int = PARALLEL_THRESHOLD
+) -> Changelog:
+    """Parse a large changelog, parsing its releases in parallel in worker processes.
+
+    The changelog is split at release headers into chunks, which are parsed independently and then combined in
+    order, so the result is the same as `loads`, including the line numbers reported by parse errors.
+
+    :param workers: The number of worker processes. Defaults to the number of CPUs.
+    :param threshold: The number of characters below which the changelog is parsed serially instead.
+    """
+    workers = workers or os.cpu_count() or 1
+    if len(text) < threshold or workers < 2:
+        return loads(text, tab_indent=tab_indent)
+    lines = text.replace("\t", tab_indent * " ").splitlines()
+    header_length, chunks = _split_release_chunks(lines, workers * _CHUNKS_PER_WORKER)
+    if len(chunks) < 2:
+        return loads(text, tab_indent=tab_indent)
+    parser_state = ParserState()
+    for index in range(header_length):
+        parser_state.parse_line(index, lines[index])
+    with ProcessPoolExecutor(max_workers=workers) as executor, paused_gc():
+        futures = [
+            executor.submit(_parse_chunk, start, "\n".join(lines[start:end]), change_type)
+            for start, end, change_type in chunks
+        ]
+        # Results are combined in order, so the first error in the changelog is the one raised.
+        for future in futures:
+            _replay_chunk(parser_state, *future.result())
+    changelog = parser_state.finish()
+    changelog.validate()
+    return changelog
+
 
+def load_from_file(path: str = "CHANGELOG.md", parallel: bool = False) -> Changelog:
+    """Load a changelog from a file.
 
-def load_from_file(path: str = "CHANGELOG.md") -> Changelog:
+    :param parallel: Parse large changelogs in parallel, with `loads_parallel`.
+    """
     with open(path, "r") as file:
         contents = file.read()
-    return loads(contents)
+    return loads_parallel(contents) if parallel else loads(contents)
@@ -1,63 +1,100 @@
 from __future__ import annotations
 
+import os
 from dataclasses import asdict
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
 
+from changelog.exceptions import ChangelogParseError
+from changelog.instrumentation import enabled, increment, instrumented
 from changelog.model import Changelog, ChangelogConfig, Entry, ReleaseSection, ReleaseTag
+from changelog.parser import ParserState, iter_lines
+from changelog.utils import atomic_write, atomic_writer
 
 
+@instrumented("dumps")
 def dumps(changelog: Changelog, indent: int = 2) -> str:
+    text = "".join(iter_dumps(changelog, indent=indent))
+    if enabled():
+        increment("bytes_rendered", len(text.encode("utf-8")))
+    return text
+
+
+def iter_dumps(changelog: Changelog, indent: int = 2) -> Iterator[str]:
+    """Render the changelog as a stream of text chunks, which join to form the output of `dumps`.
+
+    Useful for comparing or writing a rendered changelog without holding the whole output in memory.
+    """
     changelog.validate()
-    return (
-        "\n\n".join(
-            [
-                changelog.header.strip(),
-                _render_changelog_releases(changelog.releases, indent=indent),
-                _render_changelog_links(changelog.links, set(changelog.releases)),
-                _render_changelog_config(changelog.config),
-            ]
-        )
-        + "\n"
+    yield from _iter_join(
+        "\n\n",
+        [
+            [changelog.header.strip()],
+            _iter_changelog_releases(changelog.releases, indent=indent),
+            [_render_changelog_links(changelog.links, set(changelog.releases))],
+            [_render_changelog_config(changelog.config)],
+        ],
     )
+    yield "\n"
+
 
+def _iter_join(separator: str, parts: Iterable[Iterable[str]]) -> Iterator[str]:
+    """Equivalent of `separator.join`, for parts which are themselves streams of chunks."""
+    for index, part in enumerate(parts):
+        if index:
+            yield separator
+        yield from part
 
-def _render_changelog_releases(releases: Dict[ReleaseTag, ReleaseSection], indent: int = 2) -> str:
-    return "\n\n".join([render_changelog_release(release_tag, section) for release_tag, section in releases.items()])
+
+def _iter_changelog_releases(releases: Dict[ReleaseTag, ReleaseSection], indent: int = 2) -> Iterator[str]:
+    return _iter_join(
+        "\n\n",
+        (_iter_changelog_release(release_tag, section, indent=indent) for release_tag, section in releases.items()),
+    )
 
 
 def render_changelog_release(release_tag: ReleaseTag, section: ReleaseSection, indent: int = 2) -> str:
+    return "".join(_iter_changelog_release(release_tag, section, indent=indent))
+
+
+def _iter_changelog_release(release_tag: ReleaseTag, section: ReleaseSection, indent: int = 2) -> Iterator[str]:
     header = f"## [{release_tag}]"
     if section.timestamp:
         header += f" - {section.timestamp}"
-    return "\n".join([header, _render_changelog_change_types(section.entries, indent=indent)])
+    yield header
+    yield "\n"
+    yield from _iter_join(
+        "\n\n",
+        (
+            _iter_changelog_change_type(change_type, entries, indent=indent)
+            for change_type, entries in sorted(section.entries.items())
+        ),
+    )
 
 
-def _render_changelog_change_types(change_types: Dict[str, List[Entry]], indent: int = 2) -> str:
-    return "\n\n".join(
-        [
-            _render_changelog_change_type(change_type, entries, indent=indent)
-            for change_type, entries in sorted(change_types.items())
-        ]
-    )
+def _iter_changelog_change_type(change_type: str, entries: List[Entry], indent: int = 2) -> Iterator[str]:
+    yield f"### {change_type}\n"
+    yield "\n".join(_iter_entry_lines(entries, indent=indent))
 
 
-def _render_changelog_change_type(change_type: str, entries: List[Entry], indent: int = 2) -> str:
-    return "\n".join(
-        [f"### {change_type}", "\n".join([_render_changelog_entry(entry, indent=indent) for entry in entries])]
-    )
+def _render_changelog_entry(entry: Entry, indent: int = 2) -> str:
+    return "\n".join(_iter_entry_lines([entry], indent=indent))
 
 
-def _render_changelog_entry(entry: Entry, indent: int = 2, _indent_level: int = 0) -> str:
-    bullet = ("*", "-", "+")[_indent_level % 3]
-    return "\n".join(
-        [
-            " " * indent * _indent_level + f"{bullet} {entry.text}",
-            *[
-                _render_changelog_entry(sub_entry, indent=indent, _indent_level=_indent_level + 1)
-                for sub_entry in entry.children
-            ],
-        ]
-    )
+def _iter_entry_lines(entries: List[Entry], indent: int = 2) -> Iterator[str]:
+    """Render entries and their nested entries one line at a time.
+
+    Entries are walked with an explicit stack rather than by recursion, so any depth of nesting can be rendered. The
+    indentation and bullet of each nesting level are built once, and reused for every entry at that level.
+    """
+    prefixes: List[str] = []
+    stack = [(entry, 0) for entry in reversed(entries)]
+    while stack:
+        entry, level = stack.pop()
+        if level == len(prefixes):
+            # Levels are reached one at a time, as every entry follows its parent.
+            prefixes.append(" " * indent * level + ("*", "-", "+")[level % 3] + " ")
+        yield prefixes[level] + entry.text
+        stack.extend((child, level + 1) for child in reversed(entry.children))
 
 
 def _render_changelog_links(links: Dict[str, str], release_tags: set[ReleaseTag]) -> str:
@@ -90,6 +127,83 @@ def _render_config_field(config: ChangelogConfig, field: str, value: str) -> str
     return f"[_{field}]: {render_value(value)}"
 
 
-def dump_to_file(changelog: Changelog, path: str = "CHANGELOG.md") -> None:
-    with open(path, "w") as file:
-        file.write(dumps(changelog))
+def matches_file(changelog: Changelog, path: str = "CHANGELOG.md", indent: int = 2) -> bool:
+    """Check whether a file already contains exactly the rendered changelog.
+
+    The rendered output is compared against the file chunk by chunk as it is produced, stopping at the first
+    difference. Line endings are compared as written by `dump_to_file`, so a file with other line endings does not
+    match.
+    """
+    with open(path, "r", newline="") as file:
+        for chunk in iter_dumps(changelog, indent=indent):
+            if os.linesep != "\n":
+                chunk = chunk.replace("\n", os.linesep)
+            if file.read(len(chunk)) != chunk:
+                return False
+        return not file.read(1)
+
+
+def dump_to_file(changelog: Changelog, path: str = "CHANGELOG.md", fsync: bool = True) -> None:
+    """Write the changelog to a file, atomically replacing any existing file.
+
+    :param fsync: If true, ensure the file is flushed to disk before returning.
+    """
+    atomic_write(path, dumps(changelog), fsync=fsync)
+
+
+class _FormattingParserState(ParserState):
+    """Parser state which renders each release to a file as soon as it is complete, then discards its entries.
+
+    The header, links and config are kept until the end, as are the tags of the releases, but not their entries.
+    """
+
+    def __init__(self, output: TextIO, indent: int = 2):
+        super().__init__()
+        self.output = output
+        self.indent = indent
+        self.current_release: Optional[ReleaseTag] = None
+
+    def add_release(self, tag: ReleaseTag, timestamp: Optional[str], line_number: int) -> None:
+        if tag in self.changelog.releases:
+            raise ChangelogParseError(
+                f"Release {tag!r} is repeated at line {line_number}, so cannot be formatted one release at a time.",
+                line=line_number,
+            )
+        self.write_current_release()
+        self.changelog.releases[tag] = ReleaseSection(entries={}, timestamp=timestamp)
+        self.current_release = tag
+
+    def write_current_release(self) -> None:
+        if self.current_release is None:
+            self.output.write(self.changelog.header.strip())
+        else:
+            section = self.changelog.releases[self.current_release]
+            self.output.write(render_changelog_release(self.current_release, section, indent=self.indent))
+            section.entries = {}
+        self.output.write("\n\n")
+
+    def finish(self) -> Changelog:
+        changelog = super().finish()
+        changelog.validate()
+        self.write_current_release()
+        self.output.write(_render_changelog_links(changelog.links, set(changelog.releases)))
+        self.output.write("\n\n")
+        self.output.write(_render_changelog_config(changelog.config))
+        self.output.write("\n")
+        return changelog
+
+
+def format_file(path: str = "CHANGELOG.md", tab_indent: int = 2, indent: int = 2, fsync: bool = True) -> None:
+    """Format a changelog file in place, one release at a time.
+
+    Each release is parsed, rendered to a temporary file and discarded before the next is read, so memory use is
+    bounded by the largest release rather than the whole changelog. The output is the same as loading and dumping
+    the changelog, and replaces the file atomically once the whole changelog has been parsed and validated.
+
+    Unlike `loads`, a release which appears more than once is an error, as its entries cannot be combined.
+    """
+    with open(path, "r") as file, atomic_writer(path, fsync=fsync) as output:
+        parser_state = _FormattingParserState(output, indent=indent)
+        for index, line in enumerate(iter_lines(file)):
+            parser_state.parse_line(index, line.replace("\t", tab_indent * " "))
+        parser_state.finish()
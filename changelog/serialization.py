@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import json
+import operator
+import struct
+import sys
+from array import array
+from dataclasses import asdict
+from itertools import accumulate, compress, islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from changelog.exceptions import ChangelogParseError
+from changelog.model import Changelog, ChangelogConfig, Entry, ReleaseSection, ReleaseTag, is_breaking
+from changelog.parser import iter_entries
+from changelog.utils import paused_gc
+
+SNAPSHOT_MAGIC = b"CLOG"
+SNAPSHOT_VERSION = 1
+
+# Magic bytes and format version, then the number of strings, structure integers and entries.
+_SNAPSHOT_HEADER = struct.Struct("<4sBIII")
+# Integer arrays are stored as little-endian, unsigned 32-bit integers, whatever the native size and byte order.
+_UINT32 = next(typecode for typecode in "IL" if array(typecode).itemsize == 4)
+
+
+def dumps_json(changelog: Changelog, indent: int = None) -> str:
+    """Serialize a changelog to JSON, for consumption by other tools."""
+    changelog.validate()
+    return json.dumps(
+        {
+            "header": changelog.header,
+            "config": {key: value for key, value in asdict(changelog.config).items() if value is not None},
+            "releases": [
+                {
+                    "tag": tag,
+                    "timestamp": section.timestamp,
+                    "entries": {
+                        change_type: [_entry_to_dict(entry) for entry in entries]
+                        for change_type, entries in section.entries.items()
+                    },
+                }
+                for tag, section in changelog.releases.items()
+            ],
+            "links": changelog.links,
+        },
+        indent=indent,
+    )
+
+
+def loads_json(text: str) -> Changelog:
+    """Load a changelog from the output of `dumps_json`."""
+    try:
+        data = json.loads(text)
+        changelog = Changelog(header=data["header"], config=ChangelogConfig(**data["config"]))
+        for release in data["releases"]:
+            changelog.releases[ReleaseTag(release["tag"])] = ReleaseSection(
+                entries={
+                    change_type: [_entry_from_dict(entry) for entry in entries]
+                    for change_type, entries in release["entries"].items()
+                },
+                timestamp=release["timestamp"],
+            )
+        changelog.links.update(data["links"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ChangelogParseError(f"Invalid changelog JSON: {exc}")
+    changelog.validate()
+    return changelog
+
+
+def _entry_to_dict(entry: Entry) -> Dict[str, Any]:
+    """Convert an entry and its nested entries to dictionaries, walking them with an explicit stack."""
+    root: Dict[str, Any] = {"text": entry.text, "children": []}
+    stack = [(entry, root)]
+    while stack:
+        current, data = stack.pop()
+        for child in current.children:
+            child_data: Dict[str, Any] = {"text": child.text, "children": []}
+            data["children"].append(child_data)
+            stack.append((child, child_data))
+    return root
+
+
+def _entry_from_dict(data: Dict[str, Any]) -> Entry:
+    """Convert dictionaries from `_entry_to_dict` back to an entry, walking them with an explicit stack."""
+    root = Entry(text=data["text"])
+    stack = [(data, root)]
+    while stack:
+        current, entry = stack.pop()
+        for child_data in current["children"]:
+            child = Entry(text=child_data["text"])
+            entry.children.append(child)
+            stack.append((child_data, child))
+    return root
+
+
+def iter_entry_records(
+    lines: Iterable[str], breaking_change_token: str = ChangelogConfig.breaking_change_token
+) -> Iterator[Dict[str, Any]]:
+    """Stream a flat record for every entry in a changelog, including nested entries, as they are parsed.
+
+    Each record contains the release tag and date, the change type, whether the entry is breaking (see
+    `changelog.model.is_breaking`), its nesting depth, its text and the text of its parent entries.
+
+    Config is stored at the end of a changelog, so the breaking change token must be provided rather than read
+    from the changelog itself.
+
+    :param lines: The lines of the changelog, e.g. an open file.
+    :param breaking_change_token: The token used to mark breaking changes.
+    """
+    for tag, timestamp, change_type, root_entry in iter_entries(lines):
+        stack: List[Tuple[Entry, List[str]]] = [(root_entry, [])]
+        while stack:
+            entry, parents = stack.pop()
+            yield {
+                "tag": tag,
+                "date": timestamp,
+                "change_type": change_type,
+                "breaking": is_breaking(entry, breaking_change_token),
+                "depth": len(parents),
+                "text": entry.text,
+                "parents": parents,
+            }
+            stack.extend((child, [*parents, entry.text]) for child in reversed(entry.children))
+
+
+def dumps_snapshot(changelog: Changelog) -> bytes:
+    """Serialize a changelog to a compact binary snapshot.
+
+    A snapshot is a table of unique strings, stored as a single UTF-8 blob, plus flat integer arrays which describe
+    the structure of the changelog as indexes into that table. Entries are stored as parallel arrays of text and
+    parent indexes, so that loading a snapshot requires no text parsing or recursion.
+    """
+    changelog.validate()
+    strings: Dict[str, int] = {}
+    structure = array(_UINT32)
+    entry_texts = array(_UINT32)
+    # Parents are stored offset by one, with zero meaning a top-level entry.
+    entry_parents = array(_UINT32)
+
+    def string_index(value: str) -> int:
+        return strings.setdefault(value, len(strings))
+
+    structure.append(string_index(changelog.header))
+    config = {key: value for key, value in asdict(changelog.config).items() if value is not None}
+    structure.append(len(config))
+    for key, value in config.items():
+        structure.extend([string_index(key), string_index(value)])
+    structure.append(len(changelog.releases))
+    for tag, section in changelog.releases.items():
+        # Timestamps are optional, so are stored offset by one with zero meaning no timestamp.
+        timestamp = 0 if section.timestamp is None else string_index(section.timestamp) + 1
+        structure.extend([string_index(tag), timestamp, len(section.entries)])
+        for change_type, entries in section.entries.items():
+            structure.extend([string_index(change_type), len(entries)])
+            stack = [(entry, 0) for entry in reversed(entries)]
+            while stack:
+                entry, parent = stack.pop()
+                entry_texts.append(string_index(entry.text))
+                entry_parents.append(parent)
+                position = len(entry_texts)
+                stack.extend((child, position) for child in reversed(entry.children))
+    structure.append(len(changelog.links))
+    for link_name, link_target in changelog.links.items():
+        structure.extend([string_index(link_name), string_index(link_target)])
+
+    lengths = array(_UINT32, map(len, strings))
+    blob = "".join(strings).encode("utf-8")
+    arrays = [lengths, structure, entry_texts, entry_parents]
+    if sys.byteorder == "big":
+        for integers in arrays:
+            integers.byteswap()
+    return b"".join(
+        [
+            _SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(lengths), len(structure), len(entry_texts)),
+            *[integers.tobytes() for integers in arrays],
+            blob,
+        ]
+    )
+
+
+def loads_snapshot(data: bytes) -> Changelog:
+    """Load a changelog from the output of `dumps_snapshot`."""
+    try:
+        magic, version, string_count, structure_count, entry_count = _SNAPSHOT_HEADER.unpack_from(data)
+    except struct.error:
+        raise ChangelogParseError("Invalid changelog snapshot: too short")
+    if magic != SNAPSHOT_MAGIC:
+        raise ChangelogParseError("Invalid changelog snapshot: bad magic bytes")
+    if version != SNAPSHOT_VERSION:
+        raise ChangelogParseError(f"Unsupported changelog snapshot version: {version}")
+    offset = _SNAPSHOT_HEADER.size
+    arrays = []
+    for count in (string_count, structure_count, entry_count, entry_count):
+        integers = array(_UINT32)
+        size = integers.itemsize * count
+        if len(data) < offset + size:
+            raise ChangelogParseError("Invalid changelog snapshot: truncated or corrupt")
+        integers.frombytes(data[offset : offset + size])
+        if sys.byteorder == "big":
+            integers.byteswap()
+        arrays.append(integers)
+        offset += size
+    lengths, structure, entry_texts, entry_parents = arrays
+    try:
+        strings = _split_strings(data[offset:].decode("utf-8"), lengths)
+        with paused_gc():
+            return _load_snapshot_structure(
+                strings, iter(structure).__next__, iter(_link_entries(strings, entry_texts, entry_parents))
+            )
+    except (IndexError, StopIteration, UnicodeDecodeError):
+        raise ChangelogParseError("Invalid changelog snapshot: truncated or corrupt")
+
+
+def _split_strings(blob: str, lengths: array) -> List[str]:
+    boundaries = [0, *accumulate(lengths)]
+    if boundaries[-1] != len(blob):
+        raise ChangelogParseError("Invalid changelog snapshot: truncated or corrupt")
+    return [blob[start:end] for start, end in zip(boundaries, boundaries[1:])]
+
+
+def _link_entries(strings: List[str], entry_texts: array, entry_parents: array) -> List[Entry]:
+    """Build all entries at once from their parallel arrays, returning the top-level entries."""
+    entries = list(map(Entry, map(strings.__getitem__, entry_texts)))
+    for parent, entry in compress(zip(entry_parents, entries), entry_parents):
+        entries[parent - 1].children.append(entry)
+    return list(compress(entries, map(operator.not_, entry_parents)))
+
+
+def _load_snapshot_structure(
+    strings: List[str], next_int: Callable[[], int], root_entries: Iterator[Entry]
+) -> Changelog:
+    changelog = Changelog(header=strings[next_int()])
+    for _ in range(next_int()):
+        key = strings[next_int()]
+        changelog.config.set(key, strings[next_int()])
+    releases = changelog.releases
+    for _ in range(next_int()):
+        tag = ReleaseTag(strings[next_int()])
+        timestamp_index = next_int()
+        entries: Dict[str, List[Entry]] = {}
+        for _ in range(next_int()):
+            change_type = strings[next_int()]
+            entries[change_type] = list(islice(root_entries, next_int()))
+        timestamp = strings[timestamp_index - 1] if timestamp_index else None
+        releases[tag] = ReleaseSection(entries=entries, timestamp=timestamp)
+    links = changelog.links
+    for _ in range(next_int()):
+        link_name = strings[next_int()]
+        links[link_name] = strings[next_int()]
+    changelog.validate()
+    return changelog
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import statistics
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date
+from itertools import compress
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from changelog.model import Changelog, ChangeType
+from changelog.table import EntryTable
+
+if TYPE_CHECKING:
+    import numpy
+else:
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover
+        numpy = None
+
+
+@dataclass
+class IntervalStats:
+    """Summary of the number of days between consecutive releases."""
+
+    mean: float
+    median: float
+    minimum: int
+    maximum: int
+
+
+@dataclass
+class ChangelogStats:
+    """Aggregate statistics over the releases of one or more changelogs.
+
+    Entries are counted at the top level only; nested entries are details of their parent. An entry is breaking if
+    it, or any entry nested under it, contains the changelog's breaking change token, see `changelog.model.is_breaking`.
+    """
+
+    changelogs: int
+    releases: int
+    entries: int
+    entries_by_change_type: Dict[str, int]
+    breaking_entries: int
+    breaking_releases: int
+    first_release: Optional[str] = None
+    latest_release: Optional[str] = None
+    releases_by_year: Dict[str, int] = field(default_factory=dict)
+    days_between_releases: Optional[IntervalStats] = None
+
+
+def changelog_stats(changelogs: Iterable[Changelog]) -> ChangelogStats:
+    """Compute release cadence, entries per change type and breaking change frequency across changelogs.
+
+    Each changelog is converted to an `EntryTable`, whose columns are aggregated in bulk. NumPy is used for the
+    aggregation when it is installed, otherwise the columns are aggregated with built-in functions.
+    """
+    count_entries = _count_entries_numpy if numpy is not None else _count_entries_python
+    stats = ChangelogStats(
+        changelogs=0, releases=0, entries=0, entries_by_change_type={}, breaking_entries=0, breaking_releases=0
+    )
+    change_type_counts: Counter = Counter()
+    # The dates of the releases of each changelog, as ordinals, in order.
+    release_days: List[List[int]] = []
+    for changelog in changelogs:
+        table = changelog.to_table()
+        entries, breaking_entries, breaking_releases, counts = count_entries(table)
+        stats.changelogs += 1
+        stats.entries += entries
+        stats.breaking_entries += breaking_entries
+        stats.breaking_releases += breaking_releases
+        change_type_counts.update({table.change_types[code]: count for code, count in counts.items()})
+        release_days.append(sorted(day for day in map(_day, table.timestamps) if day))
+    order = {change_type: position for position, change_type in enumerate(ChangeType.__args__)}  # type: ignore
+    stats.entries_by_change_type = {
+        change_type: change_type_counts[change_type]
+        for change_type in sorted(change_type_counts, key=lambda change_type: order.get(change_type, len(order)))
+    }
+    days = [day for days in release_days for day in days]
+    stats.releases = len(days)
+    if not days:
+        return stats
+    stats.first_release = date.fromordinal(min(days)).isoformat()
+    stats.latest_release = date.fromordinal(max(days)).isoformat()
+    years = Counter(date.fromordinal(day).year for day in days)
+    stats.releases_by_year = {str(year): years[year] for year in sorted(years)}
+    # Only consecutive releases of the same changelog are compared.
+    intervals = [later - earlier for days in release_days for earlier, later in zip(days, days[1:])]
+    if intervals:
+        stats.days_between_releases = IntervalStats(
+            mean=float(statistics.mean(intervals)),
+            median=float(statistics.median(intervals)),
+            minimum=min(intervals),
+            maximum=max(intervals),
+        )
+    return stats
+
+
+def _count_entries_numpy(table: EntryTable) -> Tuple[int, int, int, Dict[int, int]]:
+    """Count the top-level entries of a table, its breaking entries and releases, and its entries by change type."""
+    top_level = numpy.frombuffer(table.depth, dtype=table.depth.typecode) == 0
+    breaking = top_level & numpy.frombuffer(table.breaking, dtype=table.breaking.typecode).astype(bool)
+    release = numpy.frombuffer(table.release, dtype=table.release.typecode)
+    change_type = numpy.frombuffer(table.change_type, dtype=table.change_type.typecode)
+    counts = numpy.bincount(change_type[top_level], minlength=len(table.change_types))
+    return (
+        int(numpy.count_nonzero(top_level)),
+        int(numpy.count_nonzero(breaking)),
+        len(numpy.unique(release[breaking])),
+        {code: int(count) for code, count in enumerate(counts) if count},
+    )
+
+
+def _count_entries_python(table: EntryTable) -> Tuple[int, int, int, Dict[int, int]]:
+    top_level = [not depth for depth in table.depth]
+    breaking = [top and bool(flag) for top, flag in zip(top_level, table.breaking)]
+    return (
+        sum(top_level),
+        sum(breaking),
+        len(set(compress(table.release, breaking))),
+        Counter(compress(table.change_type, top_level)),
+    )
+
+
+def _day(timestamp: Optional[str]) -> int:
+    """The ordinal of a release date, or zero if the release is undated or its date is not an ISO date."""
+    if not timestamp:
+        return 0
+    try:
+        return date.fromisoformat(timestamp).toordinal()
+    except ValueError:
+        return 0
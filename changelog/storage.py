@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List, Optional, Tuple, cast
+
+from changelog.exceptions import ChangelogError
+from changelog.model import Changelog, ChangelogConfig, Entry, ReleaseSection, ReleaseTag
+from changelog.renderer import render_changelog_release
+from changelog.utils import paused_gc
+
+DATABASE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS releases (
+    id INTEGER PRIMARY KEY,
+    tag TEXT NOT NULL UNIQUE,
+    position INTEGER NOT NULL,
+    timestamp TEXT,
+    digest BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS releases_timestamp ON releases (timestamp);
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    release_id INTEGER NOT NULL REFERENCES releases (id),
+    change_type TEXT NOT NULL,
+    parent_id INTEGER REFERENCES entries (id),
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_release ON entries (release_id, position);
+CREATE INDEX IF NOT EXISTS entries_change_type ON entries (change_type);
+CREATE TABLE IF NOT EXISTS links (
+    name TEXT PRIMARY KEY,
+    target TEXT NOT NULL,
+    position INTEGER NOT NULL
+);
+"""
+
+# The full text index is an external content table, kept in step with the entries table by triggers.
+_FULL_TEXT_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5 (text, content='entries', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS entries_fts_insert AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_fts_delete AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts (entries_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+@dataclass
+class StoredEntry:
+    """An entry found in the database, with the release and change type it belongs to."""
+
+    tag: ReleaseTag
+    timestamp: Optional[str]
+    change_type: str
+    text: str
+
+
+def is_database_path(path: str) -> bool:
+    """Whether a changelog path refers to a SQLite database, rather than a Markdown file."""
+    return path.lower().endswith(DATABASE_SUFFIXES)
+
+
+class SqliteStorage:
+    """A changelog stored in a SQLite database, from which Markdown is rendered on demand.
+
+    Releases, entries, links and config are stored in their own tables, indexed by tag, date, change type and (where
+    SQLite supports FTS5) entry text. Each release is stored with a digest of its rendered content, so saving a
+    changelog only rewrites the rows of releases which have changed since it was loaded.
+
+    >>> storage = SqliteStorage("changelog.db")
+    >>> storage.save(loads(markdown))  # Import from Markdown
+    >>> with storage.edit() as changelog:
+    ...     changelog.add_entry("Added", "A new feature")
+    >>> dumps(storage.load())  # Export to Markdown
+
+    :param path: The path to the database.
+    :param create: Create the database if it does not exist.
+    :raises ChangelogError: if the database does not exist, and `create` is not set.
+    """
+
+    def __init__(self, path: str, create: bool = True):
+        if not create and not os.path.exists(path):
+            raise ChangelogError(f"{path} not found.")
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.executescript(_SCHEMA)
+            try:
+                self.connection.executescript(_FULL_TEXT_SCHEMA)
+                self.full_text_search = True
+            except sqlite3.OperationalError:
+                # SQLite was built without FTS5, so searches fall back to scanning entry text.
+                self.full_text_search = False
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> SqliteStorage:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def load(self) -> Changelog:
+        """Load the whole changelog from the database.
+
+        :raises ChangelogError: if the database does not contain a changelog.
+        """
+        meta = dict(self.connection.execute("SELECT key, value FROM meta"))
+        if "header" not in meta:
+            raise ChangelogError(f"{self.path} does not contain a changelog.")
+        config = ChangelogConfig()
+        for key, value in meta.items():
+            if key.startswith("config."):
+                config.set(key[len("config.") :], value)
+        changelog = Changelog(header=meta["header"], config=config)
+        sections: Dict[int, ReleaseSection] = {}
+        for release_id, tag, timestamp in self.connection.execute(
+            "SELECT id, tag, timestamp FROM releases ORDER BY position"
+        ):
+            sections[release_id] = changelog.releases[ReleaseTag(tag)] = ReleaseSection(entries={}, timestamp=timestamp)
+        entries: Dict[int, Entry] = {}
+        with paused_gc():
+            # Entries are stored in pre-order, so every parent is built before its children.
+            for entry_id, release_id, change_type, parent_id, text in self.connection.execute(
+                "SELECT id, release_id, change_type, parent_id, text FROM entries ORDER BY release_id, position"
+            ):
+                entry = entries[entry_id] = Entry(text=text)
+                if parent_id is None:
+                    sections[release_id].entries.setdefault(change_type, []).append(entry)
+                else:
+                    entries[parent_id].children.append(entry)
+        changelog.links.update(self.connection.execute("SELECT name, target FROM links ORDER BY position"))
+        changelog.validate()
+        return changelog
+
+    def tags(self) -> List[ReleaseTag]:
+        """List the release tags, in order, without loading the changelog."""
+        return [ReleaseTag(tag) for tag, in self.connection.execute("SELECT tag FROM releases ORDER BY position")]
+
+    def save(self, changelog: Changelog) -> int:
+        """Save a changelog to the database, replacing what was stored before.
+
+        Only releases whose content has changed are rewritten. The header, config and links are small, so are
+        always replaced.
+
+        :return: The number of releases which were written.
+        """
+        changelog.validate()
+        written = 0
+        with self.connection:
+            self.connection.execute("DELETE FROM meta")
+            self.connection.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("header", changelog.header),
+                    *[(f"config.{key}", value) for key, value in asdict(changelog.config).items() if value is not None],
+                ],
+            )
+            stored: Dict[str, Tuple[int, bytes]] = {
+                tag: (release_id, digest)
+                for release_id, tag, digest in self.connection.execute("SELECT id, tag, digest FROM releases")
+            }
+            for position, (tag, section) in enumerate(changelog.releases.items()):
+                digest = _digest(tag, section)
+                release_id, stored_digest = stored.pop(tag, (None, None))
+                if release_id is None:
+                    release_id = cast(
+                        int,
+                        self.connection.execute(
+                            "INSERT INTO releases (tag, position, timestamp, digest) VALUES (?, ?, ?, ?)",
+                            (tag, position, section.timestamp, digest),
+                        ).lastrowid,
+                    )
+                elif digest != stored_digest:
+                    self._delete_entries(release_id)
+                    self.connection.execute(
+                        "UPDATE releases SET position = ?, timestamp = ?, digest = ? WHERE id = ?",
+                        (position, section.timestamp, digest, release_id),
+                    )
+                else:
+                    self.connection.execute("UPDATE releases SET position = ? WHERE id = ?", (position, release_id))
+                    continue
+                self._insert_entries(release_id, section)
+                written += 1
+            for release_id, _ in stored.values():
+                self._delete_entries(release_id)
+                self.connection.execute("DELETE FROM releases WHERE id = ?", (release_id,))
+            self.connection.execute("DELETE FROM links")
+            self.connection.executemany(
+                "INSERT INTO links (name, target, position) VALUES (?, ?, ?)",
+                [(name, target, position) for position, (name, target) in enumerate(changelog.links.items())],
+            )
+        return written
+
+    @contextmanager
+    def edit(self) -> Iterator[Changelog]:
+        """Load the changelog for editing, and save it once all changes have been made.
+
+        If an exception is raised inside the block, the database is left untouched.
+        """
+        changelog = self.load()
+        yield changelog
+        self.save(changelog)
+
+    def search(
+        self,
+        query: str,
+        change_type: str = None,
+        since: str = None,
+        until: str = None,
+        limit: int = None,
+    ) -> List[StoredEntry]:
+        """Find entries, including nested entries, whose text matches a query.
+
+        With FTS5, the query uses its full text query syntax, and results are ordered by relevance. Otherwise, the
+        query is matched as a substring, and results are in changelog order.
+
+        :param change_type: Only include entries of this change type.
+        :param since: Only include entries from releases on or after this date.
+        :param until: Only include entries from releases on or before this date.
+        :param limit: The maximum number of entries to return.
+        """
+        if self.full_text_search:
+            sql = (
+                "SELECT r.tag, r.timestamp, e.change_type, e.text FROM entries_fts"
+                " JOIN entries e ON e.id = entries_fts.rowid JOIN releases r ON r.id = e.release_id"
+                " WHERE entries_fts MATCH ?"
+            )
+            order = " ORDER BY entries_fts.rank"
+            parameters: List[object] = [query]
+        else:
+            sql = (
+                "SELECT r.tag, r.timestamp, e.change_type, e.text FROM entries e"
+                " JOIN releases r ON r.id = e.release_id WHERE instr(lower(e.text), lower(?)) > 0"
+            )
+            order = " ORDER BY r.position, e.position"
+            parameters = [query]
+        if change_type:
+            sql += " AND e.change_type = ?"
+            parameters.append(change_type)
+        if since:
+            sql += " AND r.timestamp >= ?"
+            parameters.append(since)
+        if until:
+            sql += " AND r.timestamp <= ?"
+            parameters.append(until)
+        sql += order
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        try:
+            rows = self.connection.execute(sql, parameters).fetchall()
+        except sqlite3.OperationalError as exc:
+            raise ChangelogError(f"Invalid search query {query!r}: {exc}")
+        return [
+            StoredEntry(tag=ReleaseTag(tag), timestamp=timestamp, change_type=change_type, text=text)
+            for tag, timestamp, change_type, text in rows
+        ]
+
+    def _delete_entries(self, release_id: int) -> None:
+        self.connection.execute("DELETE FROM entries WHERE release_id = ?", (release_id,))
+
+    def _insert_entries(self, release_id: int, section: ReleaseSection) -> None:
+        position = 0
+        for change_type, entries in section.entries.items():
+            stack: List[Tuple[Entry, Optional[int]]] = [(entry, None) for entry in reversed(entries)]
+            while stack:
+                entry, parent_id = stack.pop()
+                entry_id = self.connection.execute(
+                    "INSERT INTO entries (release_id, change_type, parent_id, position, text) VALUES (?, ?, ?, ?, ?)",
+                    (release_id, change_type, parent_id, position, entry.text),
+                ).lastrowid
+                position += 1
+                stack.extend((child, entry_id) for child in reversed(entry.children))
+
+
+def _digest(tag: ReleaseTag, section: ReleaseSection) -> bytes:
+    """Identify the content of a release.
+
+    Rendering a release and hashing the text is several times faster than building its hash tree with
+    `changelog.diff.hash_changelog`, and saving must compare every release.
+    """
+    return hashlib.blake2b(render_changelog_release(tag, section).encode(), digest_size=16).digest()
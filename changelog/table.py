@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from itertools import accumulate, chain, repeat
+from typing import Dict, Iterator, List, Optional, Tuple, cast
+
+from changelog.model import Changelog, ChangelogConfig, Entry, ReleaseSection, ReleaseTag
+from changelog.parser import ParserState
+from changelog.utils import paused_gc
+
+
+@dataclass
+class EntryTable:
+    """A columnar representation of a changelog, with one row per entry, including nested entries.
+
+    Rows are in the order entries appear in the changelog, so every entry follows its parent. Each column is a flat
+    array of integers, and the text of every entry is stored in a single string, so whole-history operations can
+    scan columns rather than walking nested entries.
+
+    Rows refer to releases by their index in `tags`, and to change types by their index in `change_types`. Entries
+    are breaking as defined by `changelog.model.is_breaking`: if their text, or the text of any entry nested under
+    them, contains the breaking change token.
+    """
+
+    header: str = ""
+    config: ChangelogConfig = field(default_factory=ChangelogConfig)
+    links: Dict[str, str] = field(default_factory=dict)
+    tags: List[ReleaseTag] = field(default_factory=list)
+    timestamps: List[Optional[str]] = field(default_factory=list)
+    change_types: List[str] = field(default_factory=list)
+    release: array = field(default_factory=lambda: array("I"))
+    change_type: array = field(default_factory=lambda: array("B"))
+    depth: array = field(default_factory=lambda: array("I"))
+    # The row of each entry's parent, or -1 for top-level entries.
+    parent: array = field(default_factory=lambda: array("i"))
+    breaking: array = field(default_factory=lambda: array("B"))
+    text: str = ""
+    # The text of row `i` is `text[offsets[i]:offsets[i + 1]]`.
+    offsets: array = field(default_factory=lambda: array("I", [0]))
+
+    def __len__(self) -> int:
+        return len(self.release)
+
+    def entry_text(self, row: int) -> str:
+        return self.text[self.offsets[row] : self.offsets[row + 1]]
+
+    def iter_texts(self) -> Iterator[str]:
+        text = self.text
+        offsets = self.offsets
+        return (text[start:end] for start, end in zip(offsets, offsets[1:]))
+
+    @classmethod
+    def from_changelog(cls, changelog: Changelog) -> EntryTable:
+        builder = _TableBuilder(header=changelog.header, config=changelog.config, links=dict(changelog.links))
+        for tag, section in changelog.releases.items():
+            release = builder.add_release(tag, section.timestamp)
+            for change_type, entries in section.entries.items():
+                builder.add_entries(release, builder.change_type_code(change_type), entries)
+        return builder.finish()
+
+    def to_changelog(self) -> Changelog:
+        """Convert the table back to a changelog. The changelog is not validated."""
+        changelog = Changelog(header=self.header, config=self.config)
+        changelog.links.update(self.links)
+        sections = [ReleaseSection(entries={}, timestamp=timestamp) for timestamp in self.timestamps]
+        changelog.releases.update(zip(self.tags, sections))
+        with paused_gc():
+            entries = list(map(Entry, self.iter_texts()))
+            for entry, parent, release, code in zip(entries, self.parent, self.release, self.change_type):
+                if parent < 0:
+                    sections[release].entries.setdefault(self.change_types[code], []).append(entry)
+                else:
+                    entries[parent].children.append(entry)
+        return changelog
+
+
+@dataclass
+class _TableBuilder:
+    """Accumulates the rows of an entry table, with the text of each row kept separately until finished."""
+
+    header: str = ""
+    config: ChangelogConfig = field(default_factory=ChangelogConfig)
+    links: Dict[str, str] = field(default_factory=dict)
+    table: EntryTable = field(default_factory=EntryTable)
+    texts: List[str] = field(default_factory=list)
+    release_indexes: Dict[ReleaseTag, int] = field(default_factory=dict)
+    change_type_codes: Dict[str, int] = field(default_factory=dict)
+
+    def add_release(self, tag: ReleaseTag, timestamp: Optional[str]) -> int:
+        """Add a release, unless it was already added, returning its index."""
+        index = self.release_indexes.get(tag)
+        if index is None:
+            index = self.release_indexes[tag] = len(self.table.tags)
+            self.table.tags.append(tag)
+            self.table.timestamps.append(timestamp)
+        return index
+
+    def change_type_code(self, change_type: str) -> int:
+        code = self.change_type_codes.get(change_type)
+        if code is None:
+            code = self.change_type_codes[change_type] = len(self.table.change_types)
+            self.table.change_types.append(change_type)
+        return code
+
+    def add_row(self, release: int, change_type: int, depth: int, parent: int, text: str) -> int:
+        table = self.table
+        table.release.append(release)
+        table.change_type.append(change_type)
+        table.depth.append(depth)
+        table.parent.append(parent)
+        self.texts.append(text)
+        return len(self.texts) - 1
+
+    def add_entries(self, release: int, change_type: int, entries: List[Entry]) -> None:
+        """Add a row for each of the entries, and each entry nested under them, with every entry after its parent."""
+        texts = self.texts
+        first_row = len(texts)
+        depths: List[int] = []
+        parents: List[int] = []
+        for top_level_entry in entries:
+            texts.append(top_level_entry.text)
+            depths.append(0)
+            parents.append(-1)
+            if not top_level_entry.children:
+                continue
+            # Most entries have no children, so only nested entries are walked with a stack.
+            row = len(texts) - 1
+            stack: List[Tuple[Entry, int, int]] = [(child, row, 1) for child in reversed(top_level_entry.children)]
+            while stack:
+                entry, parent, depth = stack.pop()
+                if entry.children:
+                    row = len(texts)
+                    stack.extend((child, row, depth + 1) for child in reversed(entry.children))
+                texts.append(entry.text)
+                depths.append(depth)
+                parents.append(parent)
+        # Columns are extended once per list of entries, rather than once per row.
+        table = self.table
+        table.release.extend(repeat(release, len(texts) - first_row))
+        table.change_type.extend(repeat(change_type, len(texts) - first_row))
+        table.depth.extend(depths)
+        table.parent.extend(parents)
+
+    def finish(self) -> EntryTable:
+        table = self.table
+        table.header, table.config, table.links = self.header, self.config, self.links
+        table.text = "".join(self.texts)
+        table.offsets = array("I", chain((0,), accumulate(map(len, self.texts))))
+        token = self.config.breaking_change_token
+        breaking = [token in text for text in self.texts]
+        # Children always come after their parents, so visiting rows in reverse marks every parent of a breaking
+        # entry before the parent itself is visited.
+        parents = table.parent
+        for row in range(len(breaking) - 1, -1, -1):
+            if breaking[row] and parents[row] >= 0:
+                breaking[parents[row]] = True
+        table.breaking = array("B", breaking)
+        return table
+
+
+@dataclass
+class _TableParserState(ParserState):
+    """Parser state which builds an entry table, without creating an `Entry` for each entry.
+
+    The entry stack holds positions in `pending`, offset by one so that they are never falsy. Pending entries are
+    those of the current top-level entry, which are only added to the table once it is complete, as the parser may
+    yet discard it.
+    """
+
+    builder: _TableBuilder = field(default_factory=_TableBuilder)
+    entry_stack: List[Tuple[int, int]] = field(default_factory=list)  # type: ignore[assignment]
+    # The parent position (offset by one, or zero), depth and text fragments of each pending entry.
+    pending: List[Tuple[int, int, List[str]]] = field(default_factory=list)
+
+    def add_release(self, tag: ReleaseTag, timestamp: Optional[str], line_number: int) -> None:
+        self.release_lines.setdefault(tag, []).append(line_number)
+        self.builder.add_release(tag, timestamp)
+
+    def start_entry(self, text: str, indentation_chars: int) -> None:
+        # The entry stack holds pending positions rather than entries, so the parent is a position.
+        parent = cast(Optional[int], self.parent_entry(indentation_chars)) or 0
+        if not parent:
+            self.flush()
+        self.pending.append((parent, self.pending[parent - 1][1] + 1 if parent else 0, [text]))
+        self.entry_stack.append((len(self.pending), indentation_chars))
+
+    def continue_entry(self, text: str) -> None:
+        self.pending[self.entry_stack[-1][0] - 1][2].append(text)
+
+    def add_entry(self, tag: ReleaseTag, timestamp: Optional[str], change_type: str, entry: Entry) -> None:
+        # The entry is the position of the top-level pending entry, which is always the first. Entries which are not
+        # nested under it were discarded by the parser, so are discarded here too.
+        builder = self.builder
+        release = builder.add_release(tag, timestamp)
+        code = builder.change_type_code(change_type)
+        rows: Dict[int, int] = {}
+        for position, (parent, depth, fragments) in enumerate(self.pending, 1):
+            if position == 1 or parent in rows:
+                rows[position] = builder.add_row(
+                    release, code, depth, rows[parent] if parent else -1, " ".join(fragments)
+                )
+        self.pending = []
+
+    def finish_table(self) -> EntryTable:
+        self.flush()
+        self.end_header()
+        builder = self.builder
+        builder.header = self.changelog.header.lstrip()
+        builder.config = self.changelog.config
+        builder.links = dict(self.changelog.links)
+        return builder.finish()
+
+
+def loads_table(text: str, tab_indent: int = 2) -> EntryTable:
+    """Parse a changelog directly into an entry table, without building the nested entries of a changelog.
+
+    The table converts to the same changelog as `loads` returns, but is not validated. Rows are in the order entries
+    appear in the text, so if a release is repeated they are not grouped as they are by `EntryTable.from_changelog`.
+    """
+    parser_state = _TableParserState()
+    for index, line in enumerate(text.replace("\t", tab_indent * " ").splitlines()):
+        parser_state.parse_line(index, line)
+    return parser_state.finish_table()
@@ -0,0 +1,31 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+from changelog.model import Changelog
+from changelog.parser import loads
+from changelog.renderer import dumps
+from changelog.utils import atomic_write
+
+
+@contextmanager
+def edit(path: str = "CHANGELOG.md", fsync: bool = True) -> Iterator[Changelog]:
+    """Load a changelog for editing, and save it once all changes have been made.
+
+    The changelog is parsed once on entry, and rendered once on exit. The file is replaced atomically, and is not
+    written at all if the rendered changelog is unchanged. If an exception is raised inside the block, the file is
+    left untouched.
+
+    >>> with edit("CHANGELOG.md") as changelog:
+    ...     changelog.add_entry("Added", "A new feature")
+    ...     changelog.cut_release()
+
+    :param path: Path to the changelog.
+    :param fsync: If true, ensure the file is flushed to disk before the block exits.
+    """
+    with open(path, "r") as file:
+        original = file.read()
+    changelog = loads(original)
+    yield changelog
+    rendered = dumps(changelog)
+    if rendered != original:
+        atomic_write(path, rendered, fsync=fsync)
@@ -1,6 +1,11 @@
+import gc
+import os
 import re
+import shutil
+import uuid
+from contextlib import contextmanager
 from string import Formatter
-from typing import Dict, Set, TypeVar, Union, overload
+from typing import Dict, Iterator, List, Set, TextIO, Tuple, TypeVar, Union, overload
 
 _NOT_PASSED = object()
 
@@ -65,3 +70,138 @@ def format_spec_to_regex(format_spec: str, multiline: bool = False) -> re.Patter
 def _format_spec_field_names(format_spec: str) -> Set[str]:
     """Extract field names from a format spec."""
     return {name for _, name, __, ___ in Formatter().parse(format_spec) if name is not None}
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """Pause the cyclic garbage collector while building large, acyclic object graphs.
+
+    Creating many container objects repeatedly triggers collections which scan the whole heap, without
+    freeing anything. The collector's previous state is restored on exit.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def atomic_write(path: str, content: str, fsync: bool = True) -> None:
+    """Replace the contents of a file atomically.
+
+    The content is written to a temporary file in the same directory, which then replaces the target, so the
+    target is never left partially written. The target's permissions are preserved.
+
+    :param path: The file to write.
+    :param content: The text to write.
+    :param fsync: If true, flush the file and its directory entry to disk before returning, so that the write
+        survives a crash or power loss.
+    """
+    with atomic_writer(path, fsync=fsync) as file:
+        file.write(content)
+
+
+@contextmanager
+def atomic_writer(path: str, fsync: bool = True) -> Iterator[TextIO]:
+    """Replace the contents of a file atomically, with content written incrementally.
+
+    As `atomic_write`, but yields the temporary file to be written to. The target is only replaced if the block
+    completes without an exception.
+    """
+    path = os.path.realpath(path)
+    directory, name = os.path.split(path)
+    temp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(temp_path, "x") as file:
+            yield file
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        directory_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory_fd)
+        finally:
+            os.close(directory_fd)
+
+
+def atomic_write_many(contents: Dict[str, str], fsync: bool = True) -> None:
+    """Replace the contents of several files, so that either every file is replaced or none are.
+
+    Every file is first written in full to a temporary file next to it, so a failure to write any of them leaves all
+    the targets untouched. The temporary files are then moved into place one by one, keeping a link to each original.
+    If any move fails, the files already replaced are restored from their originals.
+
+    Moves of separate files cannot be made atomic together, so a crash part way through moving the files can still
+    leave some replaced. The originals are kept until every file is moved, as `.{name}.{id}.bak` next to each file.
+
+    :param contents: The text to write to each file, by path.
+    :param fsync: If true, flush every file to disk before any is replaced, and flush the replacements before
+        returning.
+    """
+    suffix = uuid.uuid4().hex[:8]
+    staged: Dict[str, Tuple[str, str]] = {}
+    try:
+        for path, content in contents.items():
+            path = os.path.realpath(path)
+            directory, name = os.path.split(path)
+            temp_path = os.path.join(directory, f".{name}.{suffix}.tmp")
+            staged[path] = temp_path, os.path.join(directory, f".{name}.{suffix}.bak")
+            with open(temp_path, "x") as file:
+                file.write(content)
+                if fsync:
+                    file.flush()
+                    os.fsync(file.fileno())
+            if os.path.exists(path):
+                shutil.copymode(path, temp_path)
+    except BaseException:
+        for temp_path, _ in staged.values():
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        raise
+    replaced: List[str] = []
+    try:
+        for path, (temp_path, backup_path) in staged.items():
+            if os.path.exists(path):
+                _link_or_copy(path, backup_path)
+            os.replace(temp_path, path)
+            replaced.append(path)
+    except BaseException:
+        for path in reversed(replaced):
+            backup_path = staged[path][1]
+            if os.path.exists(backup_path):
+                os.replace(backup_path, path)
+            else:
+                os.remove(path)
+        for temp_path, backup_path in staged.values():
+            for leftover in (temp_path, backup_path):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+        raise
+    for _, backup_path in staged.values():
+        if os.path.exists(backup_path):
+            os.remove(backup_path)
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        for directory in {os.path.dirname(path) for path in staged}:
+            directory_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(directory_fd)
+            finally:
+                os.close(directory_fd)
+
+
+def _link_or_copy(source: str, target: str) -> None:
+    """Keep the original of a file, by hard link where the filesystem supports it, otherwise by copying."""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
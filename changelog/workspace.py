@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from changelog.exceptions import ChangelogError
+from changelog.model import _UNRELEASED, Bump, ReleaseTag
+from changelog.parser import loads
+from changelog.renderer import dumps
+from changelog.storage import is_database_path
+from changelog.utils import atomic_write_many
+
+DEFAULT_PATTERN = "**/CHANGELOG.md"
+
+
+@dataclass
+class PackageRelease:
+    """A release cut from one changelog in a workspace, which has not yet been written."""
+
+    path: str
+    previous_tag: Optional[ReleaseTag]
+    tag: ReleaseTag
+    content: str = field(repr=False)
+    # The size and modification time of the changelog the release was cut from, to detect changes since.
+    source_key: Tuple[int, int] = field(repr=False)
+
+    @property
+    def bump(self) -> str:
+        """Describe the release as a major, minor or patch bump of the previous tag, where both are semantic."""
+        if self.previous_tag is None:
+            return "initial"
+        if not (self.previous_tag.is_semver and self.tag.is_semver):
+            return "custom"
+        for bump in Bump:
+            if self.tag.semver[bump.value] != self.previous_tag.semver[bump.value]:
+                return bump.name.lower()
+        return "custom"
+
+
+def find_changelogs(root: str = ".", pattern: str = DEFAULT_PATTERN, manifest: str = None) -> List[str]:
+    """Find the changelogs in a workspace.
+
+    Without a manifest, changelogs are found by matching a glob pattern under the root, skipping hidden directories
+    such as `.git` or `.venv`. A manifest lists the changelogs explicitly, one path or glob pattern per line relative
+    to the manifest, with blank lines and lines starting with `#` ignored.
+
+    :raises ChangelogError: if a line of the manifest does not match any file.
+    :return: The paths of the changelogs, in sorted order and without duplicates.
+    """
+    if manifest is None:
+        paths = glob.glob(os.path.join(root, pattern), recursive=True)
+        return sorted({os.path.normpath(path) for path in paths if not _is_hidden(os.path.relpath(path, root))})
+    with open(manifest, "r") as file:
+        lines = [line.strip() for line in file]
+    base = os.path.dirname(manifest)
+    found: Set[str] = set()
+    for line in lines:
+        if not line or line.startswith("#"):
+            continue
+        matches = glob.glob(os.path.join(base, line), recursive=True)
+        if not matches:
+            raise ChangelogError(f"{line!r} in {manifest} does not match any changelog.")
+        found.update(os.path.normpath(path) for path in matches)
+    return sorted(found)
+
+
+def _is_hidden(path: str) -> bool:
+    return any(part.startswith(".") and part not in (".", "..") for part in path.split(os.sep))
+
+
+def prepare_release(path: str, force: Bump = None) -> Optional[PackageRelease]:
+    """Cut a release from a changelog, rendering the result without writing it.
+
+    :return: The release, or None if the changelog has no unreleased entries.
+    """
+    if is_database_path(path):
+        raise ChangelogError("Workspace releases require Markdown changelogs.")
+    stat = os.stat(path)
+    with open(path, "r") as file:
+        changelog = loads(file.read())
+    unreleased = changelog.releases.get(_UNRELEASED)
+    if unreleased is None or not any(unreleased.entries.values()):
+        return None
+    previous_tag = changelog.latest_tag
+    tag, _ = changelog.cut_release(force=force)
+    return PackageRelease(
+        path=path,
+        previous_tag=previous_tag,
+        tag=tag,
+        content=dumps(changelog),
+        source_key=(stat.st_size, stat.st_mtime_ns),
+    )
+
+
+def _prepare_release_or_error(path: str, force: Optional[Bump]) -> Tuple[Optional[PackageRelease], Optional[str]]:
+    """Prepare a release in a worker process, returning any error as a message.
+
+    Errors are returned rather than raised, as exceptions with extra attributes do not survive being sent back from a
+    worker, and so that every failing changelog can be reported at once.
+    """
+    try:
+        return prepare_release(path, force=force), None
+    except (ChangelogError, OSError) as exc:
+        return None, str(exc)
+
+
+def prepare_releases(paths: List[str], force: Bump = None, workers: int = None) -> List[PackageRelease]:
+    """Cut a release from each changelog with unreleased entries, in parallel, without writing any of them.
+
+    :param force: Bump every changelog's version this way, rather than inferring the bump from its entries.
+    :param workers: The number of worker processes. Defaults to the number of CPUs.
+    :raises ChangelogError: listing every changelog which could not be released, if any could not.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers < 2:
+        results = [_prepare_release_or_error(path, force) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_prepare_release_or_error, paths, [force] * len(paths)))
+    errors = [f"{path}: {error}" for path, (_, error) in zip(paths, results) if error]
+    if errors:
+        raise ChangelogError("Could not release every changelog, so none were changed.\n" + "\n".join(errors))
+    return [release for release, _ in results if release]
+
+
+def commit_releases(releases: List[PackageRelease], fsync: bool = True) -> None:
+    """Write the changelogs of several releases, so that either every changelog is updated or none are.
+
+    :raises ChangelogError: if any changelog was changed after its release was prepared.
+    """
+    changed = [release.path for release in releases if _source_key(release.path) != release.source_key]
+    if changed:
+        raise ChangelogError(f"Changelogs were changed while releasing, so none were changed: {', '.join(changed)}")
+    contents: Dict[str, str] = {release.path: release.content for release in releases}
+    atomic_write_many(contents, fsync=fsync)
+
+
+def _source_key(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
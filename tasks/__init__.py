@@ -1,5 +1,6 @@
 from invoke import Collection
 
+from tasks.benchmark import benchmark
 from tasks.changelog_check import changelog_check
 from tasks.lint import lint
 from tasks.release import build, release
@@ -8,6 +9,7 @@ from tasks.typecheck import typecheck
 from tasks.verify import verify
 
 namespace = Collection(
+    benchmark,
     build,
     changelog_check,
     coverage,
@@ -0,0 +1,13 @@
+from invoke import task
+
+from tasks.helpers import print_header
+
+
+@task(optional=["name"])
+def benchmark(ctx, name=""):
+    """Run benchmarks on large synthetic changelogs.
+
+    Optionally only runs benchmarks whose name contains `name`.
+    """
+    print_header("RUNNING BENCHMARKS")
+    ctx.run(f"python -m benchmarks {name}", pty=True)
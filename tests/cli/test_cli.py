@@ -1,16 +1,20 @@
+import json
 import os
+import subprocess
+import sys
 import traceback
 from contextlib import contextmanager
 from datetime import date
 from shutil import copyfile
-from typing import Iterator
+from typing import Iterator, List
 
 import pytest
 from typer.testing import CliRunner, Result
 
-from changelog import __version__, load_from_file
+from changelog import __version__, dump_to_file, load_from_file, loads
 from changelog.__main__ import app
 from changelog.model import Entry, ReleaseTag
+from changelog.serialization import loads_json, loads_snapshot
 from changelog.utils import reverse_format
 
 runner = CliRunner()
@@ -147,13 +151,14 @@ def test_it_validates_an_invalid_changelog(changelog_path: str):
     assert result.exit_code == 1
 
 
-def test_it_formats_a_changelog(changelog_path: str):
+@pytest.mark.parametrize("options", [[], ["--stream"]], ids=["default", "stream"])
+def test_it_formats_a_changelog(changelog_path: str, options: List[str]):
     with open(changelog_path, "r") as file:
         content = file.read()
     # Add lots more whitespace
     with open(changelog_path, "w") as file:
         file.write(content + "\n" * 100)
-    result = runner.invoke(app, ["--path", changelog_path, "format"])
+    result = runner.invoke(app, ["--path", changelog_path, "format", *options])
     assert_exit_code(result)
     with open(changelog_path, "r") as file:
         output = file.read()
@@ -320,3 +325,368 @@ def test_it_fails_to_cut_release_without_link(changelog_path: str):
 Run the following before cutting a release:
     changelog --path {changelog_path} config set --field release_link_format --value VALUE"""
     )
+
+
+def test_it_lints_a_valid_changelog(changelog_path: str):
+    result = runner.invoke(app, ["--path", changelog_path, "lint"])
+    assert_exit_code(result)
+    assert result.output == ""
+
+
+def test_it_reports_all_lint_issues_as_json(changelog_path: str):
+    with open(changelog_path, "r") as file:
+        content = file.read()
+    content = content.replace("* Project started :)", "* Project started :)\nUnder-indented text")
+    content = content.replace("[Unreleased]:", "[0.1.0]:")
+    with open(changelog_path, "w") as file:
+        file.write(content)
+    result = runner.invoke(app, ["--path", changelog_path, "lint", "--format", "json"])
+    assert_exit_code(result, 1)
+    issues = json.loads(result.stdout)
+    assert [issue["code"] for issue in issues] == ["missing-link", "parse-error", "orphan-link"]
+    assert all(isinstance(issue["line"], int) for issue in issues)
+
+
+@pytest.mark.parametrize("format", ["markdown", "json", "snapshot"])
+def test_it_exports_a_changelog(changelog_path: str, format: str):
+    output_path = "tests/cli/outputs/export"
+    try:
+        result = runner.invoke(app, ["--path", changelog_path, "export", "--format", format, "--output", output_path])
+        assert_exit_code(result)
+        with open(output_path, "rb") as file:
+            exported = file.read()
+    finally:
+        os.remove(output_path)
+    loader = {
+        "markdown": lambda data: loads(data.decode()),
+        "json": lambda data: loads_json(data.decode()),
+        "snapshot": loads_snapshot,
+    }[format]
+    assert loader(exported) == load_from_file(changelog_path)
+
+
+def test_it_exports_json_to_stdout(changelog_path: str):
+    result = runner.invoke(app, ["--path", changelog_path, "export", "--format", "json"])
+    assert_exit_code(result)
+    assert loads_json(result.stdout) == load_from_file(changelog_path)
+
+
+def test_it_exports_entries_as_ndjson(changelog_path: str):
+    assert_exit_code(
+        runner.invoke(app, ["--path", changelog_path, "entry", "changed", "-m", "Something", "--breaking"])
+    )
+    result = runner.invoke(app, ["--path", changelog_path, "export", "--ndjson"])
+    assert_exit_code(result)
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [(record["change_type"], record["text"], record["breaking"]) for record in records] == [
+        ("Added", "Project started :)", False),
+        ("Changed", "BREAKING Something", True),
+    ]
+
+
+def test_it_imports_entries_from_git(changelog_path: str, tmp_path):
+    git_command = ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com"]
+    subprocess.run([*git_command, "init", "-q"], cwd=tmp_path, check=True)
+    for message in ["chore: initial commit", "feat: A new feature", "fix!: A breaking fix", "docs: Some docs"]:
+        subprocess.run([*git_command, "commit", "-q", "--allow-empty", "-m", message], cwd=tmp_path, check=True)
+    for _ in range(2):
+        # Importing a second time adds no duplicates
+        result = runner.invoke(
+            app, ["--path", changelog_path, "import-git", "--since", "HEAD~3", "--repository", str(tmp_path)]
+        )
+        assert_exit_code(result)
+    assert result.output.strip() == "Imported 0 entries (2 duplicates skipped)"
+    unreleased = load_from_file(changelog_path).releases[ReleaseTag("Unreleased")]
+    assert unreleased.entries["Added"] == [Entry("Project started :)"), Entry("A new feature")]
+    assert unreleased.entries["Fixed"] == [Entry("BREAKING A breaking fix")]
+
+
+def test_it_adds_a_batch_of_entries_from_a_file(changelog_path: str):
+    entries_path = "tests/cli/outputs/entries.json"
+    with open(entries_path, "w") as file:
+        json.dump([{"change_type": "fixed", "message": "A fix"}, {"change_type": "added", "message": []}], file)
+    try:
+        result = runner.invoke(app, ["--path", changelog_path, "entry", "--from-file", entries_path])
+    finally:
+        os.remove(entries_path)
+    assert_exit_code(result, 1)
+    assert "Entry 2: An entry requires a message" in result.output
+    assert "Added 1 entries (1 failed)" in result.output
+    changelog = load_from_file(changelog_path)
+    assert changelog.releases[ReleaseTag("Unreleased")].entries["Fixed"] == [Entry("A fix")]
+
+
+def test_it_adds_a_batch_of_entries_from_stdin(changelog_path: str):
+    entries = "\n".join(json.dumps({"change_type": "added", "message": f"Feature {index}"}) for index in range(100))
+    result = runner.invoke(
+        app, ["--path", changelog_path, "entry", "--from-file", "-", "--format", "ndjson"], input=entries
+    )
+    assert_exit_code(result)
+    changelog = load_from_file(changelog_path)
+    assert len(changelog.releases[ReleaseTag("Unreleased")].entries["Added"]) == 101
+
+
+def test_it_rejects_an_invalid_change_type(changelog_path: str):
+    result = runner.invoke(app, ["--path", changelog_path, "entry", "improved", "-m", "Something"])
+    assert_exit_code(result, 1)
+    assert "'Improved' is not a valid change type" in result.output
+
+
+@pytest.mark.parametrize("option", ["--check", "--diff"])
+def test_it_checks_formatting_without_writing(changelog_path: str, option: str):
+    result = runner.invoke(app, ["--path", changelog_path, "format", option])
+    assert_exit_code(result)
+    assert result.output == ""
+    with open(changelog_path, "a") as file:
+        file.write("\n")
+    with open(changelog_path, "r") as file:
+        unformatted = file.read()
+    result = runner.invoke(app, ["--path", changelog_path, "format", option])
+    assert_exit_code(result, 1)
+    with open(changelog_path, "r") as file:
+        assert file.read() == unformatted
+    if option == "--diff":
+        assert result.output.splitlines()[-1] == "-"
+
+
+def test_it_diffs_two_changelogs(changelog_path: str, tmp_path):
+    old_path = str(tmp_path / "CHANGELOG.md")
+    copyfile(changelog_path, old_path)
+    assert_exit_code(runner.invoke(app, ["--path", changelog_path, "entry", "added", "-m", "A feature"]))
+    result = runner.invoke(app, ["diff", old_path, changelog_path, "--unreleased-only"])
+    assert_exit_code(result)
+    assert result.output == "+ releases / Unreleased / Added: A feature\n"
+    assert_exit_code(runner.invoke(app, ["--path", changelog_path, "release", "--tag", "0.1.0"]))
+    result = runner.invoke(app, ["diff", old_path, changelog_path, "--format", "json", "--unreleased-only"])
+    assert_exit_code(result, 1)
+    output, error = result.output.split("\nERROR: ")
+    assert error == "Changes were made outside of the unreleased section.\n"
+    changes = json.loads(output)
+    assert {"kind": "added", "path": ["releases", "0.1.0"], "text": date.today().isoformat()} in changes
+
+
+def test_it_merges_concurrent_entries_as_a_git_merge_driver(tmp_path):
+    git_command = ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com"]
+
+    def git(*args: str) -> None:
+        # The merge driver runs in the repository, so needs the package on its path
+        env = {**os.environ, "PYTHONPATH": os.getcwd()}
+        subprocess.run([*git_command, *args], cwd=tmp_path, env=env, check=True, capture_output=True)
+
+    def add_entry(message: str) -> None:
+        path = str(tmp_path / "CHANGELOG.md")
+        assert_exit_code(runner.invoke(app, ["--path", path, "entry", "added", "-m", message]))
+        git("commit", "-q", "-am", message)
+
+    git("init", "-q", "-b", "main")
+    git("config", "merge.changelog.driver", f"{sys.executable} -m changelog merge-driver %O %A %B")
+    (tmp_path / ".gitattributes").write_text("CHANGELOG.md merge=changelog\n")
+    copyfile("tests/changelogs/populated_changelog.md", tmp_path / "CHANGELOG.md")
+    git("add", ".")
+    git("commit", "-q", "-m", "Initial commit")
+    git("checkout", "-q", "-b", "feature")
+    add_entry("Their feature")
+    git("checkout", "-q", "main")
+    add_entry("Our feature")
+    git("merge", "-q", "--no-edit", "feature")
+    unreleased = load_from_file(str(tmp_path / "CHANGELOG.md")).releases[ReleaseTag("Unreleased")]
+    assert [entry.text for entry in unreleased.entries["Added"]] == ["A third feature", "Our feature", "Their feature"]
+
+
+def test_it_reports_merge_conflicts(tmp_path):
+    paths = {name: str(tmp_path / f"{name}.md") for name in ("base", "ours", "theirs")}
+    for name, path in paths.items():
+        copyfile("tests/changelogs/populated_changelog.md", path)
+        if name != "base":
+            assert_exit_code(runner.invoke(app, ["--path", path, "entry", "fixed", "-m", name, "-t", "0.1.0"]))
+    result = runner.invoke(app, ["merge-driver", paths["base"], paths["ours"], paths["theirs"]])
+    assert_exit_code(result, 1)
+    assert result.output == "CONFLICT: releases / 0.1.0 / Fixed\n"
+    with open(paths["ours"], "r") as file:
+        assert "<<<<<<< ours\n* ours\n=======\n* theirs\n>>>>>>> theirs\n" in file.read()
+
+
+def test_it_lists_edits_and_removes_entries_by_id(changelog_path: str):
+    assert_exit_code(runner.invoke(app, ["--path", changelog_path, "entry", "fixed", "-m", "A fix", "-m", "Details"]))
+    result = runner.invoke(app, ["--path", changelog_path, "entry", "list"])
+    assert_exit_code(result)
+    ids = [line.split()[0] for line in result.output.splitlines()]
+    assert [line.split(None, 1)[1] for line in result.output.splitlines()] == [
+        "[Unreleased] Added: Project started :)",
+        "[Unreleased] Fixed: A fix",
+        "[Unreleased] Fixed:   Details",
+    ]
+    assert_exit_code(runner.invoke(app, ["--path", changelog_path, "entry", "edit", "--id", ids[1], "-m", "A bug fix"]))
+    assert_exit_code(runner.invoke(app, ["--path", changelog_path, "entry", "remove", "--id", ids[0]]))
+    assert load_from_file(changelog_path).releases[ReleaseTag("Unreleased")].entries == {
+        "Fixed": [Entry("A bug fix", children=[Entry("Details")])]
+    }
+    result = runner.invoke(app, ["--path", changelog_path, "entry", "remove", "--id", ids[0]])
+    assert_exit_code(result, 1)
+    assert f"No entry with ID '{ids[0]}'" in result.output
+
+
+def test_it_finds_and_merges_duplicate_entries(changelog_path: str):
+    for message in ["Support for YAML config", "Support for YAML config.", "Support for TOML"]:
+        assert_exit_code(runner.invoke(app, ["--path", changelog_path, "entry", "added", "-m", message]))
+    result = runner.invoke(app, ["--path", changelog_path, "dedupe"])
+    assert_exit_code(result, 1)
+    assert result.output.splitlines()[0] == "Duplicate group 1:"
+    assert result.output.splitlines()[2].endswith("[Unreleased] Added: Support for YAML config.")
+    result = runner.invoke(app, ["--path", changelog_path, "dedupe", "--interactive"], input="2\n")
+    assert_exit_code(result)
+    assert result.output.splitlines()[-1] == "Merged 1 duplicate entries"
+    unreleased = load_from_file(changelog_path).releases[ReleaseTag("Unreleased")]
+    assert [entry.text for entry in unreleased.entries["Added"]] == [
+        "Project started :)",
+        "Support for YAML config.",
+        "Support for TOML",
+    ]
+    assert_exit_code(runner.invoke(app, ["--path", changelog_path, "dedupe"]))
+
+
+def test_it_archives_old_releases_and_shows_them(tmp_path):
+    changelog_path = str(tmp_path / "CHANGELOG.md")
+    copyfile("tests/changelogs/populated_changelog.md", changelog_path)
+    result = runner.invoke(app, ["--path", changelog_path, "archive", "--keep", "1"])
+    assert_exit_code(result)
+    assert result.output == f"Archived 1 releases to {tmp_path / 'CHANGELOG-archive-0.1.0-0.1.0.md'}\n"
+    assert list(load_from_file(changelog_path).releases) == ["Unreleased", "0.2.0"]
+    result = runner.invoke(app, ["--path", changelog_path, "show", "0.1.0"])
+    assert_exit_code(result)
+    assert result.output.splitlines()[:3] == ["## [0.1.0] - 2021-04-12", "### Added", "* Project started :)"]
+    result = runner.invoke(app, ["--path", changelog_path, "archive", "--keep", "1"])
+    assert_exit_code(result)
+    assert result.output == "No releases to archive\n"
+
+
+def test_it_runs_a_language_server(changelog_path: str):
+    with open(changelog_path, "r") as file:
+        text = file.read()
+    requests = [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {"capabilities": {}}},
+        {
+            "jsonrpc": "2.0",
+            "method": "textDocument/didOpen",
+            "params": {"textDocument": {"uri": "file:///CHANGELOG.md", "text": text + "Invalid line\n"}},
+        },
+        {"jsonrpc": "2.0", "id": 2, "method": "shutdown"},
+        {"jsonrpc": "2.0", "method": "exit"},
+    ]
+    stdin = b"".join(
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        for body in (json.dumps(request).encode() for request in requests)
+    )
+    result = subprocess.run(
+        [sys.executable, "-m", "changelog", "lsp"],
+        input=stdin,
+        capture_output=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr
+    assert b'"textDocument/publishDiagnostics"' in result.stdout
+    assert b"Invalid changelog at line" in result.stdout
+
+
+def test_it_runs_commands_against_a_database(tmp_path):
+    database_path = str(tmp_path / "changelog.db")
+    result = runner.invoke(app, ["--path", database_path, "db", "import", "tests/changelogs/populated_changelog.md"])
+    assert_exit_code(result)
+    result = runner.invoke(app, ["--path", database_path, "entry", "added", "-m", "A searchable feature"])
+    assert_exit_code(result)
+    result = runner.invoke(app, ["--path", database_path, "db", "search", "searchable"])
+    assert_exit_code(result)
+    assert result.output == "[Unreleased] Added: A searchable feature\n"
+    result = runner.invoke(app, ["--path", database_path, "export", "--format", "markdown"])
+    assert_exit_code(result)
+    expected = load_from_file("tests/changelogs/populated_changelog.md")
+    expected.add_entry("Added", "A searchable feature")
+    assert loads(result.output) == expected
+    result = runner.invoke(app, ["--path", database_path, "format", "--check"])
+    assert_exit_code(result, 1)
+    assert "requires a Markdown changelog" in result.output
+
+
+@pytest.mark.parametrize(
+    "name,command",
+    [
+        ("CHANGELOG.md", ["validate"]),
+        ("changelog.db", ["validate"]),
+        ("changelog.db", ["entry", "added", "-m", "A feature"]),
+        ("changelog.db", ["db", "search", "feature"]),
+    ],
+)
+def test_it_reports_a_missing_changelog_without_creating_it(tmp_path, name: str, command: List[str]):
+    path = tmp_path / name
+    result = runner.invoke(app, ["--path", str(path), *command])
+    assert_exit_code(result, 1)
+    assert "not found" in result.output
+    assert not path.exists()
+
+
+def test_it_reports_stats(changelog_path: str):
+    copyfile("tests/changelogs/populated_changelog.md", changelog_path)
+    result = runner.invoke(app, ["--path", changelog_path, "stats", "--format", "json"])
+    assert_exit_code(result)
+    stats = json.loads(result.output)
+    assert (stats["releases"], stats["entries"], stats["entries_by_change_type"]) == (2, 5, {"Added": 4, "Fixed": 1})
+    result = runner.invoke(app, ["--path", changelog_path, "stats", changelog_path, changelog_path])
+    assert_exit_code(result)
+    assert "Changelogs                      2\n" in result.output
+
+
+@pytest.mark.parametrize(
+    "words,expected",
+    [
+        pytest.param("show 0.", ["0.2.0", "0.1.0"], id="show-tag"),
+        pytest.param("entry added -t U", ["Unreleased"], id="entry-tag"),
+        pytest.param("entry add fi", ["fixed"], id="change-type"),
+    ],
+)
+def test_it_completes_tags_and_change_types(changelog_path: str, tmp_path, words: str, expected: List[str]):
+    copyfile("tests/changelogs/populated_changelog.md", changelog_path)
+    command_words = ["changelog", "--path", changelog_path, *words.split()]
+    result = runner.invoke(
+        app,
+        [],
+        prog_name="changelog",
+        env={
+            "_CHANGELOG_COMPLETE": "complete_bash",
+            "COMP_WORDS": " ".join(command_words),
+            "COMP_CWORD": str(len(command_words) - 1),
+            "XDG_CACHE_HOME": str(tmp_path),
+        },
+    )
+    assert_exit_code(result)
+    assert result.output.split() == expected
+
+
+def test_it_releases_every_changelog_in_a_workspace(tmp_path, monkeypatch):
+    for package in ["a", "b", "c"]:
+        (tmp_path / package).mkdir()
+        copyfile("tests/changelogs/populated_changelog.md", tmp_path / package / "CHANGELOG.md")
+    for package, change_type in [("b", "Fixed"), ("c", None)]:
+        changelog = load_from_file(str(tmp_path / package / "CHANGELOG.md"))
+        changelog.releases[ReleaseTag("Unreleased")].entries.clear()
+        if change_type:
+            changelog.add_entry(change_type, "A fix")
+        dump_to_file(changelog, str(tmp_path / package / "CHANGELOG.md"))
+    monkeypatch.chdir(tmp_path)
+    summary = [
+        "a/CHANGELOG.md: 0.2.0 -> 0.3.0 (minor)",
+        "b/CHANGELOG.md: 0.2.0 -> 0.2.1 (patch)",
+        "c/CHANGELOG.md: skipped, nothing unreleased",
+    ]
+    result = runner.invoke(app, ["release", "--all", "--dry-run"])
+    assert_exit_code(result)
+    assert result.output.splitlines() == [*summary, "Would release 2 of 3 changelogs"]
+    assert list(load_from_file("a/CHANGELOG.md").releases)[1] == "0.2.0"
+    result = runner.invoke(app, ["release", "--all"])
+    assert_exit_code(result)
+    assert result.output.splitlines() == [*summary, "Released 2 of 3 changelogs"]
+    assert list(load_from_file("a/CHANGELOG.md").releases)[1] == "0.3.0"
+    assert list(load_from_file("b/CHANGELOG.md").releases)[1] == "0.2.1"
+    result = runner.invoke(app, ["release", "--all", "--tag", "1.0.0"])
+    assert_exit_code(result, 1)
+    assert "--tag cannot be combined with --all" in result.output
@@ -0,0 +1,94 @@
+"""Generate synthetic changelogs of arbitrary size, for benchmarks and tests."""
+
+from __future__ import annotations
+
+import random
+import string
+from typing import List, Optional
+
+from changelog.model import _UNRELEASED, Changelog, ChangelogConfig, Entry, ReleaseSection, ReleaseTag
+
+CHANGE_TYPES = ["Added", "Changed", "Deprecated", "Removed", "Fixed", "Security"]
+
+# Made-up words, for a vocabulary about as varied as real changelog entries
+_WORDS = ["".join(random.Random(seed).choices(string.ascii_lowercase, k=3 + seed % 8)) for seed in range(2000)]
+
+_LINK_FORMAT = "https://github.com/user/repo/compare/{previous_tag}..{tag}"
+
+
+def generate_changelog(
+    releases: int = 10,
+    entries_per_release: int = 100,
+    unreleased_entries: Optional[int] = None,
+    duplicate_rate: float = 0.0,
+    children_rate: float = 0.2,
+    seed: int = 0,
+) -> Changelog:
+    """Generate a valid changelog with random entries.
+
+    :param releases: The number of releases, excluding the unreleased section.
+    :param entries_per_release: The number of top-level entries in each release.
+    :param unreleased_entries: The number of top-level entries in the unreleased section. Defaults to
+        `entries_per_release`.
+    :param duplicate_rate: The proportion of unreleased entries which are near-duplicates of an earlier entry.
+    :param children_rate: The proportion of entries with nested entries.
+    :param seed: Seed for the random number generator, so that the same changelog can be generated again.
+    """
+    rng = random.Random(seed)
+    changelog = Changelog(header="# Changelog", config=ChangelogConfig(release_link_format=_LINK_FORMAT))
+    tags = [_UNRELEASED, *(ReleaseTag.from_semver((0, releases - index, 0)) for index in range(releases))]
+    for index, tag in enumerate(tags):
+        count = entries_per_release if unreleased_entries is None or tag != _UNRELEASED else unreleased_entries
+        section = ReleaseSection(entries={}, timestamp=None if tag == _UNRELEASED else f"2021-01-{index % 28 + 1:02}")
+        texts: List[str] = []
+        for _ in range(count):
+            if tag == _UNRELEASED and texts and rng.random() < duplicate_rate:
+                text = _perturb(rng, rng.choice(texts))
+            else:
+                text = _sentence(rng)
+            texts.append(text)
+            children = [Entry(_sentence(rng)) for _ in range(rng.randint(1, 3))] if rng.random() < children_rate else []
+            section.entries.setdefault(rng.choice(CHANGE_TYPES), []).append(Entry(text, children=children))
+        changelog.releases[tag] = section
+        previous_tag = tags[index + 1] if index + 1 < len(tags) else "initial"
+        changelog.links[tag] = _LINK_FORMAT.format(previous_tag=previous_tag, tag="HEAD" if tag == _UNRELEASED else tag)
+    return changelog
+
+
+def _sentence(rng: random.Random) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(6, 14))).capitalize()
+
+
+def _perturb(rng: random.Random, text: str) -> str:
+    """Make a small change to some text, as when the same change is described twice."""
+    words = text.split()
+    change = rng.randrange(3)
+    if change == 0:
+        return text.rstrip(".") + "."
+    if change == 1:
+        return text.lower()
+    words[rng.randrange(len(words))] = rng.choice(_WORDS)
+    return " ".join(words)
+
+
+def generate_nested_changelog(entries: int = 10, depth: int = 100, width: int = 5) -> Changelog:
+    """Generate a valid changelog whose entries are both deeply nested and have many siblings.
+
+    Each top-level entry has `width` children, the last of which has `width` children of its own, and so on down to
+    `depth` levels. The next entry after each top-level entry therefore ends every level at once.
+
+    :param entries: The number of top-level entries, all unreleased.
+    :param depth: The number of levels of each top-level entry, including itself.
+    :param width: The number of children of each nested level.
+    """
+    changelog = Changelog(header="# Changelog", config=ChangelogConfig(release_link_format=_LINK_FORMAT))
+    top_level = []
+    for index in range(entries):
+        entry = Entry(f"Entry {index}")
+        top_level.append(entry)
+        for level in range(1, depth):
+            entry.children = [Entry(f"Entry {index} level {level} child {child}") for child in range(width)]
+            entry = entry.children[-1]
+    changelog.releases[_UNRELEASED] = ReleaseSection(entries={"Added": top_level}, timestamp=None)
+    changelog.links[_UNRELEASED] = _LINK_FORMAT.format(previous_tag="initial", tag="HEAD")
+    return changelog
@@ -0,0 +1,96 @@
+import os
+import shutil
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from changelog import dump_to_file, load_from_file
+from changelog.archive import archive_releases, find_release, iter_all_releases, write_archive
+from changelog.exceptions import ChangelogError
+from changelog.lint import lint_file
+from changelog.model import ReleaseTag
+
+
+@pytest.fixture()
+def changelog_path(tmp_path: Path) -> str:
+    path = tmp_path / "CHANGELOG.md"
+    shutil.copyfile("tests/changelogs/populated_changelog.md", path)
+    return str(path)
+
+
+def archive(path: str, keep: int) -> str:
+    changelog = load_from_file(path)
+    archived = archive_releases(changelog, keep=keep, path=path)
+    assert archived
+    write_archive(*archived, changelog=changelog, path=path)
+    return archived[0]
+
+
+def test_archive_moves_old_releases_to_a_linked_file(changelog_path: str):
+    original = load_from_file(changelog_path)
+    archive_path = archive(changelog_path, keep=1)
+    assert Path(archive_path).name == "CHANGELOG-archive-0.1.0-0.1.0.md"
+    changelog = load_from_file(changelog_path)
+    assert list(changelog.releases) == ["Unreleased", "0.2.0"]
+    assert changelog.links["archive:0.1.0..0.1.0"] == "CHANGELOG-archive-0.1.0-0.1.0.md"
+    assert "0.1.0" not in changelog.links
+    archived = load_from_file(archive_path)
+    assert archived.releases == {"0.1.0": original.releases[ReleaseTag("0.1.0")]}
+    assert archived.links == {"0.1.0": original.links["0.1.0"]}
+    assert lint_file(changelog_path) == []
+    assert list(iter_all_releases(changelog, changelog_path)) == list(original.releases.items())
+
+
+def test_archive_is_not_written_without_the_changelog(changelog_path: str):
+    original = load_from_file(changelog_path)
+    changelog = load_from_file(changelog_path)
+    archived = archive_releases(changelog, keep=1, path=changelog_path)
+    assert archived
+    replace = os.replace
+
+    def fail_to_replace_changelog(source: str, target: str) -> None:
+        if target == os.path.realpath(changelog_path):
+            raise OSError("Disk full")
+        replace(source, target)
+
+    with mock.patch("changelog.utils.os.replace", side_effect=fail_to_replace_changelog), pytest.raises(OSError):
+        write_archive(*archived, changelog=changelog, path=changelog_path)
+    assert not os.path.exists(archived[0])
+    assert load_from_file(changelog_path) == original
+
+
+def test_archives_are_only_loaded_when_needed(changelog_path: str):
+    archive(changelog_path, keep=1)
+    changelog = load_from_file(changelog_path)
+    with mock.patch("changelog.archive.load_from_file", wraps=load_from_file) as load:
+        assert find_release(changelog, "0.2.0", changelog_path) == changelog.releases[ReleaseTag("0.2.0")]
+        load.assert_not_called()
+        assert find_release(changelog, "0.1.0", changelog_path).timestamp == "2021-04-12"
+        load.assert_called_once()
+        with pytest.raises(ChangelogError):
+            # Out of the range of the archive, so it is not loaded
+            find_release(changelog, "0.0.1", changelog_path)
+        load.assert_called_once()
+
+
+def test_archives_can_be_rotated(changelog_path: str):
+    changelog = load_from_file(changelog_path)
+    changelog.cut_release(tag="0.3.0")
+    dump_to_file(changelog, changelog_path)
+    archive(changelog_path, keep=2)
+    archive(changelog_path, keep=1)
+    changelog = load_from_file(changelog_path)
+    assert list(changelog.releases) == ["Unreleased", "0.3.0"]
+    assert [name for name in changelog.links if name.startswith("archive:")] == [
+        "archive:0.2.0..0.2.0",
+        "archive:0.1.0..0.1.0",
+    ]
+    assert [tag for tag, _ in iter_all_releases(changelog, changelog_path)] == ["Unreleased", "0.3.0", "0.2.0", "0.1.0"]
+
+
+def test_archive_keeps_at_least_one_release(changelog_path: str):
+    changelog = load_from_file(changelog_path)
+    with pytest.raises(ChangelogError):
+        archive_releases(changelog, keep=0, path=changelog_path)
+    assert archive_releases(changelog, keep=2, path=changelog_path) is None
@@ -0,0 +1,54 @@
+import pytest
+
+from changelog import loads
+from changelog.batch import BatchEntryError, add_entries, read_entry_records
+from changelog.exceptions import ChangelogError
+from changelog.model import Changelog, Entry, ReleaseTag
+
+
+@pytest.fixture()
+def changelog() -> Changelog:
+    with open("tests/changelogs/initial_changelog.md", "r") as file:
+        return loads(file.read())
+
+
+def test_it_adds_a_batch_of_entries_reporting_invalid_entries(changelog: Changelog):
+    text = "\n".join(
+        [
+            '{"change_type": "fixed", "message": "A fix"}',
+            '{"change_type": "unknown", "message": "Something"}',
+            "not json",
+            "",
+            '{"change_type": "changed", "message": ["A change", "Details"], "breaking": true}',
+            '{"change_type": "added", "message": "An old feature", "tag": "0.1.0", "extra": 1}',
+            '{"change_type": "added", "message": "An old feature", "tag": "0.1.0"}',
+            '{"change_type": "added", "message": "A linked feature", "tag": "Unreleased"}',
+        ]
+    )
+    added, errors = add_entries(changelog, read_entry_records(text, "ndjson"))
+    assert added == 3
+    assert [error.index for error in errors] == [2, 3, 6, 7]
+    assert errors[0] == BatchEntryError(index=2, message="'Unknown' is not a valid change type.")
+    assert errors[3] == BatchEntryError(index=7, message="Release '0.1.0' is missing a link.")
+    assert list(changelog.releases) == ["Unreleased"]
+    changelog.validate()
+    unreleased = changelog.releases[ReleaseTag("Unreleased")]
+    assert unreleased.entries["Fixed"] == [Entry("A fix")]
+    assert unreleased.entries["Changed"] == [Entry("BREAKING A change", children=[Entry("Details")])]
+
+
+def test_it_reads_a_list_of_records_from_json():
+    records = list(read_entry_records('[{"change_type": "added", "message": "A"}, {}]', "json"))
+    assert records == [(1, {"change_type": "added", "message": "A"}), (2, {})]
+
+
+def test_it_reads_a_list_of_records_from_yaml():
+    pytest.importorskip("yaml")
+    records = list(read_entry_records("- change_type: added\n  message: [A, B]\n", "yaml"))
+    assert records == [(1, {"change_type": "added", "message": ["A", "B"]})]
+
+
+@pytest.mark.parametrize("text,format", [("[", "json"), ("{}", "toml")])
+def test_it_raises_on_unreadable_batches(text: str, format: str):
+    with pytest.raises(ChangelogError):
+        list(read_entry_records(text, format))
@@ -0,0 +1,39 @@
+import json
+import os
+from pathlib import Path
+
+from changelog import loads
+from changelog.completion import release_tags
+from changelog.storage import SqliteStorage
+
+with open("tests/changelogs/populated_changelog.md", "r") as file:
+    POPULATED = file.read()
+
+
+def test_release_tags_are_cached_until_file_changes(tmp_path: Path):
+    path = tmp_path / "CHANGELOG.md"
+    path.write_text(POPULATED)
+    cache_dir = str(tmp_path / "cache")
+    assert release_tags(str(path), cache_dir=cache_dir) == ["Unreleased", "0.2.0", "0.1.0"]
+    (cache_file,) = (tmp_path / "cache").iterdir()
+    cached = json.loads(cache_file.read_text())
+    cache_file.write_text(json.dumps({**cached, "tags": ["cached"]}))
+    assert release_tags(str(path), cache_dir=cache_dir) == ["cached"]
+    path.write_text(POPULATED.replace("## [0.2.0] - 2021-04-12", "## [0.3.0] - 2021-04-12\n\n## [0.2.0] - 2021-04-12"))
+    mtime_ns = cached["key"][0] + 1_000_000_000
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    assert release_tags(str(path), cache_dir=cache_dir) == ["Unreleased", "0.3.0", "0.2.0", "0.1.0"]
+
+
+def test_release_tags_of_missing_changelog(tmp_path: Path):
+    assert release_tags(str(tmp_path / "CHANGELOG.md"), cache_dir=str(tmp_path)) == []
+    assert release_tags(str(tmp_path / "changelog.db"), cache_dir=str(tmp_path)) == []
+    assert not (tmp_path / "changelog.db").exists()
+
+
+def test_release_tags_of_database(tmp_path: Path):
+    path = str(tmp_path / "changelog.db")
+    with SqliteStorage(path) as storage:
+        storage.save(loads(POPULATED))
+    assert release_tags(path, cache_dir=str(tmp_path / "cache")) == ["Unreleased", "0.2.0", "0.1.0"]
+    assert not (tmp_path / "cache").exists()
@@ -0,0 +1,145 @@
+"""Check that operations scale no worse than roughly linearly with the size of the changelog.
+
+Each operation is timed at several sizes, and the growth rate is the slope of a straight line fitted to the logs of
+the sizes and timings. A linear operation has a slope of one, and a quadratic one a slope of two.
+
+Operations are timed by the CPU time of the process rather than the wall clock time, so that other processes running
+at the same time do not slow the larger, longer runs more than the smaller ones. Counting operations instead would
+miss the quadratic copying of repeated string concatenation, which happens within a single operation.
+"""
+
+import gc
+import math
+import time
+from typing import Callable, List, Tuple
+
+import pytest
+
+from changelog import dumps, loads
+from changelog.model import Changelog
+from tests.synthetic import generate_changelog
+
+# The sizes span a wide range, so that noise in any one timing has little effect on the growth rate.
+SIZES = [20, 80, 320]
+# Allows for fixed overheads and timing noise, while still catching anything quadratic.
+MAX_GROWTH_RATE = 1.4
+
+
+def _time(setup: Callable[[], Callable[[], object]], repeat: int = 7) -> float:
+    """Time the function returned by `setup`, which is called again before each run. Returns the fastest run."""
+    timings = []
+    for _ in range(repeat):
+        function = setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.process_time()
+            function()
+            timings.append(time.process_time() - start)
+        finally:
+            gc.enable()
+    return min(timings)
+
+
+def growth_rate(timings: List[Tuple[int, float]]) -> float:
+    """The slope of a least squares fit of log time against log size."""
+    xs = [math.log(size) for size, _ in timings]
+    ys = [math.log(timing) for _, timing in timings]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sum((x - mean_x) ** 2 for x in xs)
+
+
+def test_growth_rate():
+    assert growth_rate([(10, 1.0), (20, 2.0), (40, 4.0)]) == pytest.approx(1.0)
+    assert growth_rate([(10, 1.0), (20, 4.0), (40, 16.0)]) == pytest.approx(2.0)
+
+
+def _changelog(size: int) -> Changelog:
+    """A changelog with `size` releases, and as many unreleased entries, so that every operation has work to do."""
+    return generate_changelog(releases=size, entries_per_release=10, unreleased_entries=size, children_rate=0.3)
+
+
+def _loads(size: int):
+    text = dumps(_changelog(size))
+    return lambda: lambda: loads(text)
+
+
+def _dumps(size: int):
+    changelog = _changelog(size)
+    return lambda: lambda: dumps(changelog)
+
+
+def _add_entry(size: int):
+    def setup():
+        changelog = _changelog(size)
+        # Entries are also added to the index, if it has been built.
+        changelog.entry_index
+        texts = [f"Entry number {index}" for index in range(size * 10)]
+        return lambda: [changelog.add_entry("Added", text) for text in texts]
+
+    return setup
+
+
+def _cut_release(size: int):
+    def setup():
+        changelog = _changelog(size)
+        return lambda: changelog.cut_release()
+
+    return setup
+
+
+def _validate(size: int):
+    changelog = _changelog(size)
+
+    def setup():
+        # Validation is cached until the changelog changes.
+        changelog.releases._touch()
+        return changelog.validate
+
+    return setup
+
+
+def _text(header: List[str], entry: List[str]) -> str:
+    return "\n".join(
+        [
+            *header,
+            "",
+            "## [Unreleased]",
+            "",
+            "### Added",
+            "",
+            *entry,
+            "",
+            "[Unreleased]: https://github.com/user/repo/compare/initial..HEAD",
+            "",
+        ]
+    )
+
+
+def _loads_header(size: int):
+    text = _text(["# Changelog", *(f"Line {index} of a long header." for index in range(size * 100))], ["* An entry"])
+    return lambda: lambda: loads(text)
+
+
+def _loads_continuation(size: int):
+    text = _text(
+        ["# Changelog"], ["* A long entry", *(f"  line {index} of a long entry" for index in range(size * 100))]
+    )
+    return lambda: lambda: loads(text)
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        pytest.param(_loads, id="loads"),
+        pytest.param(_dumps, id="dumps"),
+        pytest.param(_add_entry, id="add_entry"),
+        pytest.param(_cut_release, id="cut_release"),
+        pytest.param(_validate, id="validate"),
+        pytest.param(_loads_header, id="loads-long-header"),
+        pytest.param(_loads_continuation, id="loads-long-entry"),
+    ],
+)
+def test_operation_scales_linearly(operation):
+    timings = [(size, _time(operation(size))) for size in SIZES]
+    assert growth_rate(timings) < MAX_GROWTH_RATE, timings
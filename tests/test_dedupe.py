@@ -0,0 +1,84 @@
+from itertools import combinations
+
+import pytest
+
+from changelog import loads
+from changelog.dedupe import find_duplicates, merge_duplicates, shingles, similarity
+from changelog.model import Changelog, Entry, ReleaseTag, entry_id
+from tests.synthetic import generate_changelog
+
+
+@pytest.fixture()
+def changelog() -> Changelog:
+    with open("tests/changelogs/populated_changelog.md", "r") as file:
+        return loads(file.read())
+
+
+def test_similarity_ignores_case_and_punctuation():
+    assert similarity(shingles("Support YAML config files."), shingles("support yaml config-files")) == 1.0
+    assert similarity(shingles("Support YAML config files"), shingles("Fix crash on empty input")) < 0.1
+
+
+def test_find_duplicates_in_unreleased(changelog: Changelog):
+    changelog.add_entry("Added", "Support for YAML config files")
+    changelog.add_entry("Fixed", "Crash on empty input")
+    changelog.add_entry("Added", "Support for YAML config files.", "Including .yml files")
+    groups = find_duplicates(changelog)
+    assert [[location.entry.text for location in group.locations] for group in groups] == [
+        ["Support for YAML config files", "Support for YAML config files."]
+    ]
+
+
+def test_find_duplicates_keeps_entries_from_the_oldest_release(changelog: Changelog):
+    changelog.add_entry("Added", "The first feature!")
+    assert find_duplicates(changelog) == []
+    (group,) = find_duplicates(changelog, tags=["Unreleased", "0.1.0"])
+    assert [(location.tag, location.entry.text) for location in group.locations] == [
+        ("0.1.0", "The first feature"),
+        ("Unreleased", "The first feature!"),
+    ]
+
+
+def test_merge_duplicates_keeps_nested_entries(changelog: Changelog):
+    changelog.add_entry("Added", "A third feature.", "Some notes", "Other notes")
+    (group,) = find_duplicates(changelog)
+    kept = merge_duplicates(changelog, group)
+    assert changelog.releases[ReleaseTag("Unreleased")].entries["Added"] == [kept]
+    assert kept == Entry(
+        "A third feature",
+        children=[Entry("Some notes"), Entry("Even more notes"), Entry("Other notes")],
+    )
+    assert changelog.get_entry(entry_id("Added", ("A third feature",), "Other notes")).entry is kept.children[2]
+
+
+def test_merge_duplicates_of_more_than_two_entries_with_nested_entries(changelog: Changelog):
+    for notes in ["Some notes", "Some notes", "Other notes", "Some notes"]:
+        changelog.add_entry("Fixed", "A duplicated fix", notes)
+    (group,) = find_duplicates(changelog)
+    assert len(group.locations) == 4
+    kept = merge_duplicates(changelog, group)
+    assert changelog.releases[ReleaseTag("Unreleased")].entries["Fixed"] == [kept]
+    assert kept == Entry("A duplicated fix", children=[Entry("Some notes"), Entry("Other notes")])
+    assert find_duplicates(changelog) == []
+    for child in kept.children:
+        assert changelog.get_entry(entry_id("Fixed", ("A duplicated fix",), child.text)).entry is child
+
+
+def test_find_duplicates_matches_pairwise_comparison():
+    changelog = generate_changelog(releases=0, unreleased_entries=500, duplicate_rate=0.2)
+    entry_shingles = {
+        location.entry_id: shingles(location.entry.text)
+        for location in changelog.entry_index.locations.values()
+        if not location.ancestors
+    }
+    expected = {
+        frozenset([left, right])
+        for left, right in combinations(entry_shingles, 2)
+        if similarity(entry_shingles[left], entry_shingles[right]) >= 0.7
+    }
+    found = set()
+    for group in find_duplicates(changelog):
+        for left, right in combinations(group.locations, 2):
+            assert similarity(entry_shingles[left.entry_id], entry_shingles[right.entry_id]) >= 0.5
+            found.add(frozenset([left.entry_id, right.entry_id]))
+    assert len(expected & found) >= 0.9 * len(expected)
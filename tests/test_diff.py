@@ -0,0 +1,73 @@
+from copy import deepcopy
+
+import pytest
+
+from changelog import load_from_file
+from changelog.diff import Change, diff_changelogs, diff_trees, hash_changelog, only_unreleased_changed
+from changelog.model import Changelog, Entry, ReleaseTag
+
+
+@pytest.fixture()
+def changelog() -> Changelog:
+    return load_from_file("tests/changelogs/populated_changelog.md")
+
+
+def test_identical_changelogs_have_equal_hashes(changelog: Changelog):
+    other = deepcopy(changelog)
+    assert hash_changelog(changelog).digest == hash_changelog(other).digest
+    assert diff_changelogs(changelog, other) == []
+
+
+def test_diff_reports_added_unreleased_entries(changelog: Changelog):
+    other = deepcopy(changelog)
+    other.add_entry("Fixed", "A fix")
+    other.add_entry("Added", "Another feature")
+    changes = diff_changelogs(changelog, other)
+    assert changes == [
+        Change(kind="added", path=("releases", "Unreleased", "Added"), text="Another feature"),
+        Change(kind="added", path=("releases", "Unreleased", "Fixed")),
+    ]
+    assert only_unreleased_changed(changes)
+
+
+def test_diff_reports_rewritten_history(changelog: Changelog):
+    other = deepcopy(changelog)
+    other.releases[ReleaseTag("0.2.0")].entries["Added"][0].children[1].text = "Different notes"
+    other.releases[ReleaseTag("0.1.0")].timestamp = "2021-04-13"
+    changes = diff_changelogs(changelog, other)
+    assert changes == [
+        Change(kind="removed", path=("releases", "0.2.0", "Added"), text="A second feature"),
+        Change(kind="added", path=("releases", "0.2.0", "Added"), text="A second feature"),
+        Change(kind="modified", path=("releases", "0.1.0"), text="2021-04-13"),
+    ]
+    assert not only_unreleased_changed(changes)
+
+
+def test_diff_reports_cut_release(changelog: Changelog):
+    other = deepcopy(changelog)
+    other.cut_release()
+    changes = diff_changelogs(changelog, other)
+    timestamp = other.releases[ReleaseTag("0.3.0")].timestamp
+    assert Change(kind="added", path=("releases", "0.3.0"), text=timestamp) in changes
+    assert Change(kind="removed", path=("releases", "Unreleased", "Added")) in changes
+    assert Change(kind="added", path=("links", "0.3.0"), text=other.links["0.3.0"]) in changes
+
+
+def test_diff_reports_reordered_entries(changelog: Changelog):
+    other = deepcopy(changelog)
+    other.releases[ReleaseTag("0.1.0")].entries["Added"].reverse()
+    assert diff_changelogs(changelog, other) == [
+        Change(kind="reordered", path=("releases", "0.1.0", "Added")),
+    ]
+
+
+def test_diff_only_walks_subtrees_which_differ(changelog: Changelog):
+    other = deepcopy(changelog)
+    other.releases[ReleaseTag("0.1.0")].entries["Added"].append(Entry("Late addition"))
+    old_tree, new_tree = hash_changelog(changelog), hash_changelog(other)
+    # Break the unchanged subtrees, so that walking into them would report changes.
+    for tree in (old_tree, new_tree):
+        tree.children["releases"].children["0.2.0"].children.clear()
+    assert list(diff_trees(old_tree, new_tree)) == [
+        Change(kind="added", path=("releases", "0.1.0", "Added"), text="Late addition"),
+    ]
@@ -0,0 +1,125 @@
+import os
+import re
+from pathlib import Path
+
+import pytest
+
+from changelog import loads
+from changelog.exceptions import ChangelogParseError
+from changelog.file import ChangelogFile
+from changelog.model import ReleaseTag
+
+with open("tests/changelogs/populated_changelog.md", "r") as file:
+    POPULATED = file.read()
+
+
+def write(path: Path, text: str) -> None:
+    """Write the file, ensuring its modification time changes even on filesystems with coarse timestamps."""
+    previous = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(text)
+    os.utime(path, ns=(previous + 1_000_000_000, previous + 1_000_000_000))
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    path = tmp_path / "CHANGELOG.md"
+    write(path, POPULATED)
+    return path
+
+
+def test_refresh_does_nothing_if_file_is_unchanged(path: Path):
+    changelog_file = ChangelogFile(str(path))
+    changelog = changelog_file.changelog
+    assert changelog == loads(POPULATED)
+    assert changelog_file.refresh() is False
+    assert changelog_file.changelog is changelog
+
+
+def test_refresh_only_parses_changed_sections(path: Path):
+    changelog_file = ChangelogFile(str(path))
+    previous = changelog_file.changelog
+    text = POPULATED.replace("* A second feature", "* An edited feature")
+    write(path, text)
+    assert changelog_file.refresh() is True
+    changelog = changelog_file.changelog
+    assert changelog == loads(text)
+    assert changelog.releases[ReleaseTag("0.2.0")] is not previous.releases[ReleaseTag("0.2.0")]
+    for tag in ("Unreleased", "0.1.0"):
+        assert changelog.releases[ReleaseTag(tag)] is previous.releases[ReleaseTag(tag)]
+
+
+@pytest.mark.parametrize(
+    "modify",
+    [
+        pytest.param(lambda text: text.replace("Project started", "Project begun"), id="last-section"),
+        pytest.param(lambda text: text.replace("[Keep a Changelog]: http", "[Keep a Changelog]: https"), id="links"),
+        pytest.param(lambda text: text.replace("[_breaking_change_token]: BREAKING", ""), id="config"),
+        pytest.param(lambda text: text.replace("file.\n", "file.\n\nMore header.\n"), id="header"),
+        pytest.param(
+            lambda text: text.replace("## [0.1.0] - 2021-04-12\n### Added\n", "## [0.1.0]\n"), id="carry-over"
+        ),
+        pytest.param(lambda text: text.replace("## [0.1.0] - 2021-04-12", "## [0.2.0]"), id="repeated-release"),
+        pytest.param(lambda text: text.replace("## [0.2.0] - 2021-04-12\n", ""), id="removed-release"),
+        pytest.param(
+            lambda text: text.replace(
+                "## [0.1.0]", text[text.index("## [0.2.0]") : text.index("## [0.1.0]")] + "## [0.1.0]"
+            ),
+            id="identical-repeated-release",
+        ),
+    ],
+)
+def test_refresh_matches_full_parse(path: Path, modify):
+    changelog_file = ChangelogFile(str(path))
+    text = modify(POPULATED)
+    assert text != POPULATED
+    write(path, text)
+    changelog_file.refresh()
+    assert changelog_file.changelog == loads(text)
+
+
+def test_refresh_reparses_sections_whose_carried_over_change_type_changed(path: Path):
+    # Entries before the first change type of a release belong to the change type of the previous release.
+    text = POPULATED.replace("## [0.1.0] - 2021-04-12\n### Added\n", "## [0.1.0]\n")
+    write(path, text)
+    changelog_file = ChangelogFile(str(path))
+    assert list(changelog_file.changelog.releases[ReleaseTag("0.1.0")].entries) == ["Fixed"]
+    text = text.replace("### Fixed\n", "### Changed\n")
+    write(path, text)
+    changelog_file.refresh()
+    assert list(changelog_file.changelog.releases[ReleaseTag("0.1.0")].entries) == ["Changed"]
+    assert changelog_file.changelog == loads(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        pytest.param(POPULATED.replace("## [Unreleased]\n### Added\n", "## [Unreleased]\n"), id="valid"),
+        pytest.param(POPULATED.replace("## [Unreleased]\n### Added\n*", "## [Unreleased]\n  *"), id="invalid"),
+    ],
+)
+def test_refresh_matches_full_parse_with_entries_before_the_first_change_type(path: Path, text: str):
+    # Entries before the first change type are carried over into the next release by the parser.
+    changelog_file = ChangelogFile(str(path))
+    write(path, text)
+    try:
+        expected = loads(text)
+    except ChangelogParseError as exc:
+        with pytest.raises(ChangelogParseError, match=re.escape(str(exc))):
+            changelog_file.refresh()
+    else:
+        changelog_file.refresh()
+        assert changelog_file.changelog == expected
+
+
+def test_refresh_keeps_previous_version_on_error(path: Path):
+    changelog_file = ChangelogFile(str(path))
+    previous = changelog_file.changelog
+    write(path, POPULATED.replace("* Corrected behaviour", "Corrected behaviour"))
+    with pytest.raises(ChangelogParseError) as exc_info:
+        changelog_file.refresh()
+    error: ChangelogParseError = exc_info.value
+    assert error.line == POPULATED.splitlines().index("* Corrected behaviour") + 1
+    assert changelog_file.changelog is previous
+    write(path, POPULATED)
+    assert changelog_file.refresh() is True
+    assert changelog_file.changelog == previous
@@ -0,0 +1,75 @@
+import subprocess
+from pathlib import Path
+from typing import Optional, Tuple
+
+import pytest
+
+from changelog import loads
+from changelog.exceptions import ChangelogError
+from changelog.git import Commit, import_commits, iter_commits
+from changelog.model import Entry, ReleaseTag
+
+
+def git(repository: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=repository,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture()
+def repository(tmp_path: Path) -> Path:
+    git(tmp_path, "init", "-q")
+    for message in ["chore: initial commit", "feat: A new feature", "fix(parser)!: Stricter parsing\n\nMore detail"]:
+        git(tmp_path, "commit", "-q", "--allow-empty", "-m", message)
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    "message,expected",
+    [
+        ("feat: Add a thing", ("Added", "Add a thing", False)),
+        ("fix(cli): Fix a thing", ("Fixed", "cli: Fix a thing", False)),
+        ("feat!: Replace a thing", ("Added", "Replace a thing", True)),
+        ("perf: Faster\n\nBREAKING CHANGE: it's different", ("Changed", "Faster", True)),
+        ("docs: Document a thing", None),
+        ("Not a conventional commit", None),
+    ],
+)
+def test_it_parses_conventional_commits(message: str, expected: Optional[Tuple[str, str, bool]]):
+    assert Commit(sha="abc", message=message).parse() == expected
+
+
+def test_it_streams_commits_since_a_ref_oldest_first(repository: Path):
+    commits = list(iter_commits("HEAD~2", repository=str(repository)))
+    assert [commit.message for commit in commits] == [
+        "feat: A new feature",
+        "fix(parser)!: Stricter parsing\n\nMore detail",
+    ]
+
+
+def test_it_raises_on_unknown_ref(repository: Path):
+    with pytest.raises(ChangelogError):
+        list(iter_commits("no-such-ref", repository=str(repository)))
+
+
+def test_it_never_reads_the_ref_as_an_option(repository: Path):
+    output = repository / "output"
+    with pytest.raises(ChangelogError):
+        list(iter_commits(f"--output={output}", repository=str(repository)))
+    assert not output.exists()
+
+
+def test_it_imports_commits_skipping_duplicates():
+    with open("tests/changelogs/populated_changelog.md", "r") as file:
+        changelog = loads(file.read())
+    commits = [
+        Commit(sha="1", message="feat: A third feature"),
+        Commit(sha="2", message="fix: Corrected behaviour"),
+        Commit(sha="3", message="feat!: Breaking feature"),
+        Commit(sha="4", message="feat!: Breaking feature"),
+    ]
+    assert import_commits(changelog, commits) == (1, 3)
+    assert changelog.releases[ReleaseTag("Unreleased")].entries["Added"][-1] == Entry("BREAKING Breaking feature")
@@ -0,0 +1,124 @@
+import threading
+
+import pytest
+
+from changelog import ChangelogHandle, dumps, load_from_file, loads
+from changelog.exceptions import ChangelogError
+from changelog.model import Entry, ReleaseTag, entry_id
+
+
+@pytest.fixture()
+def handle() -> ChangelogHandle:
+    return ChangelogHandle(load_from_file("tests/changelogs/populated_changelog.md"))
+
+
+def test_changes_do_not_affect_existing_snapshots(handle: ChangelogHandle):
+    snapshot = handle.snapshot()
+    rendered = dumps(snapshot)
+    changed = handle.add_entry("Added", "A new feature", "Some notes")
+    release_tag, released = handle.cut_release()
+    assert dumps(snapshot) == rendered
+    assert handle.snapshot() is released
+    assert released.releases[release_tag].entries["Added"][-1] == Entry("A new feature", [Entry("Some notes")])
+    assert changed.releases[ReleaseTag("Unreleased")].entries["Added"][-1] == Entry(
+        "A new feature", [Entry("Some notes")]
+    )
+
+
+def test_unchanged_releases_are_shared(handle: ChangelogHandle):
+    snapshot = handle.snapshot()
+    changed = handle.add_entry("Fixed", "A fix", tag="0.2.0")
+    assert changed.releases[ReleaseTag("0.2.0")] is not snapshot.releases[ReleaseTag("0.2.0")]
+    for tag in ["Unreleased", "0.1.0"]:
+        assert changed.releases[ReleaseTag(tag)] is snapshot.releases[ReleaseTag(tag)]
+
+
+def test_edit_and_remove_entries(handle: ChangelogHandle):
+    snapshot = handle.snapshot()
+    new_id, _ = handle.edit_entry(entry_id("Fixed", (), "Corrected behaviour"), "Corrected the behaviour")
+    changed = handle.remove_entry(entry_id("Added", (), "Project started :)"))
+    assert changed.get_entry(new_id).entry.text == "Corrected the behaviour"
+    assert [entry.text for entry in changed.releases[ReleaseTag("0.1.0")].entries["Added"]] == ["The first feature"]
+    assert snapshot.releases[ReleaseTag("0.2.0")].entries["Fixed"] == [Entry("Corrected behaviour")]
+    assert len(snapshot.releases[ReleaseTag("0.1.0")].entries["Added"]) == 2
+
+
+def test_changes_through_the_handle_leave_snapshots_and_their_indexes_unchanged(handle: ChangelogHandle):
+    snapshot = handle.snapshot()
+    rendered = dumps(snapshot)
+    fix_id = entry_id("Fixed", (), "Corrected behaviour")
+    # Builds the entry index of the snapshot, which must not be shared with later versions.
+    location = snapshot.get_entry(fix_id)
+    handle.add_entry("Fixed", "A fix", tag="0.2.0")
+    handle.edit_entry(fix_id, "Corrected the behaviour")
+    handle.remove_entry(entry_id("Added", (), "Project started :)"))
+    handle.set_config("breaking_change_token", "BREAKS")
+    with handle.write() as changelog:
+        changelog.links["Other"] = "http://example.com"
+    release_tag, released = handle.cut_release()
+    assert released.get_entry(entry_id("Added", (), "A third feature")).tag == release_tag
+    assert dumps(snapshot) == rendered
+    assert snapshot.config.breaking_change_token == "BREAKING"
+    assert "Other" not in snapshot.links
+    assert snapshot.get_entry(fix_id) is location
+    assert location.entry == Entry("Corrected behaviour")
+    assert snapshot.entry_index is not released.entry_index
+    assert snapshot.get_entry(entry_id("Added", (), "Project started :)")).tag == "0.1.0"
+
+
+def test_failed_changes_are_discarded(handle: ChangelogHandle):
+    snapshot = handle.snapshot()
+    with pytest.raises(ChangelogError):
+        handle.add_entry("Improved", "Not a change type")  # type: ignore[arg-type]
+    with pytest.raises(RuntimeError):
+        with handle.write(["Unreleased"]) as changelog:
+            changelog.add_entry("Added", "Half-finished change")
+            raise RuntimeError
+    assert handle.snapshot() is snapshot
+    with pytest.raises(ChangelogError):
+        handle.undo()
+
+
+def test_undo_and_redo(handle: ChangelogHandle):
+    versions = [handle.snapshot()]
+    versions.append(handle.add_entry("Added", "A new feature"))
+    versions.append(handle.set_config("breaking_change_token", "BREAKS"))
+    assert handle.undo() is versions[1]
+    assert handle.undo() is versions[0]
+    assert handle.redo() is versions[1]
+    changed = handle.add_entry("Fixed", "A fix")
+    with pytest.raises(ChangelogError):
+        handle.redo()
+    assert handle.undo() is versions[1]
+    assert handle.redo() is changed
+    assert versions[0].config.breaking_change_token == "BREAKING"
+
+
+def test_readers_always_see_a_consistent_snapshot(handle: ChangelogHandle):
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            snapshot = handle.snapshot()
+            try:
+                assert loads(dumps(snapshot)) == snapshot
+            except Exception as exc:  # pragma: no cover
+                errors.append(exc)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    writers = [
+        threading.Thread(target=lambda: [handle.add_entry("Added", f"Feature {index}") for index in range(50)])
+        for _ in range(2)
+    ]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+    stop.set()
+    for reader in readers:
+        reader.join()
+    assert errors == []
+    assert len(handle.snapshot().releases[ReleaseTag("Unreleased")].entries["Added"]) == 101
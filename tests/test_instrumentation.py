@@ -0,0 +1,76 @@
+from typing import Iterator, List, Tuple
+
+import pytest
+
+from changelog import dumps, loads
+from changelog.exceptions import ChangelogParseError
+from changelog.instrumentation import Hook, add_hook, remove_hook
+
+with open("tests/changelogs/populated_changelog.md", "r") as file:
+    POPULATED = file.read()
+
+
+class RecordingHook(Hook):
+    def __init__(self):
+        self.events: List[Tuple] = []
+
+    def span_started(self, name):
+        self.events.append(("start", name))
+
+    def span_finished(self, name, duration, error):
+        assert duration >= 0
+        self.events.append(("finish", name, type(error) if error else None))
+
+    def incremented(self, name, value):
+        self.events.append(("increment", name, value))
+
+    def counters(self):
+        totals = {}
+        for event in self.events:
+            if event[0] == "increment":
+                totals[event[1]] = totals.get(event[1], 0) + event[2]
+        return totals
+
+
+@pytest.fixture
+def hook() -> Iterator[RecordingHook]:
+    hook = RecordingHook()
+    add_hook(hook)
+    yield hook
+    remove_hook(hook)
+
+
+def test_loads_reports_nested_spans_and_counters(hook: RecordingHook):
+    loads(POPULATED)
+    spans = [event for event in hook.events if event[0] != "increment"]
+    assert spans == [("start", "loads"), ("start", "validate"), ("finish", "validate", None), ("finish", "loads", None)]
+    assert hook.counters() == {"lines_parsed": len(POPULATED.splitlines()), "entries_created": 12}
+
+
+def test_dumps_reports_bytes_rendered_and_cache_hits(hook: RecordingHook):
+    changelog = loads(POPULATED)
+    hook.events.clear()
+    assert dumps(changelog) == POPULATED
+    assert hook.counters() == {"validate_cache_hits": 1, "bytes_rendered": len(POPULATED.encode())}
+
+
+def test_mutations_report_spans(hook: RecordingHook):
+    changelog = loads(POPULATED)
+    hook.events.clear()
+    changelog.add_entry("Added", "A feature", "With details")
+    changelog.cut_release(tag="0.3.0")
+    spans = [event[1] for event in hook.events if event[0] == "start"]
+    assert spans == ["add_entry", "cut_release"]
+    assert hook.counters()["entries_created"] == 2
+
+
+def test_spans_report_errors(hook: RecordingHook):
+    with pytest.raises(ChangelogParseError):
+        loads(POPULATED + "Invalid line\n")
+    assert hook.events[-1] == ("finish", "loads", ChangelogParseError)
+
+
+def test_removed_hooks_receive_no_events(hook: RecordingHook):
+    remove_hook(hook)
+    loads(POPULATED)
+    assert hook.events == []
@@ -0,0 +1,90 @@
+from typing import List
+
+from changelog.lint import lint
+from tests.constants import DEFAULT_HEADER
+
+LINKS = """[Unreleased]: http://example.com/0.2.0..HEAD
+[0.2.0]: http://example.com/0.1.0..0.2.0
+[0.1.0]: http://example.com/initial..0.1.0
+
+[Keep a Changelog]: http://keepachangelog.com/en/1.0.0/
+[Semantic Versioning]: http://semver.org/spec/v2.0.0.html
+"""
+
+
+def lint_codes(text: str) -> List[str]:
+    return [issue.code for issue in lint(text)]
+
+
+def test_it_reports_no_issues_for_a_valid_changelog():
+    with open("tests/changelogs/populated_changelog.md", "r") as file:
+        assert lint(file.read()) == []
+
+
+def test_it_reports_no_releases():
+    assert lint_codes(DEFAULT_HEADER + LINKS) == ["no-releases"]
+
+
+def test_it_reports_all_parse_errors_with_line_numbers():
+    text = "\n".join(
+        [
+            "## [Unreleased]",
+            "### Added",
+            "* An entry",
+            "Under-indented text",
+            "* Another entry",
+            "More under-indented text",
+            "",
+            "[Unreleased]: http://example.com",
+        ]
+    )
+    issues = lint(text)
+    assert [(issue.line, issue.code) for issue in issues] == [(4, "parse-error"), (6, "parse-error")]
+
+
+def test_it_reports_every_release_problem():
+    text = "\n".join(
+        [
+            DEFAULT_HEADER,
+            "## [Unreleased]",
+            "## [0.1.0] - 2021-04-12",
+            "### Added",
+            "* Started",
+            "## [0.2.0] - 2021-13-12",
+            "### Added",
+            "* Out of order",
+            "## [0.1.0] - 2021-04-12",
+            "### Fixed",
+            "* Duplicate",
+            "",
+            "[Unreleased]: http://example.com/0.2.0..HEAD",
+            "[0.1.0]: http://example.com/initial..0.1.0",
+            "[0.0.1]: http://example.com/initial..0.0.1",
+            "",
+            "[Keep a Changelog]: http://keepachangelog.com/en/1.0.0/",
+            "[Semantic Versioning]: http://semver.org/spec/v2.0.0.html",
+        ]
+    )
+    header_lines = DEFAULT_HEADER.count("\n")
+    issues = [(issue.line - header_lines, issue.code) for issue in lint(text)]
+    assert issues == [
+        (6, "missing-link"),
+        (6, "invalid-date"),
+        (6, "release-order"),
+        (9, "duplicate-release"),
+        (15, "orphan-link"),
+    ]
+
+
+def test_it_accepts_links_referenced_from_entries():
+    text = "\n".join(
+        [
+            "## [Unreleased]",
+            "### Fixed",
+            "* Fixed the thing in [#123]",
+            "",
+            "[Unreleased]: http://example.com",
+            "[#123]: http://example.com/issues/123",
+        ]
+    )
+    assert lint(text) == []
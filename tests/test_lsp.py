@@ -0,0 +1,242 @@
+import io
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from changelog import dumps, loads
+from changelog.exceptions import ChangelogError
+from changelog.lsp import Document, LanguageServer, read_message, write_message
+from changelog.model import ReleaseTag
+
+with open("tests/changelogs/populated_changelog.md", "r") as file:
+    POPULATED = file.read()
+
+URI = "file:///CHANGELOG.md"
+
+
+def parse_or_none(text: str):
+    try:
+        return loads(text)
+    except ChangelogError:
+        return None
+
+
+EDITS = [
+    pytest.param(((19, 0), (19, 0), "* A new feature\n"), id="insert-entry"),
+    pytest.param(((20, 4), (20, 14), "Other"), id="edit-nested-entry"),
+    pytest.param(((1, 0), (1, 3), "Every"), id="edit-header"),
+    pytest.param(((23, 0), (24, 0), ""), id="remove-release-header"),
+    pytest.param(((23, 0), (23, 0), "## [0.3.0] - 2021-05-01\n### Fixed\n* A fix\n\n"), id="insert-release"),
+    pytest.param(((20, 2), (31, 5), "x\n## [0.2.0]\n### Removed\n* Something"), id="across-sections"),
+    pytest.param(((33, 0), (34, 10), ""), id="remove-change-type"),
+    pytest.param(((18, 0), (19, 0), ""), id="remove-first-change-type"),
+    pytest.param(((18, 0), (19, 2), "  * "), id="remove-first-change-type-and-indent"),
+    pytest.param(((39, 0), (39, 0), "[Other]: http://example.com\n"), id="insert-link"),
+    pytest.param(((0, 0), (49, 0), POPULATED.replace("0.1.0", "0.0.1")), id="replace-everything"),
+]
+
+
+@pytest.mark.parametrize("edit", EDITS)
+def test_document_matches_full_parse_after_edit(edit: Tuple[Tuple[int, int], Tuple[int, int], str]):
+    document = Document(POPULATED)
+    assert document.diagnose() == []
+    document.apply_change(*edit)
+    lines = POPULATED.split("\n")
+    (start_line, start_character), (end_line, end_character), text = edit
+    expected_text = "\n".join(
+        [*lines[:start_line], lines[start_line][:start_character] + text + lines[end_line][end_character:]]
+        + lines[end_line + 1 :]
+    )
+    assert document.text == expected_text
+    expected = parse_or_none(expected_text)
+    issues = document.diagnose()
+    assert (issues == []) == (expected is not None)
+    if expected:
+        assert document.changelog == expected
+
+
+def test_document_only_parses_edited_sections():
+    document = Document(POPULATED)
+    document.diagnose()
+    previous = document.changelog
+    document.apply_change((25, 2), (25, 2), "An edited ")
+    assert document.diagnose() == []
+    changelog = document.changelog
+    assert changelog.releases[ReleaseTag("0.2.0")].entries["Added"][0].text == "An edited A second feature"
+    assert changelog.releases[ReleaseTag("0.2.0")] is not previous.releases[ReleaseTag("0.2.0")]
+    assert changelog.releases[ReleaseTag("Unreleased")] is previous.releases[ReleaseTag("Unreleased")]
+    assert changelog.releases[ReleaseTag("0.1.0")] is previous.releases[ReleaseTag("0.1.0")]
+
+
+def test_document_reports_errors_in_each_section():
+    document = Document(POPULATED)
+    document.apply_change((19, 0), (19, 0), "Invalid line\n")
+    document.apply_change((26, 0), (26, 0), "  Another invalid line\n")
+    issues = document.diagnose()
+    assert [(issue.line, issue.code) for issue in issues] == [(20, "parse-error"), (27, "parse-error")]
+    document.apply_change((19, 0), (20, 0), "")
+    document.apply_change((25, 0), (26, 0), "")
+    assert document.diagnose() == []
+    assert document.changelog == loads(POPULATED)
+
+
+def test_document_reports_missing_links():
+    document = Document(POPULATED.replace("[0.2.0]: ", "[Other]: "))
+    issues = document.diagnose()
+    assert [(issue.line, issue.code) for issue in issues] == [(24, "missing-link")]
+
+
+def messages(*messages: Dict[str, Any]) -> io.BytesIO:
+    stream = io.BytesIO()
+    for message in messages:
+        write_message(stream, {"jsonrpc": "2.0", **message})
+    stream.seek(0)
+    return stream
+
+
+def responses(stream: io.BytesIO) -> List[Dict[str, Any]]:
+    stream.seek(0)
+    result = []
+    while (message := read_message(stream)) is not None:
+        result.append(message)
+    return result
+
+
+def test_language_server_session():
+    unformatted = POPULATED.replace("* A third feature", "- A third feature")
+    reader = messages(
+        {"id": 1, "method": "initialize", "params": {"capabilities": {}}},
+        {"method": "initialized", "params": {}},
+        {"method": "textDocument/didOpen", "params": {"textDocument": {"uri": URI, "text": unformatted}}},
+        {
+            "method": "textDocument/didChange",
+            "params": {
+                "textDocument": {"uri": URI},
+                "contentChanges": [
+                    {
+                        "range": {"start": {"line": 19, "character": 0}, "end": {"line": 19, "character": 0}},
+                        "text": "x\n",
+                    }
+                ],
+            },
+        },
+        {
+            "method": "textDocument/didChange",
+            "params": {
+                "textDocument": {"uri": URI},
+                "contentChanges": [
+                    {"range": {"start": {"line": 19, "character": 0}, "end": {"line": 20, "character": 0}}, "text": ""}
+                ],
+            },
+        },
+        {"id": 2, "method": "textDocument/completion", "params": {**_at(URI, 17, 4), "context": {}}},
+        {"id": 3, "method": "textDocument/formatting", "params": {"textDocument": {"uri": URI}, "options": {}}},
+        {"id": 4, "method": "textDocument/hover", "params": _at(URI, 0, 0)},
+        {"id": 5, "method": "shutdown"},
+        {"method": "exit"},
+    )
+    writer = io.BytesIO()
+    assert LanguageServer(reader, writer).serve() == 0
+    initialize, *diagnostics, completion, formatting, hover, shutdown = responses(writer)
+    assert initialize["result"]["capabilities"]["textDocumentSync"] == 2
+    assert [len(message["params"]["diagnostics"]) for message in diagnostics] == [0, 1, 0]
+    assert diagnostics[1]["params"]["diagnostics"][0]["range"]["start"]["line"] == 19
+    assert [item["label"] for item in completion["result"]] == ["0.3.0", "1.0.0", "0.2.1"]
+    assert [edit["newText"] for edit in formatting["result"]] == [dumps(loads(unformatted))]
+    assert hover["error"]["code"] == -32601
+    assert shutdown == {"jsonrpc": "2.0", "id": 5, "result": None}
+
+
+def test_language_server_survives_malformed_messages():
+    reader = messages({"id": 1, "method": "initialize", "params": {"capabilities": {}}})
+    reader.seek(0, io.SEEK_END)
+    reader.write(b"Content-Length: 5\r\n\r\n{oops")
+    reader.write(b"Content-Type: application/vscode-jsonrpc\r\n\r\n")
+    reader.write(b"Content-Length: -1\r\n\r\n")
+    reader.write(b"Content-Length: 2\r\n\r\n[]")
+    write_message(reader, {"jsonrpc": "2.0", "id": 2, "method": "shutdown"})
+    write_message(reader, {"jsonrpc": "2.0", "method": "exit"})
+    reader.seek(0)
+    writer = io.BytesIO()
+    assert LanguageServer(reader, writer).serve() == 0
+    initialize, *errors, shutdown = responses(writer)
+    assert initialize["id"] == 1
+    assert [(error["id"], error["error"]["code"]) for error in errors] == [
+        (None, -32700),
+        (None, -32700),
+        (None, -32700),
+        (None, -32600),
+    ]
+    assert shutdown == {"jsonrpc": "2.0", "id": 2, "result": None}
+
+
+def _at(uri: str, line: int, character: int) -> Dict[str, Any]:
+    return {"textDocument": {"uri": uri}, "position": {"line": line, "character": character}}
+
+
+@pytest.mark.parametrize(
+    "line,prefix,expected",
+    [
+        pytest.param("## [", "## [", ["0.3.0", "1.0.0", "0.2.1"], id="release-tag"),
+        pytest.param("### Ad", "### Ad", ["Added"], id="change-type"),
+        pytest.param("[", "[", ["0.1.0"], id="missing-link"),
+        pytest.param("* An entry", "* An", [], id="entry"),
+    ],
+)
+def test_completion(line: str, prefix: str, expected: List[str]):
+    text = POPULATED.replace("[0.1.0]: https://github.com/jacksmith15/changelog/compare/initial..0.1.0", "")
+    server = LanguageServer(io.BytesIO(), io.BytesIO())
+    server.did_open({"textDocument": {"uri": URI, "text": text}})
+    server.did_change(
+        {
+            "textDocument": {"uri": URI},
+            "contentChanges": [
+                {"range": {"start": {"line": 43, "character": 0}, "end": {"line": 43, "character": 0}}, "text": line}
+            ],
+        }
+    )
+    items = server.completion(_at(URI, 43, len(prefix)))
+    assert [item["label"] for item in items] == expected
+
+
+def test_positions_are_converted_from_utf16():
+    server = LanguageServer(io.BytesIO(), io.BytesIO())
+    server.did_open({"textDocument": {"uri": URI, "text": POPULATED.replace("A third feature", "A 🎉 feature")}})
+    # The emoji is two UTF-16 code units
+    server.did_change(
+        {
+            "textDocument": {"uri": URI},
+            "contentChanges": [
+                {"range": {"start": {"line": 19, "character": 6}, "end": {"line": 19, "character": 6}}, "text": "!"}
+            ],
+        }
+    )
+    assert server.documents[URI].lines[19] == "* A 🎉! feature"
+
+
+def test_errors_in_handlers_are_reported_without_stopping_the_server():
+    reader = messages(
+        {"id": 1, "method": "initialize", "params": {"capabilities": {}}},
+        {"method": "textDocument/didChange", "params": {"textDocument": {"uri": URI}, "contentChanges": []}},
+        {"method": "textDocument/didOpen", "params": {"textDocument": {"uri": URI}}},
+        {"id": 2, "method": "textDocument/formatting", "params": {"textDocument": {"uri": URI}, "options": {}}},
+        {"id": 3, "method": "textDocument/completion", "params": {"textDocument": {"uri": URI}}},
+        {"method": "textDocument/didOpen", "params": {"textDocument": {"uri": URI, "text": POPULATED}}},
+        {"id": 4, "method": "textDocument/completion", "params": {"textDocument": {"uri": URI}}},
+        {"id": 5, "method": "textDocument/formatting", "params": {"textDocument": {"uri": URI}, "options": {}}},
+        {"id": 6, "method": "shutdown"},
+        {"method": "exit"},
+    )
+    writer = io.BytesIO()
+    assert LanguageServer(reader, writer).serve() == 0
+    initialize, log, unopened_formatting, unopened_completion, diagnostics, malformed, formatting, shutdown = responses(
+        writer
+    )
+    assert log["method"] == "window/logMessage"
+    assert unopened_formatting["error"]["code"] == -32602
+    assert unopened_formatting["error"]["message"] == f"Document {URI!r} is not open."
+    assert unopened_completion["error"]["code"] == -32602
+    assert diagnostics["params"]["diagnostics"] == []
+    assert malformed["error"] == {"code": -32602, "message": "Missing parameter 'position'"}
+    assert formatting["result"] == []
+    assert shutdown["result"] is None
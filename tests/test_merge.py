@@ -0,0 +1,120 @@
+from copy import deepcopy
+
+import pytest
+
+from changelog import load_from_file, loads
+from changelog.merge import merge_changelogs, render_merge
+from changelog.model import Changelog, Entry, ReleaseTag
+
+
+@pytest.fixture()
+def base() -> Changelog:
+    return load_from_file("tests/changelogs/populated_changelog.md")
+
+
+def test_merge_combines_unreleased_entries(base: Changelog):
+    ours, theirs = deepcopy(base), deepcopy(base)
+    ours.add_entry("Added", "Our feature")
+    ours.add_entry("Fixed", "A shared fix")
+    theirs.add_entry("Added", "Their feature")
+    theirs.add_entry("Fixed", "A shared fix")
+    theirs.releases[ReleaseTag("Unreleased")].entries["Added"].pop(0)
+    result = merge_changelogs(base, ours, theirs)
+    assert result.conflicts == []
+    unreleased = result.changelog.releases[ReleaseTag("Unreleased")]
+    assert [entry.text for entry in unreleased.entries["Added"]] == ["Our feature", "Their feature"]
+    assert unreleased.entries["Fixed"] == [Entry("A shared fix")]
+    assert loads(render_merge(result)) == result.changelog
+
+
+def test_merge_combines_release_with_new_entries(base: Changelog):
+    ours, theirs = deepcopy(base), deepcopy(base)
+    ours.cut_release(tag="0.3.0")
+    theirs.add_entry("Fixed", "A fix")
+    result = merge_changelogs(base, ours, theirs)
+    assert result.conflicts == []
+    merged = result.changelog
+    assert list(merged.releases) == ["Unreleased", "0.3.0", "0.2.0", "0.1.0"]
+    assert merged.releases[ReleaseTag("Unreleased")].entries == {"Fixed": [Entry("A fix")]}
+    assert merged.releases[ReleaseTag("0.3.0")] == ours.releases[ReleaseTag("0.3.0")]
+    assert merged.links == ours.links
+
+
+def test_merge_takes_changes_to_releases_made_on_one_side(base: Changelog):
+    ours, theirs = deepcopy(base), deepcopy(base)
+    theirs.releases[ReleaseTag("0.1.0")].entries["Added"][0].text = "Project started"
+    theirs.header = "# Changes"
+    result = merge_changelogs(base, ours, theirs)
+    assert result.conflicts == []
+    assert result.changelog.releases == theirs.releases
+    assert result.changelog.header == "# Changes"
+
+
+def test_merge_reports_conflicting_changes_to_a_release(base: Changelog):
+    ours, theirs = deepcopy(base), deepcopy(base)
+    ours.releases[ReleaseTag("0.2.0")].entries["Fixed"][0].text = "Fixed behaviour"
+    theirs.releases[ReleaseTag("0.2.0")].entries["Fixed"][0].text = "Corrected the behaviour"
+    theirs.add_entry("Fixed", "A fix")
+    result = merge_changelogs(base, ours, theirs)
+    assert [conflict.path for conflict in result.conflicts] == [("releases", "0.2.0", "Fixed")]
+    assert result.changelog.releases[ReleaseTag("Unreleased")].entries["Fixed"] == [Entry("A fix")]
+    assert """## [0.2.0] - 2021-04-12
+### Added
+* A second feature
+  - Some notes
+  - Even more notes
+    + Nested notes
+
+### Fixed
+<<<<<<< ours
+* Fixed behaviour
+=======
+* Corrected the behaviour
+>>>>>>> theirs
+""" in render_merge(result)
+
+
+def test_merge_reports_conflicting_links_and_dates(base: Changelog):
+    ours, theirs = deepcopy(base), deepcopy(base)
+    ours.links["0.1.0"] = "https://example.com/ours"
+    theirs.links["0.1.0"] = "https://example.com/theirs"
+    ours.releases[ReleaseTag("0.1.0")].timestamp = "2021-04-10"
+    theirs.releases[ReleaseTag("0.1.0")].timestamp = "2021-04-11"
+    rendered = render_merge(merge_changelogs(base, ours, theirs))
+    assert "<<<<<<< ours\n## [0.1.0] - 2021-04-10\n=======\n## [0.1.0] - 2021-04-11\n>>>>>>> theirs\n" in rendered
+    assert (
+        "<<<<<<< ours\n[0.1.0]: https://example.com/ours\n=======\n[0.1.0]: https://example.com/theirs\n>>>>>>> theirs\n"
+        in rendered
+    )
+
+
+def test_merge_reports_release_removed_on_one_side_and_changed_on_the_other(base: Changelog):
+    ours, theirs = deepcopy(base), deepcopy(base)
+    del ours.releases[ReleaseTag("0.1.0")]
+    del ours.links["0.1.0"]
+    theirs.releases[ReleaseTag("0.1.0")].entries["Added"].append(Entry("Another feature"))
+    result = merge_changelogs(base, ours, theirs)
+    assert [conflict.path for conflict in result.conflicts] == [("releases", "0.1.0")]
+    rendered = render_merge(result)
+    assert "<<<<<<< ours\n=======\n## [0.1.0] - 2021-04-12\n>>>>>>> theirs\n" in rendered
+    assert "* Another feature" in rendered
+
+
+def test_merge_release_added_on_both_sides(base: Changelog):
+    for tag in ["0.2.0", "0.1.0"]:
+        del base.releases[ReleaseTag(tag)]
+        del base.links[tag]
+    ours, theirs = deepcopy(base), deepcopy(base)
+    ours.cut_release(tag="0.1.0")
+    theirs.cut_release(tag="0.1.0")
+    result = merge_changelogs(base, ours, theirs)
+    assert result.conflicts == []
+    assert result.changelog == ours
+    theirs.releases[ReleaseTag("0.1.0")].timestamp = "2021-01-01"
+    theirs.releases[ReleaseTag("0.1.0")].entries["Added"].append(Entry("Another feature"))
+    result = merge_changelogs(base, ours, theirs)
+    assert [conflict.path for conflict in result.conflicts] == [
+        ("releases", "0.1.0"),
+        ("releases", "0.1.0", "Added"),
+    ]
+    assert "* Another feature\n>>>>>>> theirs\n" in render_merge(result)
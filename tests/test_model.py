@@ -0,0 +1,121 @@
+from unittest import mock
+
+import pytest
+
+from changelog import dumps, loads
+from changelog.exceptions import ChangelogError, ChangelogValidationError
+from changelog.model import Changelog, Entry, EntryIndex, ReleaseTag, entry_id
+
+
+@pytest.fixture()
+def changelog() -> Changelog:
+    with open("tests/changelogs/populated_changelog.md", "r") as file:
+        return loads(file.read())
+
+
+def test_validation_is_skipped_when_releases_and_links_are_unchanged(changelog: Changelog):
+    with mock.patch("changelog.model.set", side_effect=AssertionError("Validated again"), create=True):
+        changelog.validate()
+        changelog.add_entry("Fixed", "Entries don't affect validation")
+        changelog.validate()
+
+
+def test_validation_is_repeated_when_releases_change(changelog: Changelog):
+    changelog.validate()
+    changelog.add_entry("Fixed", "A fix for a new release", tag="0.3.0")
+    with pytest.raises(ChangelogValidationError):
+        changelog.validate()
+
+
+def test_validation_is_repeated_when_links_change(changelog: Changelog):
+    changelog.validate()
+    del changelog.links["0.1.0"]
+    with pytest.raises(ChangelogValidationError):
+        changelog.validate()
+
+
+@pytest.fixture()
+def empty_changelog() -> Changelog:
+    return Changelog()
+
+
+def test_entry_ids_survive_cutting_a_release(empty_changelog: Changelog):
+    empty_changelog.add_entry("Added", "A feature", "Some notes")
+    empty_changelog.config.release_link_format = "{tag}"
+    empty_changelog.links["Unreleased"] = "HEAD"
+    ids = dict(empty_changelog.entry_index.locations)
+    empty_changelog.cut_release(tag="0.3.0")
+    assert empty_changelog.entry_index.locations.keys() == ids.keys()
+    assert all(location.tag == ReleaseTag("0.3.0") for location in empty_changelog.entry_index.locations.values())
+
+
+def test_duplicate_entries_have_distinct_ids(empty_changelog: Changelog):
+    empty_changelog.add_entry("Fixed", "A fix")
+    empty_changelog.add_entry("Fixed", "A fix")
+    fix_id = entry_id("Fixed", (), "A fix")
+    assert list(empty_changelog.entry_index.locations) == [fix_id, f"{fix_id}-2"]
+    empty_changelog.remove_entry(fix_id)
+    assert empty_changelog.releases[ReleaseTag("Unreleased")].entries["Fixed"] == [Entry("A fix")]
+    assert empty_changelog.get_entry(f"{fix_id}-2").position == 0
+
+
+def test_adding_a_duplicate_entry_keeps_existing_ids(changelog: Changelog):
+    fix_id = entry_id("Fixed", (), "Corrected behaviour")
+    original = changelog.get_entry(fix_id).entry
+    changelog.add_entry("Fixed", "Corrected behaviour")
+    assert changelog.get_entry(fix_id).entry is original
+    # The index of the changelog when it is next loaded assigns the same IDs.
+    reloaded = loads(dumps(changelog))
+    assert reloaded.get_entry(fix_id).tag == ReleaseTag("0.2.0")
+    assert reloaded.get_entry(f"{fix_id}-2").tag == ReleaseTag("Unreleased")
+
+
+def test_removing_duplicates_with_nested_entries_one_by_one(empty_changelog: Changelog):
+    for _ in range(3):
+        empty_changelog.add_entry("Fixed", "A fix", "Some notes")
+    empty_changelog.add_entry("Fixed", "Another fix")
+    fix_id = entry_id("Fixed", (), "A fix")
+    empty_changelog.remove_entry(f"{fix_id}-2")
+    empty_changelog.remove_entry(f"{fix_id}-3")
+    assert empty_changelog.releases[ReleaseTag("Unreleased")].entries["Fixed"] == [
+        Entry("A fix", children=[Entry("Some notes")]),
+        Entry("Another fix"),
+    ]
+    assert list(empty_changelog.entry_index.locations) == [
+        fix_id,
+        entry_id("Fixed", ("A fix",), "Some notes"),
+        entry_id("Fixed", (), "Another fix"),
+    ]
+    assert empty_changelog.get_entry(entry_id("Fixed", (), "Another fix")).position == 1
+    # The index matches one built from scratch.
+    rebuilt = EntryIndex.build(empty_changelog)
+    assert {key: location.position for key, location in empty_changelog.entry_index.locations.items()} == {
+        key: location.position for key, location in rebuilt.locations.items()
+    }
+
+
+def test_edit_entry_reindexes_nested_entries(empty_changelog: Changelog):
+    empty_changelog.add_entry("Added", "A feature", "Some notes")
+    parent_id = entry_id("Added", (), "A feature")
+    child_id = entry_id("Added", ("A feature",), "Some notes")
+    assert empty_changelog.get_entry(child_id).entry.text == "Some notes"
+    new_id = empty_changelog.edit_entry(parent_id, "A better feature")
+    assert new_id == entry_id("Added", (), "A better feature")
+    assert set(empty_changelog.entry_index.locations) == {
+        new_id,
+        entry_id("Added", ("A better feature",), "Some notes"),
+    }
+    assert empty_changelog.releases[ReleaseTag("Unreleased")].entries["Added"] == [
+        Entry("A better feature", children=[Entry("Some notes")])
+    ]
+
+
+def test_remove_entry_removes_empty_change_types(empty_changelog: Changelog):
+    empty_changelog.add_entry("Added", "A feature", "Some notes")
+    empty_changelog.add_entry("Fixed", "A fix")
+    empty_changelog.remove_entry(entry_id("Added", ("A feature",), "Some notes"))
+    empty_changelog.remove_entry(entry_id("Added", (), "A feature"))
+    assert empty_changelog.releases[ReleaseTag("Unreleased")].entries == {"Fixed": [Entry("A fix")]}
+    assert list(empty_changelog.entry_index.locations) == [entry_id("Fixed", (), "A fix")]
+    with pytest.raises(ChangelogError):
+        empty_changelog.get_entry(entry_id("Added", (), "A feature"))
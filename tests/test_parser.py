@@ -1,4 +1,5 @@
 import re
+from pathlib import Path
 from typing import Union
 
 import pytest
@@ -6,7 +7,10 @@ import pytest
 from changelog import loads
 from changelog.exceptions import ChangelogParseError
 from changelog.model import Entry, ReleaseSection, ReleaseTag
+from changelog.parser import iter_entries, loads_parallel
+from changelog.renderer import dumps, format_file
 from tests.constants import DEFAULT_HEADER
+from tests.synthetic import generate_changelog
 
 SECTION_PARAMS = [
     pytest.param(
@@ -163,6 +167,47 @@ Some random root level text
         ChangelogParseError(r"Bad indentation at line \d+: ' \* Unclear indentation'"),
         id="bad-indentation",
     ),
+    pytest.param(
+        """## [0.1.0] - 2021-04-12
+### Added
+* A single entry
+  - A nested entry
+    + A double nested entry
+      * A triple nested entry
+  - A second nested entry
+* A second entry
+""",
+        ReleaseSection(
+            timestamp="2021-04-12",
+            entries={
+                "Added": [
+                    Entry(
+                        "A single entry",
+                        children=[
+                            Entry(
+                                "A nested entry",
+                                children=[
+                                    Entry("A double nested entry", children=[Entry("A triple nested entry")]),
+                                ],
+                            ),
+                            Entry("A second nested entry"),
+                        ],
+                    ),
+                    Entry("A second entry"),
+                ]
+            },
+        ),
+        id="dedent-several-levels",
+    ),
+    pytest.param(
+        """## [0.1.0] - 2021-04-12
+### Added
+  * An indented entry
+* A less indented entry
+""",
+        ChangelogParseError(r"Bad indentation at line \d+: '\* A less indented entry'"),
+        id="less-indented-than-first-entry",
+    ),
 ]
 
 
@@ -199,3 +244,107 @@ def parse_section(section: str):
     changelog_text = "\n".join(parts)
     changelog = loads(changelog_text)
     return changelog.releases[ReleaseTag(release_tag)]
+
+
+def test_iter_entries_yields_entries_before_reading_remaining_lines():
+    consumed = []
+
+    def lines():
+        for line in ["## [Unreleased]", "### Added", "* First", "  - Child", "* Second", "", "[Unreleased]: #"]:
+            consumed.append(line)
+            yield line
+
+    entries = iter_entries(lines())
+    assert next(entries) == (ReleaseTag("Unreleased"), None, "Added", Entry("First", children=[Entry("Child")]))
+    assert consumed[-1] == "* Second"
+    assert list(entries) == [(ReleaseTag("Unreleased"), None, "Added", Entry("Second"))]
+
+
+def test_streaming_parsers_split_lines_as_loads_does(tmp_path: Path):
+    with open("tests/changelogs/populated_changelog.md", "r") as file:
+        contents = file.read()
+    # Boundaries which `str.splitlines` recognises, but which files read in text mode do not end lines at.
+    text = contents.replace(
+        "  - Even more notes\n    + Nested notes\n",
+        "  - Even more notes\r    + Nested notes\x0b    + Vertical tab\x1c    + File separator\u2028* Line separator\n",
+    )
+    path = tmp_path / "CHANGELOG.md"
+    with open(path, "w", newline="") as file:
+        file.write(text)
+    expected = loads(text)
+    assert len(expected.releases[ReleaseTag("0.2.0")].entries["Added"]) == 2
+    with open(path, "r", newline="") as file:
+        assert list(iter_entries(file)) == [
+            (tag, section.timestamp, change_type, entry)
+            for tag, section in expected.releases.items()
+            for change_type, entries in section.entries.items()
+            for entry in entries
+        ]
+    format_file(str(path))
+    assert path.read_text() == dumps(expected)
+
+
+def test_loads_parallel_matches_loads():
+    changelog = generate_changelog(releases=20, entries_per_release=5, children_rate=0.3)
+    changelog.config.breaking_change_token = "BREAKING CHANGE"
+    text = dumps(changelog)
+    parsed = loads_parallel(text, workers=2, threshold=0)
+    assert parsed == loads(text)
+    assert parsed.config.breaking_change_token == "BREAKING CHANGE"
+
+
+def test_loads_parallel_carries_change_type_over_chunk_boundaries():
+    # Entries directly after a release header belong to the previous change type, as when parsing serially.
+    lines = [DEFAULT_HEADER, "## [Unreleased]", "### Fixed"]
+    for index in range(10):
+        lines.extend([f"## [0.{index}.0]", f"* Entry {index}"])
+    lines.append("")
+    lines.extend([f"[0.{index}.0]: #" for index in range(10)])
+    lines.append("[Unreleased]: #")
+    text = "\n".join(lines)
+    assert loads_parallel(text, workers=2, threshold=0) == loads(text)
+
+
+def test_loads_parallel_matches_loads_with_entries_before_the_first_change_type():
+    # Entries before the first change type are never flushed, so they stay on the stack over release headers.
+    lines = [DEFAULT_HEADER, "## [Unreleased]", "  * An entry without a change type"]
+    lines.extend(f"## [0.{index}.0]" for index in range(10))
+    lines.extend(["## [1.0.0]", "### Added", "* An entry", ""])
+    lines.extend(f"[0.{index}.0]: #" for index in range(10))
+    lines.extend(["[1.0.0]: #", "[Unreleased]: #"])
+    text = "\n".join(lines)
+    with pytest.raises(ChangelogParseError) as expected:
+        loads(text)
+    with pytest.raises(ChangelogParseError) as exc_info:
+        loads_parallel(text, workers=2, threshold=0)
+    assert str(exc_info.value) == str(expected.value)
+
+
+def test_loads_parallel_reports_first_error_with_its_line_number():
+    lines = dumps(generate_changelog(releases=20, entries_per_release=5)).splitlines()
+    bad_line_numbers = [len(lines) // 2, len(lines) - 30]
+    for line_number in bad_line_numbers:
+        lines.insert(line_number - 1, "Not a valid line")
+    with pytest.raises(ChangelogParseError) as exc_info:
+        loads_parallel("\n".join(lines), workers=2, threshold=0)
+    assert exc_info.value.line == bad_line_numbers[0]
+    assert f"line {bad_line_numbers[0]}:" in str(exc_info.value)
+
+
+@pytest.mark.parametrize("options", [{"workers": 1, "threshold": 0}, {"workers": 2}], ids=["one-worker", "small"])
+def test_loads_parallel_parses_serially_without_starting_workers(monkeypatch, options):
+    monkeypatch.setattr("changelog.parser.ProcessPoolExecutor", None)
+    text = dumps(generate_changelog(releases=5, entries_per_release=5))
+    assert loads_parallel(text, **options) == loads(text)
+
+
+def test_loads_deeply_nested_entries():
+    lines = [" " * level + f"* Level {level}" for level in range(10_000)]
+    changelog = loads("\n".join([DEFAULT_HEADER, "## [Unreleased]", "### Added", *lines, "", "[Unreleased]: link"]))
+    (entry,) = changelog.releases[ReleaseTag("Unreleased")].entries["Added"]
+    depth = 1
+    while entry.children:
+        (entry,) = entry.children
+        depth += 1
+    assert depth == 10_000
+    assert entry.text == "Level 9999"
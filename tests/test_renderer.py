@@ -0,0 +1,102 @@
+import os
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from changelog import dumps, loads
+from changelog.exceptions import ChangelogParseError, ChangelogValidationError
+from changelog.model import Entry, ReleaseTag
+from changelog.renderer import dump_to_file, format_file, iter_dumps, matches_file
+from tests.synthetic import generate_changelog
+
+EXAMPLES = ["initial_changelog.md", "populated_changelog.md"]
+
+
+@pytest.mark.parametrize("name", EXAMPLES)
+def test_streamed_chunks_join_to_rendered_changelog(name: str):
+    with open(f"tests/changelogs/{name}", "r") as file:
+        contents = file.read()
+    changelog = loads(contents)
+    assert "".join(iter_dumps(changelog)) == dumps(changelog) == contents
+
+
+@pytest.mark.parametrize(
+    "modify,expected",
+    [
+        pytest.param(lambda contents: contents, True, id="unchanged"),
+        pytest.param(lambda contents: contents + "\n", False, id="trailing-newline"),
+        pytest.param(lambda contents: contents[:-1], False, id="truncated"),
+        pytest.param(lambda contents: contents.replace("* ", "- ", 1), False, id="changed"),
+        pytest.param(lambda contents: contents.replace("\n", "\r\n"), False, id="crlf"),
+    ],
+)
+def test_matches_file(tmp_path: Path, modify, expected: bool):
+    with open("tests/changelogs/populated_changelog.md", "r") as file:
+        contents = file.read()
+    path = tmp_path / "CHANGELOG.md"
+    path.write_text(modify(contents))
+    assert matches_file(loads(contents), str(path)) is expected
+
+
+@pytest.mark.parametrize("name", EXAMPLES)
+def test_format_file_matches_rendered_changelog(tmp_path: Path, name: str):
+    with open(f"tests/changelogs/{name}", "r") as file:
+        contents = file.read()
+    path = tmp_path / "CHANGELOG.md"
+    unformatted = contents.replace("\n\n", "\n\n\n").replace("* ", "- ").replace("  ", "\t")
+    path.write_text(unformatted)
+    format_file(str(path), fsync=False)
+    assert path.read_text() == dumps(loads(unformatted)) != unformatted
+
+
+def test_format_file_memory_is_bounded_by_largest_release(tmp_path: Path):
+    path = tmp_path / "CHANGELOG.md"
+    dump_to_file(generate_changelog(releases=100, entries_per_release=100), str(path), fsync=False)
+    tracemalloc.start()
+    try:
+        format_file(str(path), fsync=False)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    # Only the release tags and links are kept for the whole changelog, which are small relative to the entries.
+    assert peak < path.stat().st_size / 4
+
+
+@pytest.mark.parametrize(
+    "modify,error",
+    [
+        pytest.param(lambda contents: contents + "Invalid line\n", ChangelogParseError, id="invalid"),
+        pytest.param(
+            lambda contents: contents.replace("[Unreleased]: ", "[Unlinked]: "), ChangelogValidationError, id="unlinked"
+        ),
+        pytest.param(
+            lambda contents: contents.replace("## [0.1.0]", "## [Unreleased]\n\n## [0.1.0]"),
+            ChangelogParseError,
+            id="repeated-release",
+        ),
+    ],
+)
+def test_format_file_leaves_file_unchanged_on_error(tmp_path: Path, modify, error):
+    with open("tests/changelogs/populated_changelog.md", "r") as file:
+        contents = modify(file.read())
+    path = tmp_path / "CHANGELOG.md"
+    path.write_text(contents)
+    with pytest.raises(error):
+        format_file(str(path), fsync=False)
+    assert path.read_text() == contents
+    assert os.listdir(tmp_path) == ["CHANGELOG.md"]
+
+
+def test_dumps_deeply_nested_entries():
+    changelog = loads("# Changelog\n\n## [Unreleased]\n\n[Unreleased]: link\n")
+    entries = changelog.releases[ReleaseTag("Unreleased")].entries.setdefault("Added", [])
+    for level in range(10_000):
+        entries.append(Entry(f"Level {level}"))
+        entries = entries[0].children
+    text = dumps(changelog, indent=1)
+    lines = text.split("\n")
+    start = lines.index("### Added") + 1
+    assert lines[start : start + 4] == ["* Level 0", " - Level 1", "  + Level 2", "   * Level 3"]
+    assert lines[start + 9_999] == " " * 9_999 + "* Level 9999"
+    assert dumps(loads(text), indent=1) == text
@@ -0,0 +1,85 @@
+import pytest
+
+from changelog import dumps, loads
+from changelog.exceptions import ChangelogParseError
+from changelog.serialization import dumps_json, dumps_snapshot, iter_entry_records, loads_json, loads_snapshot
+
+EXAMPLES = ["initial_changelog.md", "populated_changelog.md"]
+
+
+def read_example(name: str) -> str:
+    with open(f"tests/changelogs/{name}", "r") as file:
+        return file.read()
+
+
+@pytest.mark.parametrize("name", EXAMPLES)
+def test_json_round_trips_to_markdown(name: str):
+    contents = read_example(name)
+    changelog = loads_json(dumps_json(loads(contents)))
+    assert changelog == loads(contents)
+    assert dumps(changelog) == contents
+
+
+@pytest.mark.parametrize("name", EXAMPLES)
+def test_snapshot_round_trips_to_markdown(name: str):
+    contents = read_example(name)
+    changelog = loads_snapshot(dumps_snapshot(loads(contents)))
+    assert changelog == loads(contents)
+    assert dumps(changelog) == contents
+
+
+def test_snapshot_preserves_unicode_and_repeated_text():
+    changelog = loads(read_example("populated_changelog.md"))
+    changelog.add_entry("Fixed", "Corrigé le problème ✨", "Some notes", "Some notes")
+    restored = loads_snapshot(dumps_snapshot(changelog))
+    assert restored == changelog
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param(b"", id="empty"),
+        pytest.param(b"NOPE" + bytes(20), id="bad-magic"),
+        pytest.param(dumps_snapshot(loads(read_example("populated_changelog.md")))[:-40], id="truncated"),
+        pytest.param(dumps_snapshot(loads(read_example("populated_changelog.md")))[:20], id="truncated-lengths"),
+        pytest.param(dumps_snapshot(loads(read_example("populated_changelog.md")))[:30], id="truncated-lengths-odd"),
+        pytest.param(dumps_snapshot(loads(read_example("populated_changelog.md")))[:290], id="truncated-entries"),
+    ],
+)
+def test_invalid_snapshot_raises_parse_error(data: bytes):
+    with pytest.raises(ChangelogParseError):
+        loads_snapshot(data)
+
+
+def test_invalid_json_raises_parse_error():
+    with pytest.raises(ChangelogParseError):
+        loads_json('{"header": ""}')
+
+
+def test_entry_records_flatten_nested_entries():
+    with open("tests/changelogs/populated_changelog.md", "r") as file:
+        records = list(iter_entry_records(file))
+    assert len(records) == 12
+    assert records[6] == {
+        "tag": "0.2.0",
+        "date": "2021-04-12",
+        "change_type": "Added",
+        "breaking": False,
+        "depth": 2,
+        "text": "Nested notes",
+        "parents": ["A second feature", "Even more notes"],
+    }
+
+
+def test_entry_records_mark_parents_of_breaking_entries_as_breaking():
+    lines = [
+        "## [Unreleased]",
+        "### Changed",
+        "* BREAKING Something",
+        "  - Details",
+        "* Other",
+        "  - BREAKING details",
+        "",
+        "[Unreleased]: #",
+    ]
+    assert [record["breaking"] for record in iter_entry_records(lines)] == [True, False, True, True]
@@ -0,0 +1,49 @@
+import pytest
+
+from changelog import loads
+from changelog import stats as stats_module
+from changelog.stats import ChangelogStats, IntervalStats, changelog_stats
+
+with open("tests/changelogs/populated_changelog.md", "r") as file:
+    POPULATED = file.read()
+
+
+def changelogs():
+    first = loads(POPULATED)
+    first.add_entry("Removed", "Something old", "BREAKING details", tag="0.2.0")
+    second = loads(POPULATED.replace("0.2.0] - 2021-04-12", "0.2.0] - 2022-05-01"))
+    second.add_entry("Changed", "A change", breaking=True)
+    return [first, second]
+
+
+EXPECTED = ChangelogStats(
+    changelogs=2,
+    releases=4,
+    entries=12,
+    entries_by_change_type={"Added": 8, "Changed": 1, "Removed": 1, "Fixed": 2},
+    breaking_entries=2,
+    breaking_releases=2,
+    first_release="2021-04-12",
+    latest_release="2022-05-01",
+    releases_by_year={"2021": 3, "2022": 1},
+    days_between_releases=IntervalStats(mean=192.0, median=192.0, minimum=0, maximum=384),
+)
+
+
+def test_stats_without_numpy(monkeypatch):
+    monkeypatch.setattr(stats_module, "numpy", None)
+    assert changelog_stats(changelogs()) == EXPECTED
+
+
+def test_stats_with_numpy():
+    pytest.importorskip("numpy")
+    assert changelog_stats(changelogs()) == EXPECTED
+
+
+def test_stats_of_changelog_without_releases(monkeypatch):
+    monkeypatch.setattr(stats_module, "numpy", None)
+    changelog = loads(POPULATED)
+    for tag in list(changelog.releases)[1:]:
+        del changelog.releases[tag]
+    result = changelog_stats([changelog])
+    assert (result.releases, result.first_release, result.days_between_releases) == (0, None, None)
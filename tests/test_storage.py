@@ -0,0 +1,105 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from changelog import dumps, loads
+from changelog.exceptions import ChangelogError
+from changelog.model import ReleaseTag
+from changelog.storage import SqliteStorage
+
+with open("tests/changelogs/populated_changelog.md", "r") as file:
+    POPULATED = file.read()
+
+
+@pytest.fixture
+def storage(tmp_path: Path) -> Iterator[SqliteStorage]:
+    storage = SqliteStorage(str(tmp_path / "changelog.db"))
+    storage.save(loads(POPULATED))
+    yield storage
+    storage.close()
+
+
+def entry_ids(storage: SqliteStorage, tag: str):
+    return storage.connection.execute(
+        "SELECT e.id FROM entries e JOIN releases r ON r.id = e.release_id WHERE r.tag = ?", (tag,)
+    ).fetchall()
+
+
+def test_markdown_round_trips_through_database(storage: SqliteStorage):
+    assert dumps(storage.load()) == POPULATED
+
+
+def test_empty_database_contains_no_changelog(tmp_path: Path):
+    with SqliteStorage(str(tmp_path / "empty.db")) as storage:
+        with pytest.raises(ChangelogError):
+            storage.load()
+
+
+def test_missing_database_is_only_created_if_requested(tmp_path: Path):
+    path = tmp_path / "missing.db"
+    with pytest.raises(ChangelogError, match="not found"):
+        SqliteStorage(str(path), create=False)
+    assert not path.exists()
+
+
+def test_save_only_rewrites_changed_releases(storage: SqliteStorage):
+    released = entry_ids(storage, "0.2.0")
+    with storage.edit() as changelog:
+        changelog.add_entry("Fixed", "A bug", "With details")
+    assert entry_ids(storage, "0.2.0") == released
+    changelog = storage.load()
+    assert changelog.releases[ReleaseTag("Unreleased")].entries["Fixed"][-1].children[0].text == "With details"
+    assert storage.save(changelog) == 0
+
+
+def test_save_handles_released_and_removed_releases(storage: SqliteStorage):
+    changelog = storage.load()
+    changelog.cut_release(tag="0.3.0")
+    del changelog.releases[ReleaseTag("0.1.0")]
+    del changelog.links["0.1.0"]
+    assert storage.save(changelog) == 2
+    assert storage.load() == changelog
+    assert list(storage.load().releases) == ["Unreleased", "0.3.0", "0.2.0"]
+    assert storage.connection.execute("SELECT count(*) FROM entries").fetchone()[0] == sum(
+        1 for _ in changelog.entry_index.locations
+    )
+
+
+def test_edit_leaves_database_untouched_on_error(storage: SqliteStorage):
+    with pytest.raises(ChangelogError):
+        with storage.edit() as changelog:
+            changelog.add_entry("Added", "A feature")
+            changelog.add_entry("Unknown", "Not a change type")  # type: ignore[arg-type]
+    assert storage.load() == loads(POPULATED)
+
+
+def test_search_finds_nested_entries_and_filters(storage: SqliteStorage):
+    results = storage.search("feature")
+    assert {(result.tag, result.text) for result in results} == {
+        ("Unreleased", "A third feature"),
+        ("0.2.0", "A second feature"),
+        ("0.1.0", "The first feature"),
+    }
+    assert {result.text for result in storage.search("feature", since="2021-04-12")} == {
+        "A second feature",
+        "The first feature",
+    }
+    assert storage.search("feature", until="2021-04-11") == []
+    assert {result.text for result in storage.search("nested")} == {"Nested notes"}
+    assert storage.search("feature", change_type="Fixed") == []
+    assert len(storage.search("feature", limit=2)) == 2
+
+
+def test_search_is_kept_in_step_with_changes(storage: SqliteStorage):
+    with storage.edit() as changelog:
+        changelog.add_entry("Added", "A searchable change")
+    assert [result.text for result in storage.search("searchable")] == ["A searchable change"]
+    with storage.edit() as changelog:
+        changelog.cut_release(tag="0.3.0")
+    assert [result.tag for result in storage.search("searchable")] == ["0.3.0"]
+
+
+def test_search_falls_back_without_full_text_index(storage: SqliteStorage):
+    storage.full_text_search = False
+    assert [result.text for result in storage.search("SECOND")] == ["A second feature"]
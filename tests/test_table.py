@@ -0,0 +1,86 @@
+import pytest
+
+from changelog import dumps, loads
+from changelog.exceptions import ChangelogParseError
+from changelog.model import Entry, is_breaking
+from changelog.table import EntryTable, loads_table
+
+with open("tests/changelogs/populated_changelog.md", "r") as file:
+    POPULATED = file.read()
+
+
+def walk(entry: Entry):
+    yield entry
+    for child in entry.children:
+        yield from walk(child)
+
+
+def test_table_columns():
+    changelog = loads(POPULATED)
+    changelog.add_entry("Removed", "Something", "BREAKING details", "More details", tag="0.1.0")
+    table = changelog.to_table()
+    assert len(table) == 15
+    assert table.tags == ["Unreleased", "0.2.0", "0.1.0"]
+    assert table.change_types == ["Added", "Fixed", "Removed"]
+    assert list(table.iter_texts())[3:8] == [
+        "A second feature",
+        "Some notes",
+        "Even more notes",
+        "Nested notes",
+        "Corrected behaviour",
+    ]
+    assert table.entry_text(13) == "BREAKING details"
+    assert table.release.tolist() == [0, 0, 0, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2]
+    assert table.change_type.tolist() == [0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 2, 2, 2]
+    assert table.depth.tolist() == [0, 1, 1, 0, 1, 1, 2, 0, 0, 0, 1, 1, 0, 1, 1]
+    assert table.parent.tolist() == [-1, 0, 0, -1, 3, 3, 5, -1, -1, -1, 9, 9, -1, 12, 12]
+    assert table.breaking.tolist() == [0] * 12 + [1, 1, 0]
+
+
+def test_breaking_matches_is_breaking():
+    changelog = loads(POPULATED)
+    changelog.add_entry("Removed", "Something", "More details", breaking=True, tag="0.1.0")
+    changelog.add_entry("Changed", "Something else", "Details", "BREAKING details", tag="0.2.0")
+    table = changelog.to_table()
+    entries = [
+        entry
+        for section in changelog.releases.values()
+        for entries in section.entries.values()
+        for root in entries
+        for entry in walk(root)
+    ]
+    expected = [is_breaking(entry, "BREAKING") for entry in entries]
+    assert expected.count(True) == 3
+    assert table.breaking.tolist() == expected
+    text = dumps(changelog)
+    assert loads_table(text).breaking == loads(text).to_table().breaking
+
+
+def test_table_converts_back_to_changelog():
+    changelog = loads(POPULATED)
+    assert changelog.to_table().to_changelog() == changelog
+
+
+def test_parser_builds_table_directly():
+    changelog = loads(POPULATED)
+    assert loads_table(POPULATED) == EntryTable.from_changelog(changelog)
+    assert loads_table(POPULATED).to_changelog() == changelog
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        pytest.param(POPULATED.replace("* A second feature", "* A second\n  feature\n  continued"), id="continuation"),
+        pytest.param(POPULATED.replace("## [0.1.0] - 2021-04-12\n### Added\n", "## [0.1.0]\n"), id="carry-over"),
+        pytest.param(POPULATED.replace("## [0.1.0] - 2021-04-12", "## [0.2.0]"), id="repeated-release"),
+        pytest.param(POPULATED.replace("### Added\n* A third", "* A third"), id="entry-before-change-type"),
+    ],
+)
+def test_parser_builds_table_of_same_changelog(text: str):
+    assert loads_table(text).to_changelog() == loads(text)
+
+
+def test_parser_reports_errors_when_building_table():
+    with pytest.raises(ChangelogParseError) as exc_info:
+        loads_table(POPULATED.replace("  - Some notes", "Some notes"))
+    assert exc_info.value.line == 21
@@ -0,0 +1,64 @@
+import os
+import shutil
+import stat
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from changelog import edit, load_from_file
+from changelog.model import Entry, ReleaseTag
+from changelog.utils import atomic_write
+
+
+@pytest.fixture()
+def changelog_path(tmp_path: Path) -> Path:
+    path = tmp_path / "CHANGELOG.md"
+    shutil.copyfile("tests/changelogs/populated_changelog.md", path)
+    return path
+
+
+def test_edit_saves_all_changes_once(changelog_path: Path):
+    with mock.patch("changelog.transaction.atomic_write", wraps=atomic_write) as write:
+        with edit(str(changelog_path)) as changelog:
+            changelog.add_entry("Fixed", "A fix")
+            changelog.cut_release(tag="0.3.0")
+    write.assert_called_once()
+    changelog = load_from_file(str(changelog_path))
+    assert changelog.latest_tag == "0.3.0"
+    assert changelog.releases[ReleaseTag("0.3.0")].entries["Fixed"] == [Entry("A fix")]
+
+
+def test_edit_does_not_write_an_unchanged_changelog(changelog_path: Path):
+    modified = changelog_path.stat().st_mtime_ns
+    with mock.patch("changelog.transaction.atomic_write") as write:
+        with edit(str(changelog_path)) as changelog:
+            changelog.config.set("breaking_change_token", "BREAKING")
+    write.assert_not_called()
+    assert changelog_path.stat().st_mtime_ns == modified
+
+
+def test_edit_does_not_write_if_an_exception_is_raised(changelog_path: Path):
+    original = changelog_path.read_text()
+    with pytest.raises(RuntimeError):
+        with edit(str(changelog_path)) as changelog:
+            changelog.add_entry("Fixed", "A fix")
+            raise RuntimeError("Failed")
+    assert changelog_path.read_text() == original
+
+
+def test_atomic_write_leaves_original_file_intact_on_failure(changelog_path: Path):
+    original = changelog_path.read_text()
+    with mock.patch("os.replace", side_effect=OSError("Failed")):
+        with pytest.raises(OSError):
+            atomic_write(str(changelog_path), "New content")
+    assert changelog_path.read_text() == original
+    assert os.listdir(changelog_path.parent) == ["CHANGELOG.md"]
+
+
+@pytest.mark.parametrize("fsync", [True, False])
+def test_atomic_write_preserves_permissions(changelog_path: Path, fsync: bool):
+    changelog_path.chmod(0o640)
+    atomic_write(str(changelog_path), "New content", fsync=fsync)
+    assert changelog_path.read_text() == "New content"
+    assert stat.S_IMODE(changelog_path.stat().st_mode) == 0o640
@@ -0,0 +1,95 @@
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+from changelog import dump_to_file, load_from_file
+from changelog.exceptions import ChangelogError
+from changelog.model import ChangeType, ReleaseTag
+from changelog.workspace import commit_releases, find_changelogs, prepare_releases
+
+
+@pytest.fixture()
+def workspace(tmp_path: Path) -> Dict[str, str]:
+    """A workspace with a minor change, no changes and a fix in packages a, b and c, and one hidden changelog."""
+    paths = {}
+    for package in ["a", "b", "c", ".venv/d"]:
+        (tmp_path / package).mkdir(parents=True)
+        paths[package] = str(tmp_path / package / "CHANGELOG.md")
+        shutil.copyfile("tests/changelogs/populated_changelog.md", paths[package])
+    changes: List[Tuple[str, Optional[ChangeType]]] = [("b", None), ("c", "Fixed")]
+    for package, change_type in changes:
+        changelog = load_from_file(paths[package])
+        changelog.releases[ReleaseTag("Unreleased")].entries.clear()
+        if change_type:
+            changelog.add_entry(change_type, "A fix")
+        dump_to_file(changelog, paths[package])
+    return paths
+
+
+def test_find_changelogs_skips_hidden_directories(tmp_path: Path, workspace: Dict[str, str]):
+    assert find_changelogs(str(tmp_path)) == [workspace["a"], workspace["b"], workspace["c"]]
+
+
+def test_find_changelogs_from_manifest(tmp_path: Path, workspace: Dict[str, str]):
+    manifest = tmp_path / "changelogs.txt"
+    manifest.write_text("# Released together\nc/CHANGELOG.md\n\n.venv/*/CHANGELOG.md\n")
+    assert find_changelogs(manifest=str(manifest)) == [workspace[".venv/d"], workspace["c"]]
+    manifest.write_text("missing/CHANGELOG.md\n")
+    with pytest.raises(ChangelogError, match="does not match any changelog"):
+        find_changelogs(manifest=str(manifest))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_prepare_releases_skips_changelogs_without_unreleased_entries(workspace: Dict[str, str], workers: int):
+    releases = prepare_releases([workspace["a"], workspace["b"], workspace["c"]], workers=workers)
+    assert [(release.path, release.previous_tag, release.tag, release.bump) for release in releases] == [
+        (workspace["a"], "0.2.0", "0.3.0", "minor"),
+        (workspace["c"], "0.2.0", "0.2.1", "patch"),
+    ]
+    # Nothing is written until the releases are committed.
+    assert list(load_from_file(workspace["a"]).releases)[1] == "0.2.0"
+    commit_releases(releases)
+    assert list(load_from_file(workspace["a"]).releases)[1] == "0.3.0"
+    assert list(load_from_file(workspace["c"]).releases)[1] == "0.2.1"
+
+
+def test_prepare_releases_reports_every_error(workspace: Dict[str, str]):
+    for package in ["a", "c"]:
+        with open(workspace[package], "a") as file:
+            file.write("Invalid line\n")
+    with pytest.raises(ChangelogError) as exc_info:
+        prepare_releases([workspace["a"], workspace["b"], workspace["c"]])
+    message = str(exc_info.value)
+    assert f"{workspace['a']}: Invalid changelog" in message
+    assert f"{workspace['c']}: Invalid changelog" in message
+
+
+def test_commit_releases_refuses_changelogs_changed_since_prepared(workspace: Dict[str, str]):
+    releases = prepare_releases([workspace["a"], workspace["c"]])
+    with open(workspace["c"], "a") as file:
+        file.write("\n")
+    with pytest.raises(ChangelogError, match="changed while releasing"):
+        commit_releases(releases)
+    assert list(load_from_file(workspace["a"]).releases)[1] == "0.2.0"
+
+
+def test_commit_releases_restores_every_changelog_if_one_fails(monkeypatch, workspace: Dict[str, str]):
+    originals = {package: Path(workspace[package]).read_text() for package in ["a", "c"]}
+    releases = prepare_releases([workspace["a"], workspace["c"]])
+    replace = os.replace
+
+    def fail_on_second_changelog(source: str, target: str):
+        if target == os.path.realpath(workspace["c"]):
+            raise OSError("Disk full")
+        replace(source, target)
+
+    monkeypatch.setattr("changelog.utils.os.replace", fail_on_second_changelog)
+    with pytest.raises(OSError, match="Disk full"):
+        commit_releases(releases, fsync=False)
+    assert {package: Path(workspace[package]).read_text() for package in ["a", "c"]} == originals
+    # No temporary files or backups are left behind.
+    assert os.listdir(os.path.dirname(workspace["a"])) == ["CHANGELOG.md"]
+    assert os.listdir(os.path.dirname(workspace["c"])) == ["CHANGELOG.md"]